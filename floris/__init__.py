@@ -1,4 +1,4 @@
-
+from importlib import import_module
 from pathlib import Path
 
 
@@ -7,15 +7,35 @@ with open(Path(__file__).parent / "version.py") as _version_file:
 
 
 from .floris_model import FlorisModel
-from .flow_visualization import (
-    plot_rotor_values,
-    visualize_cut_plane,
-    visualize_quiver,
-)
-from .parallel_floris_model import ParallelFlorisModel
-from .uncertain_floris_model import ApproxFlorisModel, UncertainFlorisModel
-from .wind_data import (
-    TimeSeries,
-    WindRose,
-    WindTIRose,
-)
+
+
+# Public attributes that are resolved on first access (PEP 562) rather than at import time.
+# These modules pull in heavy dependencies (matplotlib, multiprocessing helpers, optimizer
+# stacks) that short-lived scripts and batch workers often never use.
+_LAZY_ATTRIBUTES = {
+    "plot_rotor_values": "floris.flow_visualization",
+    "visualize_cut_plane": "floris.flow_visualization",
+    "visualize_quiver": "floris.flow_visualization",
+    "FarmPowerTable": "floris.farm_power_table",
+    "ParallelFlorisModel": "floris.parallel_floris_model",
+    "ApproxFlorisModel": "floris.uncertain_floris_model",
+    "UncertainFlorisModel": "floris.uncertain_floris_model",
+    "TimeSeries": "floris.wind_data",
+    "WindRose": "floris.wind_data",
+    "WindTIRose": "floris.wind_data",
+    "YawLookupTable": "floris.yaw_lookup_table",
+}
+
+__all__ = ["FlorisModel", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
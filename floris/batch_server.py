@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+from pathlib import Path
+
+import numpy as np
+
+from floris.core.turbine.operation_models import POWER_SETPOINT_DEFAULT
+from floris.floris_model import FlorisModel
+from floris.logging_manager import LoggingManager
+from floris.type_dec import NDArrayFloat
+
+
+class FlorisBatchServer(LoggingManager):
+    """
+    FlorisBatchServer keeps one or more FlorisModel objects warm and answers many small
+    turbine power queries by coalescing them into vectorized runs. Requests that arrive within
+    ``batch_window`` seconds of each other are concatenated along the findex dimension,
+    solved with a single call to ``FlorisModel.run()``, and the turbine powers are split back
+    out to the individual requests.
+
+    Queries can be made in-process with :py:meth:`submit`, or by clients over a Unix socket
+    (newline-delimited JSON, see :py:meth:`serve_unix`) or localhost HTTP (JSON body in a POST
+    request, see :py:meth:`serve_http`). A request is a dictionary with the keys
+    ``wind_directions``, ``wind_speeds`` and ``turbulence_intensities``, and optionally
+    ``yaw_angles``, ``power_setpoints`` and ``model``. The response contains
+    ``turbine_powers`` and ``farm_power``, or ``error`` if the request could not be solved.
+
+    Args:
+        fmodel (FlorisModel | dict[str, FlorisModel]): The model to serve, or a dictionary of
+            named models. Requests select a model with the ``model`` key; this may be omitted
+            when a single model is served. The server works on copies of the models.
+        batch_window (float, optional): Time in seconds to wait for more requests after the
+            first request of a batch arrives. Defaults to 0.005.
+        max_batch_size (int, optional): Maximum number of findex conditions in a batch. A
+            batch is run as soon as this size is reached. A single request larger than this
+            size is run on its own. Defaults to 10000.
+    """
+
+    def __init__(
+        self,
+        fmodel: FlorisModel | dict[str, FlorisModel],
+        batch_window: float = 0.005,
+        max_batch_size: int = 10000,
+    ):
+        if isinstance(fmodel, FlorisModel):
+            fmodel = {"default": fmodel}
+        self.fmodels = {name: fm.copy() for name, fm in fmodel.items()}
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        # Counters for monitoring how well requests are being coalesced
+        self.n_requests = 0
+        self.n_batches = 0
+
+        self._queues = {}
+        self._workers = []
+        self._servers = []
+
+    async def start(self) -> None:
+        """Start a batching task for each model. Must be called from a running event loop."""
+        if self._workers:
+            return
+        for name in self.fmodels:
+            self._queues[name] = asyncio.Queue()
+            self._workers.append(asyncio.create_task(self._batch_loop(name)))
+
+    async def stop(self) -> None:
+        """Close any client-facing servers and stop the batching tasks."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._servers = []
+        self._workers = []
+        self._queues = {}
+
+    async def __aenter__(self) -> FlorisBatchServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    async def submit(
+        self,
+        wind_directions: NDArrayFloat | list[float],
+        wind_speeds: NDArrayFloat | list[float],
+        turbulence_intensities: NDArrayFloat | list[float],
+        yaw_angles: NDArrayFloat | list[list[float]] | None = None,
+        power_setpoints: NDArrayFloat | list[list[float]] | None = None,
+        model: str | None = None,
+    ) -> NDArrayFloat:
+        """
+        Compute the turbine powers for a set of conditions. The request is queued and solved
+        together with any other requests for the same model that arrive within the batch
+        window.
+
+        Args:
+            wind_directions (NDArrayFloat | list[float]): Wind directions for each condition.
+            wind_speeds (NDArrayFloat | list[float]): Wind speeds for each condition.
+            turbulence_intensities (NDArrayFloat | list[float]): Turbulence intensities for
+                each condition.
+            yaw_angles (NDArrayFloat | list[list[float]] | None, optional): Yaw angles with
+                shape (n_conditions, n_turbines). Defaults to None, which is no yaw.
+            power_setpoints (NDArrayFloat | list[list[float]] | None, optional): Power
+                setpoints with shape (n_conditions, n_turbines). Defaults to None, which is
+                no derating.
+            model (str | None, optional): Name of the model to use. Defaults to None, which
+                is only allowed when a single model is served.
+
+        Returns:
+            NDArrayFloat: Turbine powers with shape (n_conditions, n_turbines).
+        """
+        if not self._workers:
+            raise RuntimeError("FlorisBatchServer.start() must be awaited before submitting.")
+
+        name = self._get_model_name(model)
+        conditions = self._validate_conditions(
+            self.fmodels[name].n_turbines,
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+            yaw_angles,
+            power_setpoints,
+        )
+
+        future = asyncio.get_running_loop().create_future()
+        self.n_requests += 1
+        await self._queues[name].put((conditions, future))
+        return await future
+
+    def _get_model_name(self, model: str | None) -> str:
+        if model is None:
+            if len(self.fmodels) > 1:
+                raise ValueError(
+                    "A model name must be given since the server holds more than one model."
+                )
+            return next(iter(self.fmodels))
+        if model not in self.fmodels:
+            raise ValueError(
+                f"Model '{model}' is not served. Available models are {list(self.fmodels)}."
+            )
+        return model
+
+    @staticmethod
+    def _validate_conditions(
+        n_turbines,
+        wind_directions,
+        wind_speeds,
+        turbulence_intensities,
+        yaw_angles,
+        power_setpoints,
+    ):
+        wind_directions = np.atleast_1d(np.array(wind_directions, dtype=float))
+        wind_speeds = np.atleast_1d(np.array(wind_speeds, dtype=float))
+        turbulence_intensities = np.atleast_1d(np.array(turbulence_intensities, dtype=float))
+        n_conditions = len(wind_directions)
+        if wind_directions.ndim != 1 or n_conditions == 0:
+            raise ValueError("wind_directions must be a non-empty 1-dimensional array.")
+        if wind_speeds.shape != (n_conditions,):
+            raise ValueError("wind_speeds must have the same length as wind_directions.")
+        if turbulence_intensities.shape != (n_conditions,):
+            raise ValueError(
+                "turbulence_intensities must have the same length as wind_directions."
+            )
+
+        # Fill in defaults so that every request in a batch fully specifies its operation
+        if yaw_angles is None:
+            yaw_angles = np.zeros((n_conditions, n_turbines))
+        yaw_angles = np.array(yaw_angles, dtype=float)
+        if yaw_angles.shape != (n_conditions, n_turbines):
+            raise ValueError(
+                f"yaw_angles must have shape ({n_conditions}, {n_turbines}), "
+                f"but has shape {yaw_angles.shape}."
+            )
+        if power_setpoints is None:
+            power_setpoints = np.full((n_conditions, n_turbines), POWER_SETPOINT_DEFAULT)
+        power_setpoints = np.array(power_setpoints, dtype=float)
+        if power_setpoints.shape != (n_conditions, n_turbines):
+            raise ValueError(
+                f"power_setpoints must have shape ({n_conditions}, {n_turbines}), "
+                f"but has shape {power_setpoints.shape}."
+            )
+
+        return (
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+            yaw_angles,
+            power_setpoints,
+        )
+
+    async def _batch_loop(self, name: str) -> None:
+        queue = self._queues[name]
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for the first request, then collect others until the window closes
+            batch = [await queue.get()]
+            batch_size = len(batch[0][0][0])
+            deadline = loop.time() + self.batch_window
+            while batch_size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                batch_size += len(item[0][0])
+
+            # Drop requests whose callers have gone away
+            batch = [(conditions, future) for conditions, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            # Solve in a worker thread so the event loop keeps accepting requests
+            try:
+                turbine_powers = await loop.run_in_executor(
+                    None,
+                    self._run_batch,
+                    name,
+                    [conditions for conditions, _ in batch],
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.n_batches += 1
+            for (_, future), powers in zip(batch, turbine_powers):
+                if not future.done():
+                    future.set_result(powers)
+
+    def _run_batch(self, name: str, conditions_list: list) -> list[NDArrayFloat]:
+        # Concatenate each input along the findex dimension
+        (
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+            yaw_angles,
+            power_setpoints,
+        ) = [np.concatenate(arrays, axis=0) for arrays in zip(*conditions_list)]
+
+        fmodel = self.fmodels[name]
+        fmodel.set(
+            wind_directions=wind_directions,
+            wind_speeds=wind_speeds,
+            turbulence_intensities=turbulence_intensities,
+            yaw_angles=yaw_angles,
+            power_setpoints=power_setpoints,
+        )
+        fmodel.run()
+        turbine_powers = fmodel.get_turbine_powers()
+
+        split_indices = np.cumsum([len(c[0]) for c in conditions_list])[:-1]
+        return np.split(turbine_powers, split_indices, axis=0)
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        Answer a JSON-style request dictionary. This is the entry point used by the socket and
+        HTTP servers.
+
+        Args:
+            request (dict): The request; see the class documentation for the keys.
+
+        Returns:
+            dict: The response with ``turbine_powers`` and ``farm_power``, or ``error``.
+        """
+        try:
+            turbine_powers = await self.submit(
+                wind_directions=request["wind_directions"],
+                wind_speeds=request["wind_speeds"],
+                turbulence_intensities=request["turbulence_intensities"],
+                yaw_angles=request.get("yaw_angles"),
+                power_setpoints=request.get("power_setpoints"),
+                model=request.get("model"),
+            )
+        except KeyError as e:
+            return {"error": f"Missing request key {e}."}
+        except Exception as e:
+            return {"error": str(e)}
+        return {
+            "turbine_powers": turbine_powers.tolist(),
+            "farm_power": turbine_powers.sum(axis=1).tolist(),
+        }
+
+    async def serve_unix(self, path: str | Path) -> None:
+        """
+        Accept clients on a Unix domain socket. Each line sent by a client is a JSON request,
+        and each response is written back as a single line of JSON, in order.
+
+        Args:
+            path (str | Path): Path of the socket file.
+        """
+        await self.start()
+        server = await asyncio.start_unix_server(self._handle_stream, path=str(path))
+        self._servers.append(server)
+
+    async def serve_http(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Accept HTTP POST requests with a JSON body on a local TCP port. This is a minimal
+        HTTP/1.1 implementation intended for local clients; each connection carries a single
+        request.
+
+        Args:
+            host (str, optional): Address to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind. Defaults to 0, which picks a free port.
+
+        Returns:
+            int: The port the server is listening on.
+        """
+        await self.start()
+        server = await asyncio.start_server(self._handle_http, host=host, port=port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def _handle_stream(self, reader, writer) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except json.JSONDecodeError as e:
+                    response = {"error": f"Invalid JSON: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle_http(self, reader, writer) -> None:
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                key, _, value = line.decode().partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            if not request_line.startswith(b"POST"):
+                status, response = "405 Method Not Allowed", {"error": "Only POST is supported."}
+            else:
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                try:
+                    response = await self.handle_request(json.loads(body))
+                except json.JSONDecodeError as e:
+                    response = {"error": f"Invalid JSON: {e}"}
+                status = "400 Bad Request" if "error" in response else "200 OK"
+
+            body = json.dumps(response).encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+def query_unix_socket(path: str | Path, request: dict) -> dict:
+    """
+    Send a single request to a :py:class:`FlorisBatchServer` listening on a Unix socket and
+    wait for the response. This is a simple blocking client for scripts and controllers.
+
+    Args:
+        path (str | Path): Path of the server's socket file.
+        request (dict): The request; see :py:class:`FlorisBatchServer` for the keys.
+
+    Returns:
+        dict: The decoded response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
@@ -1,6 +1,7 @@
 
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 
 import numpy as np
@@ -30,6 +31,7 @@ from floris.core import (
     turbopark_solver,
     WakeModelManager,
 )
+from floris.core.flow_field import FLOW_FIELD_SOLUTION_ATTRIBUTES
 from floris.type_dec import NDArrayFloat
 from floris.utilities import (
     load_yaml,
@@ -90,6 +92,18 @@ class Core(BaseClass):
         self.farm.set_awc_amplitudes_to_ref_amp(self.flow_field.n_findex)
         self.farm.set_awc_frequencies_to_ref_freq(self.flow_field.n_findex)
 
+        if self.farm.layout_x.ndim == 2:
+            if len(self.farm.layout_x) != self.flow_field.n_findex:
+                raise ValueError(
+                    "Per-findex layouts must have one row for each of the "
+                    f"n_findex={self.flow_field.n_findex} wind conditions, but "
+                    f"{len(self.farm.layout_x)} rows were given."
+                )
+            if self.solver["type"] != "turbine_grid":
+                raise ValueError(
+                    "Per-findex layouts are only supported by the turbine_grid solver."
+                )
+
         if self.solver["type"] == "turbine_grid":
             self.grid = TurbineGrid(
                 turbine_coordinates=self.farm.coordinates,
@@ -342,6 +356,51 @@ class Core(BaseClass):
         self.farm.finalize(self.grid.unsorted_indices)
         self.state = State.USED
 
+    def copy(self) -> Core:
+        """
+        Create a lightweight copy that is equivalent to ``Core.from_dict(self.as_dict())``
+        without reconstructing the model. The copy shares the constructed objects that are not
+        modified after construction (turbine definitions and models, interpolants, wake models
+        and the grid) with this object. Quantities that change when operating or solving the
+        model are reset on the copy: the operation setpoints are set to their defaults and the
+        solved flow field is cleared. Since FLORIS replaces these arrays rather than writing
+        into them, later changes to either object do not affect the other.
+
+        Returns:
+            Core: The copied Core object.
+        """
+        farm = copy.copy(self.farm)
+        farm.construct_hub_heights()
+        farm.construct_rotor_diameters()
+        farm.construct_turbine_TSRs()
+        farm.construct_turbine_ref_tilts()
+        farm.construct_turbine_correct_cp_ct_for_tilt()
+        farm.turbine_type_map = []
+        farm.set_yaw_angles_to_ref_yaw(self.flow_field.n_findex)
+        farm.set_tilt_to_ref_tilt(self.flow_field.n_findex)
+        farm.set_power_setpoints_to_ref_power(self.flow_field.n_findex)
+        farm.set_awc_modes_to_ref_mode(self.flow_field.n_findex)
+        farm.set_awc_amplitudes_to_ref_amp(self.flow_field.n_findex)
+        farm.set_awc_frequencies_to_ref_freq(self.flow_field.n_findex)
+        if isinstance(self.grid, (TurbineGrid, TurbineCubatureGrid)):
+            farm.expand_farm_properties(self.flow_field.n_findex, self.grid.sorted_coord_indices)
+        farm.state = State.UNINITIALIZED
+
+        flow_field = copy.copy(self.flow_field)
+        for name in FLOW_FIELD_SOLUTION_ATTRIBUTES:
+            setattr(flow_field, name, np.array([]))
+        if flow_field.heterogeneous_inflow_config is not None:
+            flow_field.heterogeneous_inflow_config = dict(flow_field.heterogeneous_inflow_config)
+        flow_field.state = State.UNINITIALIZED
+
+        core = copy.copy(self)
+        # Assigning directly bypasses the from_dict converters on these fields, which would
+        # otherwise rebuild the objects this method is meant to share
+        object.__setattr__(core, "farm", farm)
+        object.__setattr__(core, "flow_field", flow_field)
+        core.state = State.UNINITIALIZED
+        return core
+
     ## I/O
 
     @classmethod
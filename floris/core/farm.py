@@ -51,9 +51,11 @@ class Farm(BaseClass):
 
     Args:
         layout_x (NDArrayFloat): A sequence of x-axis locations for the turbines that can be
-            converted to a 1-D :py:obj:`numpy.ndarray`.
+            converted to a 1-D :py:obj:`numpy.ndarray`, or a 2-D array with shape
+            (n_findex, n_turbines) to give each findex its own layout.
         layout_y (NDArrayFloat): A sequence of y-axis locations for the turbines that can be
-            converted to a 1-D :py:obj:`numpy.ndarray`.
+            converted to a 1-D :py:obj:`numpy.ndarray`, or a 2-D array with shape
+            (n_findex, n_turbines) to give each findex its own layout.
         turbine_type (list[dict | str]): A list of turbine definition dictionaries, or string
             references to the filename of the turbine type in either the FLORIS-provided turbine
             library (.../floris/turbine_library/), or a user-provided
@@ -205,12 +207,16 @@ class Farm(BaseClass):
 
     @layout_x.validator
     def check_x(self, attribute: attrs.Attribute, value: Any) -> None:
-        if len(value) != len(self.layout_y):
+        if np.shape(value) != np.shape(self.layout_y):
             raise ValueError("layout_x and layout_y must have the same number of entries.")
+        if np.ndim(value) not in (1, 2):
+            raise ValueError(
+                "layout_x and layout_y must have shape (n_turbines) or (n_findex, n_turbines)."
+            )
 
     @layout_y.validator
     def check_y(self, attribute: attrs.Attribute, value: Any) -> None:
-        if len(value) != len(self.layout_x):
+        if np.shape(value) != np.shape(self.layout_x):
             raise ValueError("layout_x and layout_y must have the same number of entries.")
 
     @turbine_type.validator
@@ -461,17 +467,30 @@ class Farm(BaseClass):
 
     @property
     def coordinates(self):
+        hub_heights = self.hub_heights
+        if len(hub_heights.shape) != 1:
+            hub_heights = hub_heights[0,0]
+        if self.layout_x.ndim == 2:
+            # Per-findex layouts give coordinates with shape (n_findex, n_turbines, 3)
+            return np.stack(
+                [
+                    self.layout_x,
+                    self.layout_y,
+                    np.broadcast_to(hub_heights, self.layout_x.shape),
+                ],
+                axis=-1,
+            )
         return np.array([
             np.array([x, y, z]) for x, y, z in zip(
                 self.layout_x,
                 self.layout_y,
-                self.hub_heights if len(self.hub_heights.shape) == 1 else self.hub_heights[0,0]
+                hub_heights
             )
         ])
 
     @property
     def n_turbines(self):
-        return len(self.layout_x)
+        return np.shape(self.layout_x)[-1]
 
 def check_turbine_definition_for_v3_keys(turbine_definition: dict):
     """Check that the turbine definition does not contain any v3 keys."""
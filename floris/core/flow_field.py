@@ -2,12 +2,10 @@
 from __future__ import annotations
 
 import attrs
-import matplotlib.path as mpltPath
 import numpy as np
 from attrs import define, field
 from scipy.interpolate import LinearNDInterpolator
-from scipy.spatial import ConvexHull
-from shapely.geometry import Polygon
+from scipy.spatial import Delaunay
 
 from floris.core import (
     BaseClass,
@@ -16,6 +14,25 @@ from floris.core import (
 from floris.type_dec import (
     floris_array_converter,
     NDArrayFloat,
+    NDArrayInt,
+)
+
+
+# Flow field arrays that are computed by a solve rather than set by the user
+FLOW_FIELD_SOLUTION_ATTRIBUTES = (
+    "u_initial_sorted",
+    "v_initial_sorted",
+    "w_initial_sorted",
+    "u_sorted",
+    "v_sorted",
+    "w_sorted",
+    "u",
+    "v",
+    "w",
+    "dudz_initial_sorted",
+    "turbulence_intensity_field",
+    "turbulence_intensity_field_sorted",
+    "turbulence_intensity_field_sorted_avg",
 )
 
 
@@ -41,6 +58,7 @@ class FlowField(BaseClass):
     u: NDArrayFloat = field(init=False, factory=lambda: np.array([]))
     v: NDArrayFloat = field(init=False, factory=lambda: np.array([]))
     w: NDArrayFloat = field(init=False, factory=lambda: np.array([]))
+    het_map_indices: NDArrayInt = field(init=False, default=None)
     het_map: list = field(init=False, default=None)
     dudz_initial_sorted: NDArrayFloat = field(init=False, factory=lambda: np.array([]))
 
@@ -115,18 +133,37 @@ class FlowField(BaseClass):
             # If only a 2D case, add "None" for the z locations
             value["z"] = None
 
+        # Speed multipliers may be given by reference, as rows indexed by each findex
+        indices = value.get("speed_multiplier_indices")
+        n_rows = np.shape(value["speed_multipliers"])[0]
+        if indices is None:
+            if n_rows != self.n_findex:
+                raise ValueError(
+                    "heterogeneous_inflow_config 'speed_multipliers' must have a row for each "
+                    "findex unless 'speed_multiplier_indices' is given."
+                )
+        elif (
+            np.shape(indices) != (self.n_findex,)
+            or np.min(indices) < 0
+            or np.max(indices) >= n_rows
+        ):
+            raise ValueError(
+                "heterogeneous_inflow_config 'speed_multiplier_indices' must have an index "
+                "into the rows of 'speed_multipliers' for each findex."
+            )
+
     @het_map.validator
     def het_map_validator(self, instance: attrs.Attribute, value: list | None) -> None:
         """Using this validator to make sure that the het_map has an interpolant defined for
-        each findex.
+        each index in het_map_indices.
         """
         if value is None:
             return
 
-        if self.n_findex != np.array(value).shape[0]:
-            raise ValueError(
-                "The het_map's first dimension not equal to the FLORIS first dimension."
-            )
+        if self.het_map_indices is None or len(self.het_map_indices) != self.n_findex:
+            raise ValueError("het_map_indices must have an entry for each findex.")
+        if np.max(self.het_map_indices) >= len(value):
+            raise ValueError("het_map_indices refers to an interpolant not in het_map.")
 
 
     def __attrs_post_init__(self) -> None:
@@ -163,6 +200,12 @@ class FlowField(BaseClass):
         # If heterogeneous flow data is given, the speed ups at the defined
         # grid locations are determined in either 2 or 3 dimensions.
         else:
+            # The geometry dependencies are only needed for heterogeneous inflow, so they are
+            # imported here rather than at module level to keep `import floris` fast
+            import matplotlib.path as mpltPath
+            from scipy.spatial import ConvexHull
+            from shapely.geometry import Polygon
+
             bounds = np.array(list(zip(
                 self.heterogeneous_inflow_config['x'],
                 self.heterogeneous_inflow_config['y']
@@ -246,24 +289,36 @@ class FlowField(BaseClass):
         )
 
     def calculate_speed_ups(self, het_map, x, y, z=None):
-        if z is not None:
-            # Calculate the 3-dimensional speed ups; squeeze is needed as the generator
-            # adds an extra dimension
-            speed_ups = np.squeeze(
-                [het_map[i](x[i:i+1], y[i:i+1], z[i:i+1]) for i in range( len(het_map))],
-                axis=1,
-            )
-
-        else:
-            # Calculate the 2-dimensional speed ups; squeeze is needed as the generator
-            # adds an extra dimension
-            speed_ups = np.squeeze(
-                [het_map[i](x[i:i+1], y[i:i+1]) for i in range(len(het_map))],
-                axis=1,
-            )
+        # Evaluate each interpolant once, at the points of all the findices that use it
+        speed_ups = np.empty(np.shape(x))
+        for i, interpolant in enumerate(het_map):
+            findices = self.het_map_indices == i
+            if z is not None:
+                # Calculate the 3-dimensional speed ups
+                speed_ups[findices] = interpolant(x[findices], y[findices], z[findices])
+            else:
+                # Calculate the 2-dimensional speed ups
+                speed_ups[findices] = interpolant(x[findices], y[findices])
 
         return speed_ups
 
+    def get_speed_multipliers(self) -> NDArrayFloat | None:
+        """Get the heterogeneous inflow speed multipliers of each findex, expanding speed
+        multipliers given by reference through 'speed_multiplier_indices'.
+
+        Returns:
+            NDArrayFloat | None: The speed multipliers, of shape (n_findex, n_points), or None
+                if there is no heterogeneous inflow.
+        """
+        if self.heterogeneous_inflow_config is None:
+            return None
+
+        speed_multipliers = np.array(self.heterogeneous_inflow_config['speed_multipliers'])
+        indices = self.heterogeneous_inflow_config.get('speed_multiplier_indices')
+        if indices is not None:
+            speed_multipliers = speed_multipliers[np.asarray(indices)]
+        return speed_multipliers
+
     def generate_heterogeneous_wind_map(self):
         """This function creates the heterogeneous interpolant used to calculate heterogeneous
         inflows. The interpolant is for computing wind speed based on an x and y location in the
@@ -280,27 +335,39 @@ class FlowField(BaseClass):
                 - **x** (list): A list of x locations at which the speed up factors are defined.
                 - **y**: A list of y locations at which the speed up factors are defined.
                 - **z** (optional): A list of z locations at which the speed up factors are defined.
+                - **speed_multiplier_indices** (optional): The index of the row of
+                    speed_multipliers used by each findex. If given, speed_multipliers only needs
+                    the distinct rows, for example one per wind direction sector, rather than a
+                    row for each findex.
         """
-        speed_multipliers = self.heterogeneous_inflow_config['speed_multipliers']
+        speed_multipliers = np.asarray(
+            self.heterogeneous_inflow_config['speed_multipliers'], dtype=float
+        )
         x = self.heterogeneous_inflow_config['x']
         y = self.heterogeneous_inflow_config['y']
         z = self.heterogeneous_inflow_config['z']
 
+        # Build an interpolant only for each distinct row of speed multipliers in use
+        indices = self.heterogeneous_inflow_config.get('speed_multiplier_indices')
+        if indices is None:
+            speed_multipliers, indices = np.unique(
+                speed_multipliers, axis=0, return_inverse=True
+            )
+        else:
+            used_rows, indices = np.unique(indices, return_inverse=True)
+            speed_multipliers = speed_multipliers[used_rows]
+
+        # The interpolants share a single triangulation of the points
+        # Linear interpolation is used for points within the user-defined area of values,
+        # while the freestream wind speed is used for points outside that region
         if z is not None:
-            # Compute the 3-dimensional interpolants for each wind direction
-            # Linear interpolation is used for points within the user-defined area of values,
-            # while the freestream wind speed is used for points outside that region
-            in_region = [
-                LinearNDInterpolator(list(zip(x, y, z)), multiplier, fill_value=1.0)
-                for multiplier in speed_multipliers
-            ]
+            triangulation = Delaunay(np.column_stack((x, y, z)))
         else:
-            # Compute the 2-dimensional interpolants for each wind direction
-            # Linear interpolation is used for points within the user-defined area of values,
-            # while the freestream wind speed is used for points outside that region
-            in_region = [
-                LinearNDInterpolator(list(zip(x, y)), multiplier, fill_value=1.0)
-                for multiplier in speed_multipliers
-            ]
+            triangulation = Delaunay(np.column_stack((x, y)))
+        in_region = [
+            LinearNDInterpolator(triangulation, multiplier, fill_value=1.0)
+            for multiplier in speed_multipliers
+        ]
 
+        self.het_map_indices = indices.reshape(-1)
         self.het_map = in_region
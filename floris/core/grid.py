@@ -76,7 +76,7 @@ class Grid(ABC, BaseClass):
                 "with three components of type `float`."
             )
 
-        self.n_turbines = len(value)
+        self.n_turbines = np.shape(value)[-2]
 
     @wind_directions.validator
     def wind_directions_validator(self, instance: attrs.Attribute, value: NDArrayFloat) -> None:
@@ -110,7 +110,8 @@ class TurbineGrid(Grid):
 
     Args:
         turbine_coordinates (:py:obj:`NDArrayFloat`): The arrays of turbine coordinates as Numpy
-            arrays with shape (N coordinates, 3).
+            arrays with shape (N coordinates, 3), or with shape (n_findex, N coordinates, 3)
+            to place the turbines separately for each findex.
         turbine_diameters (:py:obj:`NDArrayFloat`): The rotor diameters of each turbine.
         wind_directions (:py:obj:`NDArrayFloat`): Wind directions supplied by the user.
         grid_resolution (:py:obj:`int`): The number of points in each
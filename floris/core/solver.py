@@ -49,34 +49,52 @@ def sequential_solver(
     farm: Farm,
     flow_field: FlowField,
     grid: TurbineGrid,
-    model_manager: WakeModelManager
-) -> None:
+    model_manager: WakeModelManager,
+    turbine_range: tuple[int, int] | None = None,
+    solver_state: dict | None = None,
+) -> dict:
     # Algorithm
     # For each turbine, calculate its effect on every downstream turbine.
     # For the current turbine, we are calculating the deficit that it adds to downstream turbines.
     # Integrate this into the main data structure.
     # Move on to the next turbine.
 
+    # The solve can be limited to the turbines in turbine_range, given as positions in the
+    # sorted turbine order. It then resumes from the solver_state returned by the solve of the
+    # preceding turbines, and flow_field.u_sorted, v_sorted and w_sorted must hold their values
+    # at the end of that solve. The turbulence intensity fields are set once the last turbine
+    # is solved.
+
     # <<interface>>
     deflection_model_args = model_manager.deflection_model.prepare_function(grid, flow_field)
     deficit_model_args = model_manager.velocity_model.prepare_function(grid, flow_field)
 
-    # This is u_wake
-    wake_field = np.zeros_like(flow_field.u_initial_sorted)
-    v_wake = np.zeros_like(flow_field.v_initial_sorted)
-    w_wake = np.zeros_like(flow_field.w_initial_sorted)
+    if solver_state is None:
+        # This is u_wake
+        wake_field = np.zeros_like(flow_field.u_initial_sorted)
+        v_wake = np.zeros_like(flow_field.v_initial_sorted)
+        w_wake = np.zeros_like(flow_field.w_initial_sorted)
 
-    # Expand input turbulence intensity to 4d for (n_turbines, grid, grid)
-    turbine_turbulence_intensity = flow_field.turbulence_intensities[:, None, None, None]
-    turbine_turbulence_intensity = np.repeat(turbine_turbulence_intensity, farm.n_turbines, axis=1)
+        # Expand input turbulence intensity to 4d for (n_turbines, grid, grid)
+        turbine_turbulence_intensity = flow_field.turbulence_intensities[:, None, None, None]
+        turbine_turbulence_intensity = np.repeat(
+            turbine_turbulence_intensity, farm.n_turbines, axis=1
+        )
+    else:
+        wake_field = solver_state["wake_field"]
+        v_wake = solver_state["v_wake"]
+        w_wake = solver_state["w_wake"]
+        turbine_turbulence_intensity = solver_state["turbine_turbulence_intensity"]
 
     # Ambient turbulent intensity should be a copy of n_findex-long turbulence_intensity
     # with dimensions expanded for (n_turbines, grid, grid)
     ambient_turbulence_intensities = flow_field.turbulence_intensities.copy()
     ambient_turbulence_intensities = ambient_turbulence_intensities[:, None, None, None]
 
+    start, stop = (0, grid.n_turbines) if turbine_range is None else turbine_range
+
     # Calculate the velocity deficit sequentially from upstream to downstream turbines
-    for i in range(grid.n_turbines):
+    for i in range(start, stop):
 
         # Get the current turbine quantities
         x_i = np.mean(grid.x_sorted[:, i:i+1], axis=(2, 3))
@@ -251,11 +269,19 @@ def sequential_solver(
         flow_field.v_sorted += v_wake
         flow_field.w_sorted += w_wake
 
-    flow_field.turbulence_intensity_field_sorted = turbine_turbulence_intensity
-    flow_field.turbulence_intensity_field_sorted_avg = np.mean(
-        turbine_turbulence_intensity,
-        axis=(2,3)
-    )[:, :, None, None]
+    if stop == grid.n_turbines:
+        flow_field.turbulence_intensity_field_sorted = turbine_turbulence_intensity
+        flow_field.turbulence_intensity_field_sorted_avg = np.mean(
+            turbine_turbulence_intensity,
+            axis=(2,3)
+        )[:, :, None, None]
+
+    return {
+        "wake_field": wake_field,
+        "v_wake": v_wake,
+        "w_wake": w_wake,
+        "turbine_turbulence_intensity": turbine_turbulence_intensity,
+    }
 
 
 def full_flow_sequential_solver(
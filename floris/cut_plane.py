@@ -1,7 +1,6 @@
 
 import copy
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from scipy.interpolate import griddata
@@ -0,0 +1,495 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from floris import __version__
+from floris.logging_manager import LoggingManager
+from floris.type_dec import NDArrayFloat
+from floris.wind_data import WindDataBase
+
+
+class FarmPowerTable(LoggingManager):
+    """
+    A lookup table of the turbine powers of a wind farm, solved once on a lattice of wind
+    directions, wind speeds and turbulence intensities, for replaying long series of wind
+    conditions without solving the wake model for each of them.
+
+    For a fixed layout and operation, the turbine powers are a smooth function of the wind
+    conditions, so they are evaluated at arbitrary conditions by multilinear interpolation
+    between the corners of the lattice cell that contains them. When the wind directions of
+    the lattice cover the full circle, that is when the step from the last wind direction back
+    to the first through 360 degrees is no larger than the largest step of the lattice, the
+    wind direction is treated as periodic with a period of 360 degrees. Conditions with a wind
+    direction outside of a partial sector, or with a wind speed or turbulence intensity
+    outside of the range of the lattice, give NaN powers. An axis with a single entry only
+    covers that value, so conditions off it also give NaN powers. Conditions with NaN powers
+    are left out of the expected farm power and the AEP, with a warning that reports the
+    frequency left out.
+
+    Args:
+        wind_directions (NDArrayFloat): Increasing wind directions of the lattice, in degrees,
+            spanning less than 360 degrees.
+        wind_speeds (NDArrayFloat): Increasing wind speeds of the lattice, in m/s.
+        turbulence_intensities (NDArrayFloat): Increasing turbulence intensities of the
+            lattice.
+        turbine_powers (NDArrayFloat): Turbine powers at each point of the lattice, in W, of
+            shape (n_wind_directions, n_wind_speeds, n_turbulence_intensities, n_turbines).
+    """
+
+    def __init__(
+        self,
+        wind_directions: NDArrayFloat,
+        wind_speeds: NDArrayFloat,
+        turbulence_intensities: NDArrayFloat,
+        turbine_powers: NDArrayFloat,
+    ):
+        self.wind_directions = np.asarray(wind_directions, dtype=float)
+        self.wind_speeds = np.asarray(wind_speeds, dtype=float)
+        self.turbulence_intensities = np.asarray(turbulence_intensities, dtype=float)
+        self.turbine_powers = np.asarray(turbine_powers, dtype=float)
+
+        axes = [self.wind_directions, self.wind_speeds, self.turbulence_intensities]
+        for name, axis in zip(["wind_directions", "wind_speeds", "turbulence_intensities"], axes):
+            if axis.ndim != 1 or len(axis) == 0 or np.any(np.diff(axis) <= 0):
+                raise ValueError(f"{name} must be a non-empty, strictly increasing 1D array.")
+        if self.wind_directions[-1] - self.wind_directions[0] >= 360.0:
+            raise ValueError("wind_directions must span less than 360 degrees.")
+
+        expected_shape = tuple(len(axis) for axis in axes)
+        if self.turbine_powers.ndim != 4 or self.turbine_powers.shape[:3] != expected_shape:
+            raise ValueError(
+                f"turbine_powers must have shape {expected_shape + ('n_turbines',)}, "
+                f"not {self.turbine_powers.shape}."
+            )
+
+    @classmethod
+    def from_floris_model(
+        cls,
+        fmodel,
+        wind_directions: NDArrayFloat,
+        wind_speeds: NDArrayFloat,
+        turbulence_intensities: NDArrayFloat,
+        max_workers: int | None = None,
+        interface: str = "multiprocessing",
+    ):
+        """
+        Build the table by solving a model at every point of the lattice.
+
+        The model is copied, so its layout, turbine, wake and solver settings are used, and
+        the turbines operate in their baseline operation.
+
+        Args:
+            fmodel (FlorisModel | UncertainFlorisModel): The model to solve.
+            wind_directions (NDArrayFloat): Increasing wind directions of the lattice.
+            wind_speeds (NDArrayFloat): Increasing wind speeds of the lattice.
+            turbulence_intensities (NDArrayFloat): Increasing turbulence intensities of the
+                lattice.
+            max_workers (int, optional): If provided, the lattice is split over this many
+                parallel workers with ParallelFlorisModel. Defaults to None, which solves the
+                lattice in the current process.
+            interface (str, optional): Parallel computing interface passed to
+                ParallelFlorisModel. Defaults to "multiprocessing".
+
+        Returns:
+            FarmPowerTable: The table of the model.
+        """
+        wind_directions = np.asarray(wind_directions, dtype=float)
+        wind_speeds = np.asarray(wind_speeds, dtype=float)
+        turbulence_intensities = np.asarray(turbulence_intensities, dtype=float)
+
+        wd_grid, ws_grid, ti_grid = np.meshgrid(
+            wind_directions, wind_speeds, turbulence_intensities, indexing="ij"
+        )
+        fmodel = fmodel.copy()
+        fmodel.set(
+            wind_directions=wd_grid.flatten(),
+            wind_speeds=ws_grid.flatten(),
+            turbulence_intensities=ti_grid.flatten(),
+        )
+
+        if max_workers is None:
+            fmodel.run()
+            turbine_powers = fmodel.get_turbine_powers()
+        else:
+            from floris.parallel_floris_model import ParallelFlorisModel
+
+            pfmodel = ParallelFlorisModel(
+                fmodel,
+                max_workers=max_workers,
+                n_wind_condition_splits=max_workers,
+                interface=interface,
+            )
+            turbine_powers = pfmodel.get_turbine_powers()
+
+        return cls(
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+            turbine_powers.reshape(wd_grid.shape + (-1,)),
+        )
+
+    def to_file(self, filename: str | Path):
+        """
+        Write the table to a NumPy .npz file.
+
+        Args:
+            filename (str | Path): Path of the file to write.
+        """
+        np.savez(
+            filename,
+            wind_directions=self.wind_directions,
+            wind_speeds=self.wind_speeds,
+            turbulence_intensities=self.turbulence_intensities,
+            turbine_powers=self.turbine_powers,
+            floris_version=__version__,
+        )
+
+    @classmethod
+    def from_file(cls, filename: str | Path):
+        """
+        Read a table written by to_file.
+
+        Args:
+            filename (str | Path): Path of the file to read.
+
+        Returns:
+            FarmPowerTable: The table in the file.
+        """
+        with np.load(filename) as data:
+            return cls(
+                data["wind_directions"],
+                data["wind_speeds"],
+                data["turbulence_intensities"],
+                data["turbine_powers"],
+            )
+
+    @property
+    def n_turbines(self):
+        """
+        Number of turbines in the wind farm.
+
+        Returns:
+            int: Number of turbines in the wind farm.
+        """
+        return self.turbine_powers.shape[-1]
+
+    def _get_corners(self, wind_directions, wind_speeds, turbulence_intensities):
+        """
+        Find the corners of the lattice cell that contains each condition, and their
+        multilinear interpolation weights.
+
+        Args:
+            wind_directions (NDArrayFloat): Wind directions of the conditions, of shape (n).
+            wind_speeds (NDArrayFloat): Wind speeds of the conditions, of shape (n).
+            turbulence_intensities (NDArrayFloat): Turbulence intensities of the conditions,
+                of shape (n).
+
+        Returns:
+            tuple: A tuple containing:
+                numpy.ndarray: Flat indices into the lattice of each corner, of shape (8, n).
+                numpy.ndarray: The weight of each corner, of shape (8, n).
+        """
+        # Map the wind directions into the 360 degrees from the first wind direction. If the
+        # lattice covers the full circle, close the wind direction axis by repeating the first
+        # wind direction 360 degrees later, otherwise the directions beyond the last are outside
+        wind_directions = self.wind_directions[0] + np.mod(
+            np.asarray(wind_directions, dtype=float) - self.wind_directions[0], 360.0
+        )
+        wd_axis = self.wind_directions
+        wrap_step = self.wind_directions[0] + 360.0 - self.wind_directions[-1]
+        if len(wd_axis) > 1 and wrap_step <= np.max(np.diff(wd_axis)) * (1.0 + 1e-9):
+            wd_axis = np.append(self.wind_directions, self.wind_directions[0] + 360.0)
+
+        lower_upper = []
+        for dim, (axis, values) in enumerate([
+            (wd_axis, wind_directions),
+            (self.wind_speeds, np.asarray(wind_speeds, dtype=float)),
+            (self.turbulence_intensities, np.asarray(turbulence_intensities, dtype=float)),
+        ]):
+            if len(axis) == 1:
+                # A single entry only covers its own value, up to round off. A wind direction
+                # just below it was mapped 360 degrees above it
+                tol = 1e-9 * max(abs(axis[0]), 1.0)
+                off_axis = np.abs(values - axis[0]) > tol
+                if dim == 0:
+                    off_axis &= np.abs(values - axis[0] - 360.0) > tol
+                idx = np.zeros(len(values), dtype=int)
+                weight = np.zeros(len(values))
+                weight[off_axis | np.isnan(values)] = np.nan
+            else:
+                # Tolerate round off at the ends of the axis
+                tol = 1e-9 * (axis[-1] - axis[0])
+                idx = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2)
+                weight = np.clip((values - axis[idx]) / (axis[idx + 1] - axis[idx]), 0.0, 1.0)
+                weight[(values < axis[0] - tol) | (values > axis[-1] + tol) | np.isnan(values)] = (
+                    np.nan
+                )
+            lower_upper.append((idx, np.minimum(idx + 1, len(axis) - 1), weight))
+
+        # The closing wind direction is the first wind direction
+        n_wd = len(self.wind_directions)
+        wd_lower, wd_upper, wd_weight = lower_upper[0]
+        lower_upper[0] = (wd_lower % n_wd, wd_upper % n_wd, wd_weight)
+
+        shape = self.turbine_powers.shape[:3]
+        indices = []
+        weights = []
+        for corner in range(8):
+            bits = [(corner >> (2 - dim)) & 1 for dim in range(3)]
+            indices.append(
+                np.ravel_multi_index(
+                    [lower_upper[dim][bit] for dim, bit in enumerate(bits)], shape
+                )
+            )
+            weights.append(
+                np.prod(
+                    [
+                        lower_upper[dim][2] if bit else 1.0 - lower_upper[dim][2]
+                        for dim, bit in enumerate(bits)
+                    ],
+                    axis=0,
+                )
+            )
+
+        return np.array(indices), np.array(weights)
+
+    def _interpolate(
+        self,
+        table,
+        wind_directions,
+        wind_speeds,
+        turbulence_intensities,
+        chunk_size=65536,
+    ):
+        """
+        Interpolate a table defined on the lattice to the conditions, in chunks of conditions
+        to limit the size of temporary arrays.
+
+        Args:
+            table (NDArrayFloat): The table, whose leading three dimensions are the lattice.
+            wind_directions (NDArrayFloat): Wind directions of the conditions, of shape (n).
+            wind_speeds (NDArrayFloat): Wind speeds of the conditions, of shape (n).
+            turbulence_intensities (NDArrayFloat): Turbulence intensities of the conditions,
+                of shape (n).
+            chunk_size (int, optional): Number of conditions interpolated at once.
+                Defaults to 65536.
+
+        Returns:
+            NDArrayFloat: The interpolated table, of shape (n,) + table.shape[3:].
+        """
+        wind_directions = np.atleast_1d(wind_directions)
+        wind_speeds = np.atleast_1d(wind_speeds)
+        turbulence_intensities = np.atleast_1d(turbulence_intensities)
+
+        flat_table = table.reshape((-1,) + table.shape[3:])
+        result = np.empty((len(wind_directions),) + table.shape[3:])
+        for start in range(0, len(wind_directions), chunk_size):
+            rows = slice(start, start + chunk_size)
+            indices, weights = self._get_corners(
+                wind_directions[rows], wind_speeds[rows], turbulence_intensities[rows]
+            )
+            weights = weights.reshape(weights.shape + (1,) * (table.ndim - 3))
+            values = weights[0] * flat_table[indices[0]]
+            for corner in range(1, 8):
+                values += weights[corner] * flat_table[indices[corner]]
+            result[rows] = values
+
+        return result
+
+    def _unpack_wind_data(self, wind_data: WindDataBase):
+        """
+        Get the wind directions, wind speeds, turbulence intensities and frequencies of the
+        conditions in a wind data object.
+
+        Args:
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+
+        Returns:
+            tuple: The wind directions, wind speeds, turbulence intensities and frequencies.
+        """
+        if not isinstance(wind_data, WindDataBase):
+            raise TypeError("wind_data must be a TimeSeries, WindRose or WindTIRose object.")
+
+        (
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+            heterogeneous_inflow_config,
+        ) = wind_data.unpack_for_reinitialize()
+        if heterogeneous_inflow_config is not None:
+            raise ValueError("FarmPowerTable does not support heterogeneous inflow.")
+
+        return wind_directions, wind_speeds, turbulence_intensities, wind_data.unpack_freq()
+
+    def get_turbine_powers(self, wind_data: WindDataBase):
+        """
+        Interpolate the turbine powers to the conditions of a wind data object.
+
+        Args:
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+
+        Returns:
+            NDArrayFloat: The turbine powers of shape (n_conditions, n_turbines), where the
+                conditions are in the order of wind_data.unpack().
+        """
+        wind_directions, wind_speeds, turbulence_intensities, _ = self._unpack_wind_data(
+            wind_data
+        )
+        return self._interpolate(
+            self.turbine_powers, wind_directions, wind_speeds, turbulence_intensities
+        )
+
+    def get_farm_power(self, wind_data: WindDataBase, turbine_weights=None):
+        """
+        Interpolate the farm power to the conditions of a wind data object. The weighted
+        farm power is tabulated before interpolating, which is equivalent to and much faster
+        than interpolating the turbine powers.
+
+        Args:
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+            turbine_weights (NDArrayFloat | list[float] | None, optional): Weighing terms of
+                shape (n_turbines) that multiply the power of each turbine. Defaults to None,
+                which weighs all turbines equally.
+
+        Returns:
+            NDArrayFloat: The farm power of each condition, in the order of wind_data.unpack().
+        """
+        wind_directions, wind_speeds, turbulence_intensities, _ = self._unpack_wind_data(
+            wind_data
+        )
+        return self._interpolate(
+            self._get_farm_power_table(turbine_weights),
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+        )
+
+    def _get_farm_power_table(self, turbine_weights=None):
+        """
+        Tabulate the weighted farm power on the lattice.
+
+        Args:
+            turbine_weights (NDArrayFloat | list[float] | None, optional): Weighing terms of
+                shape (n_turbines). Defaults to None, which weighs all turbines equally.
+
+        Returns:
+            NDArrayFloat: The farm power of shape (n_wind_directions, n_wind_speeds,
+                n_turbulence_intensities).
+        """
+        if turbine_weights is None:
+            return self.turbine_powers.sum(axis=-1)
+        return self.turbine_powers @ np.asarray(turbine_weights, dtype=float)
+
+    def get_expected_farm_power(self, wind_data: WindDataBase, turbine_weights=None):
+        """
+        Compute the expected farm power over the frequencies of a wind data object.
+
+        Conditions outside of the lattice have NaN powers and are left out of the sum, with a
+        warning that reports their total frequency.
+
+        Args:
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+            turbine_weights (NDArrayFloat | list[float] | None, optional): Weighing terms of
+                shape (n_turbines) that multiply the power of each turbine. Defaults to None.
+
+        Returns:
+            float: The expected farm power, in W.
+        """
+        freq = wind_data.unpack_freq()
+        farm_power = self.get_farm_power(wind_data, turbine_weights)
+
+        missing = np.isnan(farm_power) & (freq > 0)
+        if np.any(missing):
+            self.logger.warning(
+                f"{np.sum(missing)} conditions with a total frequency of "
+                f"{np.sum(freq[missing]):.4g} are outside of the lattice and are left out of "
+                "the expected farm power."
+            )
+
+        return np.nansum(farm_power * freq)
+
+    def get_farm_AEP(self, wind_data: WindDataBase, turbine_weights=None, hours_per_year=8760):
+        """
+        Compute the annual energy production of the farm over the frequencies of a wind data
+        object.
+
+        Args:
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+            turbine_weights (NDArrayFloat | list[float] | None, optional): Weighing terms of
+                shape (n_turbines) that multiply the power of each turbine. Defaults to None.
+            hours_per_year (float, optional): Number of hours in a year. Defaults to 8760.
+
+        Returns:
+            float: The annual energy production, in Wh.
+        """
+        return self.get_expected_farm_power(wind_data, turbine_weights) * hours_per_year
+
+    def _get_direct_turbine_powers(self, fmodel, wind_data: WindDataBase):
+        """
+        Solve a model directly for the conditions of a wind data object.
+
+        Args:
+            fmodel (FlorisModel | UncertainFlorisModel): The model to solve. It is copied.
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+
+        Returns:
+            NDArrayFloat: The turbine powers of shape (n_conditions, n_turbines).
+        """
+        wind_directions, wind_speeds, turbulence_intensities, _ = self._unpack_wind_data(
+            wind_data
+        )
+        fmodel = fmodel.copy()
+        fmodel.set(
+            wind_directions=wind_directions,
+            wind_speeds=wind_speeds,
+            turbulence_intensities=turbulence_intensities,
+        )
+        fmodel.run()
+        return fmodel.get_turbine_powers()
+
+    def get_error_report(
+        self,
+        fmodel,
+        wind_data: WindDataBase,
+        turbine_weights=None,
+    ) -> dict:
+        """
+        Compare the interpolated farm powers to direct solves of a model for the conditions of
+        a wind data object. Typically the model is the one the table was built from and the
+        wind data is a representative sample of the conditions to be replayed.
+
+        Args:
+            fmodel (FlorisModel | UncertainFlorisModel): The model to solve directly.
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+            turbine_weights (NDArrayFloat | list[float] | None, optional): Weighing terms of
+                shape (n_turbines) that multiply the power of each turbine. Defaults to None.
+
+        Returns:
+            dict: A dictionary with keys:
+                - max_abs_error: Largest absolute error of the farm power, in W.
+                - mean_abs_error: Mean absolute error of the farm power, in W.
+                - max_rel_error: Largest absolute error of the farm power relative to the
+                  largest directly solved farm power.
+                - expected_farm_power_rel_error: Relative error of the expected farm power.
+        """
+        farm_power = self.get_farm_power(wind_data, turbine_weights)
+
+        _, _, _, freq = self._unpack_wind_data(wind_data)
+        turbine_powers = self._get_direct_turbine_powers(fmodel, wind_data)
+        if turbine_weights is not None:
+            turbine_powers = turbine_powers * np.asarray(turbine_weights, dtype=float)
+        farm_power_direct = turbine_powers.sum(axis=1)
+
+        error = np.abs(farm_power - farm_power_direct)
+        expected_farm_power_direct = np.sum(farm_power_direct * freq)
+        return {
+            "max_abs_error": np.max(error),
+            "mean_abs_error": np.mean(error),
+            "max_rel_error": np.max(error) / np.max(np.abs(farm_power_direct)),
+            "expected_farm_power_rel_error": (
+                np.abs(np.sum(farm_power * freq) - expected_farm_power_direct)
+                / np.abs(expected_farm_power_direct)
+            ),
+        }
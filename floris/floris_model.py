@@ -12,8 +12,11 @@ from typing import (
 
 import numpy as np
 import pandas as pd
+from scipy.spatial import cKDTree
 
+from floris import __version__, logging_manager
 from floris.core import Core, State
+from floris.core.flow_field import FLOW_FIELD_SOLUTION_ATTRIBUTES
 from floris.core.rotor_velocity import average_velocity
 from floris.core.turbine.operation_models import (
     POWER_SETPOINT_DEFAULT,
@@ -26,6 +29,7 @@ from floris.core.turbine.turbine import (
 )
 from floris.cut_plane import CutPlane
 from floris.logging_manager import LoggingManager
+from floris.snapshot import read_snapshot, write_snapshot
 from floris.type_dec import (
     floris_array_converter,
     NDArrayBool,
@@ -45,6 +49,15 @@ from floris.wind_data import (
 )
 
 
+# Default finite-difference steps of FlorisModel.get_farm_power_jacobian, in degrees, W and m
+JACOBIAN_DEFAULT_STEPS = {
+    "yaw_angles": 0.5,
+    "power_setpoints": 1.0e4,
+    "layout_x": 1.0,
+    "layout_y": 1.0,
+}
+
+
 class FlorisModel(LoggingManager):
     """
     FlorisModel provides a high-level user interface to many of the
@@ -151,10 +164,12 @@ class FlorisModel(LoggingManager):
             turbulence_intensities (NDArrayFloat | list[float] | None, optional): Turbulence
                 intensities at each findex. Defaults to None.
             air_density (float | None, optional): Air density. Defaults to None.
-            layout_x (NDArrayFloat | list[float] | None, optional): X-coordinates of the turbines.
-                Defaults to None.
-            layout_y (NDArrayFloat | list[float] | None, optional): Y-coordinates of the turbines.
-                Defaults to None.
+            layout_x (NDArrayFloat | list[float] | None, optional): X-coordinates of the turbines
+                with shape (n_turbines), or (n_findex, n_turbines) for a separate layout at each
+                findex with the turbine_grid solver. Defaults to None.
+            layout_y (NDArrayFloat | list[float] | None, optional): Y-coordinates of the turbines
+                with shape (n_turbines), or (n_findex, n_turbines) for a separate layout at each
+                findex with the turbine_grid solver. Defaults to None.
             turbine_type (list | None, optional): Turbine type. Defaults to None.
             turbine_library_path (str | Path | None, optional): Path to the turbine library.
                 Defaults to None.
@@ -329,8 +344,18 @@ class FlorisModel(LoggingManager):
 
             # Set power setpoints to small value (non zero to avoid numerical issues) and
             # yaw_angles to 0 in all locations where disable_turbines is True
-            self.core.farm.yaw_angles[disable_turbines] = 0.0
-            self.core.farm.power_setpoints[disable_turbines] = POWER_SETPOINT_DISABLED
+            # New arrays are assigned rather than written in place since the setpoint arrays
+            # may be shared with copies of this model
+            self.core.farm.set_yaw_angles(
+                np.where(disable_turbines, 0.0, self.core.farm.yaw_angles)
+            )
+            self.core.farm.set_power_setpoints(
+                np.where(
+                    disable_turbines,
+                    POWER_SETPOINT_DISABLED,
+                    self.core.farm.power_setpoints,
+                )
+            )
 
         if any([yaw_angles is not None, power_setpoints is not None, disable_turbines is not None]):
             self.core.state = State.UNINITIALIZED
@@ -372,10 +397,12 @@ class FlorisModel(LoggingManager):
             turbulence_intensities (NDArrayFloat | list[float] | None, optional): Turbulence
                 intensities at each findex. Defaults to None.
             air_density (float | None, optional): Air density. Defaults to None.
-            layout_x (NDArrayFloat | list[float] | None, optional): X-coordinates of the turbines.
-                Defaults to None.
-            layout_y (NDArrayFloat | list[float] | None, optional): Y-coordinates of the turbines.
-                Defaults to None.
+            layout_x (NDArrayFloat | list[float] | None, optional): X-coordinates of the turbines
+                with shape (n_turbines), or (n_findex, n_turbines) for a separate layout at each
+                findex with the turbine_grid solver. Defaults to None.
+            layout_y (NDArrayFloat | list[float] | None, optional): Y-coordinates of the turbines
+                with shape (n_turbines), or (n_findex, n_turbines) for a separate layout at each
+                findex with the turbine_grid solver. Defaults to None.
             turbine_type (list | None, optional): Turbine type. Defaults to None.
             turbine_library_path (str | Path | None, optional): Path to the turbine library.
                 Defaults to None.
@@ -897,6 +924,567 @@ class FlorisModel(LoggingManager):
             turbine_weights=turbine_weights
         ) * hours_per_year
 
+    def get_farm_AEP_streaming(
+        self,
+        time_series_chunks,
+        turbine_weights=None,
+        hours_per_year=8760,
+    ) -> dict:
+        """
+        Compute the expected power, AEP, expected value and AVP of the wind farm, and the
+        annual energy of each turbine, for a time series supplied as a sequence of chunks.
+        Each chunk is solved separately and only running sums are kept, so memory use is
+        set by the chunk size rather than the length of the time series. The results equal
+        those of get_expected_farm_power, get_farm_AEP, get_expected_farm_value and
+        get_farm_AVP for the full time series up to floating point summation order.
+
+        The chunks are run on a copy of this FlorisModel, so this FlorisModel is not
+        modified. The current yaw angles, power setpoints and active wake control settings
+        are applied to every entry of each chunk, which requires them to be the same for
+        every findex of this FlorisModel.
+
+        Args:
+            time_series_chunks (Iterable[TimeSeries]): The time series chunks, for
+                example from TimeSeries.read_chunks or TimeSeries.iter_chunks.
+            turbine_weights (NDArrayFloat | list[float] | None, optional):
+                weighing terms with shape (n_turbines) that allow the user to emphasize
+                power at particular turbines and/or completely ignore the power from other
+                turbines. Defaults to None, in which case all turbines are weighted by 1.0.
+            hours_per_year (float, optional): Number of hours in a year. Defaults to 365 * 24.
+
+        Returns:
+            dict: Dictionary with the keys
+
+                * 'n_findex': The total number of time series entries.
+                * 'expected_farm_power': The expected farm power in W.
+                * 'farm_AEP': The farm AEP in watt-hours.
+                * 'expected_farm_value': The expected farm value, or None if any chunk
+                  has no values.
+                * 'farm_AVP': The farm AVP, or None if any chunk has no values.
+                * 'turbine_AEP': NumPy array with shape (n_turbines) of the annual energy
+                  of each turbine in watt-hours, without turbine_weights applied.
+        """
+        if turbine_weights is not None and np.ndim(turbine_weights) != 1:
+            raise ValueError("turbine_weights must be a 1D array with shape (n_turbines)")
+
+        # The chunks have their own findex, so only setpoints shared by every findex carry over
+        farm = self.core.farm
+        setpoints = {
+            "yaw_angles": farm.yaw_angles,
+            "power_setpoints": farm.power_setpoints,
+            "awc_modes": farm.awc_modes,
+            "awc_amplitudes": farm.awc_amplitudes,
+            "awc_frequencies": farm.awc_frequencies,
+        }
+        for name, values in setpoints.items():
+            if np.any(values != values[:1]):
+                raise ValueError(
+                    f"get_farm_AEP_streaming requires {name} that are the same for every "
+                    "findex, since they are applied to every entry of the time series."
+                )
+
+        fmodel = self.copy()
+        n_findex = 0
+        farm_power_sum = 0.0
+        farm_value_sum = 0.0
+        has_values = True
+        turbine_power_sum = np.zeros(self.core.farm.n_turbines)
+
+        for chunk in time_series_chunks:
+            if not isinstance(chunk, TimeSeries):
+                raise TypeError("time_series_chunks must contain TimeSeries objects")
+            fmodel.set(
+                wind_data=chunk,
+                **{
+                    name: np.repeat(values[:1], chunk.n_findex, axis=0)
+                    for name, values in setpoints.items()
+                },
+            )
+            fmodel.run()
+
+            turbine_powers = fmodel._get_turbine_powers()
+            farm_power = fmodel._get_farm_power(turbine_weights=turbine_weights)
+
+            n_findex += chunk.n_findex
+            farm_power_sum += np.nansum(farm_power)
+            turbine_power_sum += np.nansum(turbine_powers, axis=0)
+            if chunk.values is None:
+                has_values = False
+            elif has_values:
+                farm_value_sum += np.nansum(np.multiply(chunk.values, farm_power))
+
+        if n_findex == 0:
+            raise ValueError("time_series_chunks must contain at least one time series entry")
+
+        expected_farm_power = farm_power_sum / n_findex
+        expected_farm_value = farm_value_sum / n_findex if has_values else None
+
+        return {
+            "n_findex": n_findex,
+            "expected_farm_power": expected_farm_power,
+            "farm_AEP": expected_farm_power * hours_per_year,
+            "expected_farm_value": expected_farm_value,
+            "farm_AVP": expected_farm_value * hours_per_year if has_values else None,
+            "turbine_AEP": turbine_power_sum / n_findex * hours_per_year,
+        }
+
+    def get_farm_AEP_sparse(
+        self,
+        freq_tolerance=0.0,
+        coarsen=False,
+        turbine_weights=None,
+        hours_per_year=8760,
+        gridded=False,
+    ) -> dict:
+        """
+        Compute the AEP of the wind farm for the WindRose or WindTIRose in wind_data while
+        solving only the bins that contribute to it. Bins with zero frequency are never
+        solved. In addition, the lowest frequency bins whose combined frequency does not
+        exceed freq_tolerance are either skipped or, if coarsen is True, have their
+        frequency added to the nearest solved bin. Since the weighted farm power of any bin
+        lies between 0 and the sum of the weighted rated powers of the turbines, the
+        magnitude of the AEP error is at most the skipped frequency times that sum times
+        hours_per_year, which is reported as 'error_bound'.
+
+        The results are returned in sparse form, indexed into the flattened tables of the
+        wind rose (e.g. wind_data.freq_table_flat). The bins are run on a copy of this
+        FlorisModel with the yaw angles, power setpoints and active wake control settings
+        of the corresponding findex, so this FlorisModel is not modified.
+
+        Args:
+            freq_tolerance (float, optional): Largest combined frequency of the non-zero
+                frequency bins that may be skipped or coarsened. Defaults to 0.0, in which
+                case all non-zero frequency bins are solved and the AEP equals that of
+                get_farm_AEP.
+            coarsen (bool, optional): If True, the frequency of each skipped bin is added to
+                the nearest solved bin, measured in bin steps with wind direction wrapping
+                through 360 degrees. If False, skipped bins contribute no energy, so the
+                result is a lower bound of the full AEP. Defaults to False.
+            turbine_weights (NDArrayFloat | list[float] | None, optional):
+                weighing terms with shape (n_turbines) that allow the user to emphasize
+                power at particular turbines and/or completely ignore the power from other
+                turbines. Defaults to None, in which case all turbines are weighted by 1.0.
+            hours_per_year (float, optional): Number of hours in a year. Defaults to 365 * 24.
+            gridded (bool, optional): If True, the result also contains the farm power
+                reshaped to the wind rose grid, with NaN for the bins that were not solved.
+                Defaults to False.
+
+        Returns:
+            dict: Dictionary with the keys
+
+                * 'farm_AEP': The farm AEP in watt-hours.
+                * 'error_bound': Upper bound on the magnitude of the difference between
+                  'farm_AEP' and the AEP with every non-zero frequency bin solved, in
+                  watt-hours.
+                * 'skipped_freq': The combined frequency of the skipped bins.
+                * 'indices': Flat indices of the solved bins, with shape (n_solved).
+                * 'freq': Frequencies used to weigh each solved bin, including any
+                  coarsened frequency, with shape (n_solved).
+                * 'farm_power': Weighted farm power of each solved bin in W, with shape
+                  (n_solved).
+                * 'turbine_powers': Turbine powers of each solved bin in W, with shape
+                  (n_solved, n_turbines).
+                * 'farm_power_gridded': Only if gridded is True. The farm power with the
+                  shape of the wind rose frequency table.
+        """
+        wind_data = self.wind_data
+        if not isinstance(wind_data, (WindRose, WindTIRose)):
+            raise TypeError(
+                "get_farm_AEP_sparse requires wind_data to be a WindRose or WindTIRose"
+            )
+        if freq_tolerance < 0.0:
+            raise ValueError("freq_tolerance must be non-negative")
+        if turbine_weights is None:
+            turbine_weights = np.ones(self.core.farm.n_turbines)
+        elif np.ndim(turbine_weights) != 1:
+            raise ValueError("turbine_weights must be a 1D array with shape (n_turbines)")
+
+        # Skip the lowest frequency bins while their combined frequency stays in tolerance
+        freq_flat = np.asarray(wind_data.freq_table_flat, dtype=float)
+        non_zero_indices = np.flatnonzero(freq_flat > 0.0)
+        order = np.argsort(freq_flat[non_zero_indices], kind="stable")
+        n_skipped = np.searchsorted(
+            np.cumsum(freq_flat[non_zero_indices[order]]), freq_tolerance, side="right"
+        )
+        n_skipped = min(n_skipped, len(order) - 1)
+        skipped_indices = np.sort(non_zero_indices[order[:n_skipped]])
+        indices = np.sort(non_zero_indices[order[n_skipped:]])
+        skipped_freq = float(np.sum(freq_flat[skipped_indices]))
+
+        freq = freq_flat[indices].copy()
+        if coarsen and len(skipped_indices) > 0:
+            nearest = self._get_nearest_wind_rose_bins(wind_data, indices, skipped_indices)
+            np.add.at(freq, nearest, freq_flat[skipped_indices])
+
+        heterogeneous_inflow_config = None
+        if wind_data.heterogeneous_inflow_config_by_wd is not None:
+            heterogeneous_inflow_config = wind_data.get_heterogeneous_inflow_config(
+                wind_data.heterogeneous_inflow_config_by_wd, wind_data.wd_flat[indices]
+            )
+
+        if isinstance(wind_data, WindTIRose):
+            ti_flat = wind_data.ti_flat
+        else:
+            ti_flat = wind_data.ti_table_flat
+
+        # The findex of this model runs over the bins in the non-zero frequency mask, so the
+        # setpoints of each solved bin are taken from its position in that mask
+        findex = (np.cumsum(wind_data.non_zero_freq_mask) - 1)[indices]
+        farm = self.core.farm
+        fmodel = self.copy()
+        fmodel.set(
+            wind_data=TimeSeries(
+                wind_directions=wind_data.wd_flat[indices],
+                wind_speeds=wind_data.ws_flat[indices],
+                turbulence_intensities=ti_flat[indices],
+                heterogeneous_inflow_config=heterogeneous_inflow_config,
+            ),
+            yaw_angles=farm.yaw_angles[findex],
+            power_setpoints=farm.power_setpoints[findex],
+            awc_modes=farm.awc_modes[findex],
+            awc_amplitudes=farm.awc_amplitudes[findex],
+            awc_frequencies=farm.awc_frequencies[findex],
+        )
+        fmodel.run()
+        turbine_powers = fmodel._get_turbine_powers()
+        farm_power = turbine_powers @ np.asarray(turbine_weights, dtype=float)
+
+        max_farm_power = np.abs(turbine_weights) @ self._get_turbine_rated_powers()
+        results = {
+            "farm_AEP": np.sum(freq * farm_power) * hours_per_year,
+            "error_bound": skipped_freq * max_farm_power * hours_per_year,
+            "skipped_freq": skipped_freq,
+            "indices": indices,
+            "freq": freq,
+            "farm_power": farm_power,
+            "turbine_powers": turbine_powers,
+        }
+        if gridded:
+            farm_power_gridded = np.full(len(freq_flat), np.nan)
+            farm_power_gridded[indices] = farm_power
+            results["farm_power_gridded"] = farm_power_gridded.reshape(
+                np.shape(wind_data.freq_table)
+            )
+        return results
+
+    @staticmethod
+    def _get_nearest_wind_rose_bins(wind_data, indices, query_indices):
+        """
+        Find the nearest of the bins at indices for each of the bins at query_indices, with
+        distances measured in bin steps along each axis of the wind rose and wind directions
+        wrapping through 360 degrees.
+
+        Args:
+            wind_data (WindRose | WindTIRose): The wind rose the flat indices refer to.
+            indices (NDArrayInt): Flat indices of the candidate bins.
+            query_indices (NDArrayInt): Flat indices of the bins to look up.
+
+        Returns:
+            NDArrayInt: Positions in indices of the nearest candidate for each query bin.
+        """
+        axes = [wind_data.wind_directions, wind_data.wind_speeds]
+        if isinstance(wind_data, WindTIRose):
+            axes.append(wind_data.turbulence_intensities)
+        shape = tuple(len(axis) for axis in axes)
+
+        # Wind directions are measured in steps of the smallest spacing and wrap around,
+        # while the other axes use their bin index and are sized so that they never wrap
+        wd_step = np.min(np.diff(np.sort(axes[0])), initial=360.0)
+        boxsize = [360.0 / wd_step] + [2.0 * n for n in shape[1:]]
+
+        def bin_coordinates(flat_indices):
+            grid_indices = np.unravel_index(flat_indices, shape)
+            wd = np.mod(axes[0][grid_indices[0]], 360.0) / wd_step
+            return np.column_stack([np.mod(wd, boxsize[0]), *grid_indices[1:]])
+
+        tree = cKDTree(bin_coordinates(indices), boxsize=boxsize)
+        return tree.query(bin_coordinates(query_indices))[1]
+
+    def _get_turbine_rated_powers(self) -> NDArrayFloat:
+        """
+        Get the largest power in the power table of each turbine, taken over all conditions
+        of multidimensional tables.
+
+        Returns:
+            NDArrayFloat: Rated power of each turbine in W, with shape (n_turbines).
+        """
+        rated_powers = {}
+        for turbine_type, table in self.core.farm.turbine_power_thrust_tables.items():
+            tables = [table] if "power" in table else table.values()
+            rated_powers[turbine_type] = 1e3 * max(np.max(t["power"]) for t in tables)
+        return np.array(
+            [rated_powers[t["turbine_type"]] for t in self.core.farm.turbine_definitions]
+        )
+
+    def get_farm_power_jacobian(
+        self,
+        variables="yaw_angles",
+        steps=None,
+        turbine_weights=None,
+        central=False,
+        bounds=None,
+    ) -> tuple[NDArrayFloat, NDArrayFloat]:
+        """
+        Compute the weighted farm power of each findex and its finite-difference Jacobian with
+        respect to the yaw angles, power setpoints or coordinates of each turbine, starting from
+        the current wind conditions and operation setpoints. The base case and all yaw angle and
+        power setpoint perturbations are stacked along the findex axis and evaluated in a single
+        solve. With the turbine_grid solver, the layout perturbations are included in the same
+        solve as per-findex layouts. The cases are run on a copy of this FlorisModel, so this
+        FlorisModel is not modified.
+
+        Args:
+            variables (str | list[str], optional): The variables to differentiate with respect
+                to, any of "yaw_angles", "power_setpoints", "layout_x" and "layout_y". Defaults
+                to "yaw_angles".
+            steps (float | list[float] | None, optional): Finite-difference step of each
+                variable, in degrees, W or m. Defaults to None, in which case the steps in
+                JACOBIAN_DEFAULT_STEPS are used.
+            turbine_weights (NDArrayFloat | list[float] | None, optional): weighing terms with
+                shape (n_turbines) or (n_findex, n_turbines) that are applied to the turbine
+                powers. Defaults to None, in which case all turbines are weighted by 1.0.
+            central (bool, optional): If True, central differences are used, which doubles the
+                number of perturbed cases. Defaults to False.
+            bounds (dict | None, optional): Lower and upper bounds of the variables, as a
+                dictionary that maps variable names to a (lower, upper) tuple of arrays that
+                broadcast to the shape of the variable. Perturbations are kept within the bounds:
+                forward differences step backward where the forward step would cross the upper
+                bound, and central differences are truncated at the bounds. Defaults to None, in
+                which case the variables are not bounded.
+
+        Returns:
+            tuple[NDArrayFloat, NDArrayFloat]: The weighted farm power with shape (n_findex) and
+                its Jacobian with shape (n_findex, n_variables * n_turbines), where the columns
+                of each variable are ordered by turbine.
+        """
+        if isinstance(variables, str):
+            variables = [variables]
+        for variable in variables:
+            if variable not in JACOBIAN_DEFAULT_STEPS:
+                raise ValueError(
+                    f"Can't compute the Jacobian with respect to {variable}, must be one of "
+                    f"{list(JACOBIAN_DEFAULT_STEPS)}."
+                )
+        if steps is None:
+            steps = [JACOBIAN_DEFAULT_STEPS[variable] for variable in variables]
+        steps = np.broadcast_to(np.asarray(steps, dtype=float), (len(variables),))
+        if bounds is None:
+            bounds = {}
+
+        n_turbines = self.core.farm.n_turbines
+        signs = [1.0, -1.0] if central else [1.0]
+        base_setpoints = {
+            "yaw_angles": np.array(self.core.farm.yaw_angles, dtype=float),
+            "power_setpoints": np.array(self.core.farm.power_setpoints, dtype=float),
+            "layout_x": np.array(self.layout_x, dtype=float),
+            "layout_y": np.array(self.layout_y, dtype=float),
+        }
+
+        # Find the perturbed values of each variable, kept within its bounds
+        perturbed_values = []
+        for variable, step in zip(variables, steps):
+            value = base_setpoints[variable]
+            lower, upper = bounds.get(variable, (-np.inf, np.inf))
+            lower = np.broadcast_to(lower, value.shape)
+            upper = np.broadcast_to(upper, value.shape)
+            if central:
+                value_plus = np.minimum(value + step, np.maximum(upper, value))
+                value_minus = np.maximum(value - step, np.minimum(lower, value))
+            else:
+                value_plus = np.where(value + step > upper, value - step, value + step)
+                value_minus = value
+            perturbed_values.append((value_plus, value_minus))
+
+        # Stack the base case with every perturbation
+        cases = {name: [value] for name, value in base_setpoints.items()}
+        for variable, (value_plus, value_minus) in zip(variables, perturbed_values):
+            for sign, turbine in np.ndindex(len(signs), n_turbines):
+                for name, value in base_setpoints.items():
+                    if name == variable:
+                        value = value.copy()
+                        perturbed = value_plus if sign == 0 else value_minus
+                        value[..., turbine] = perturbed[..., turbine]
+                    cases[name].append(value)
+        perturb_layout = "layout_x" in variables or "layout_y" in variables
+        farm_power_cases = self._get_stacked_farm_power(
+            yaw_angles=np.stack(cases["yaw_angles"]),
+            power_setpoints=np.stack(cases["power_setpoints"]),
+            turbine_weights=turbine_weights,
+            layout_x=np.stack(cases["layout_x"]) if perturb_layout else None,
+            layout_y=np.stack(cases["layout_y"]) if perturb_layout else None,
+        )
+        farm_power = farm_power_cases[0]
+
+        jacobian = []
+        for i, (value_plus, value_minus) in enumerate(perturbed_values):
+            i_case = 1 + i * len(signs) * n_turbines
+            perturbed = farm_power_cases[i_case:i_case + len(signs) * n_turbines]
+            perturbed = perturbed.reshape(len(signs), n_turbines, -1)
+            power_minus = perturbed[1] if central else farm_power
+            delta = np.broadcast_to(value_plus - value_minus, (len(farm_power), n_turbines))
+            jacobian.append(
+                np.divide(
+                    (perturbed[0] - power_minus).T,
+                    delta,
+                    out=np.zeros_like(delta),
+                    where=delta != 0.0,
+                )
+            )
+
+        return farm_power, np.hstack(jacobian)
+
+    def get_farm_AEP_gradient(
+        self,
+        variables="layout_x",
+        steps=None,
+        freq=None,
+        turbine_weights=None,
+        hours_per_year=8760,
+        central=False,
+        use_value=False,
+        bounds=None,
+    ) -> tuple[float, NDArrayFloat]:
+        """
+        Compute the AEP (or AVP) of the wind farm and its finite-difference gradient with
+        respect to the yaw angles, power setpoints or coordinates of each turbine, using the
+        stacked solves of get_farm_power_jacobian. Yaw angle and power setpoint perturbations
+        are applied to a turbine at all findices at once.
+
+        Args:
+            variables (str | list[str], optional): The variables to differentiate with respect
+                to, any of "yaw_angles", "power_setpoints", "layout_x" and "layout_y". Defaults
+                to "layout_x".
+            steps (float | list[float] | None, optional): Finite-difference step of each
+                variable, in degrees, W or m. Defaults to None, in which case the steps in
+                JACOBIAN_DEFAULT_STEPS are used.
+            freq (NDArrayFloat): NumPy array with shape (n_findex) with the frequencies of each
+                findex. Defaults to None. If None and a WindData object was supplied, the
+                WindData object's frequencies will be used. Otherwise, uniform frequencies are
+                assumed.
+            turbine_weights (NDArrayFloat | list[float] | None, optional): weighing terms with
+                shape (n_turbines) or (n_findex, n_turbines) that are applied to the turbine
+                powers. Defaults to None, in which case all turbines are weighted by 1.0.
+            hours_per_year (float, optional): Number of hours in a year. Defaults to 365 * 24.
+            central (bool, optional): If True, central differences are used. Defaults to False.
+            use_value (bool, optional): If True, the farm power is multiplied by the values of
+                the WindData object, giving the AVP and its gradient. Defaults to False.
+            bounds (dict | None, optional): Lower and upper bounds of the variables that the
+                perturbations are kept within, see get_farm_power_jacobian. Defaults to None.
+
+        Returns:
+            tuple[float, NDArrayFloat]: The AEP in watt-hours (or the AVP) and its gradient with
+                shape (n_variables * n_turbines).
+        """
+        farm_power, jacobian = self.get_farm_power_jacobian(
+            variables=variables,
+            steps=steps,
+            turbine_weights=turbine_weights,
+            central=central,
+            bounds=bounds,
+        )
+
+        if freq is None:
+            if self.wind_data is None:
+                freq = np.array([1.0/self.core.flow_field.n_findex])
+            else:
+                freq = self.wind_data.unpack_freq()
+        weights = np.broadcast_to(freq, np.shape(farm_power))
+        if use_value:
+            if self.wind_data is not None and self.wind_data.unpack_value() is not None:
+                weights = weights * self.wind_data.unpack_value()
+
+        return (
+            np.nansum(weights * farm_power) * hours_per_year,
+            np.nansum(weights[:, None] * jacobian, axis=0) * hours_per_year,
+        )
+
+    def _get_stacked_farm_power(
+        self,
+        yaw_angles,
+        power_setpoints,
+        turbine_weights=None,
+        layout_x=None,
+        layout_y=None,
+    ) -> NDArrayFloat:
+        """
+        Compute the weighted farm power of several cases of operation setpoints and layouts in a
+        single solve by stacking the cases along the findex axis, each with the current wind
+        conditions. The layout of each case is passed to the solver as a per-findex layout.
+        Since per-findex layouts are only supported by the turbine_grid solver, the cases of
+        other solvers are grouped by layout and each group is solved separately. The cases are
+        run on a copy of this FlorisModel.
+
+        Args:
+            yaw_angles (NDArrayFloat): Yaw angles of each case with shape
+                (n_cases, n_findex, n_turbines).
+            power_setpoints (NDArrayFloat): Power setpoints of each case with shape
+                (n_cases, n_findex, n_turbines).
+            turbine_weights (NDArrayFloat | list[float] | None, optional): weighing terms with
+                shape (n_turbines) or (n_findex, n_turbines). Defaults to None.
+            layout_x (NDArrayFloat | None, optional): Turbine x-coordinates with shape
+                (n_turbines) for all cases or (n_cases, n_turbines) for each case. Defaults to
+                None, in which case the current layout is used.
+            layout_y (NDArrayFloat | None, optional): Turbine y-coordinates with shape
+                (n_turbines) for all cases or (n_cases, n_turbines) for each case. Defaults to
+                None, in which case the current layout is used.
+
+        Returns:
+            NDArrayFloat: The weighted farm power with shape (n_cases, n_findex).
+        """
+        n_cases = len(yaw_angles)
+        flow_field = self.core.flow_field
+        farm = self.core.farm
+
+        if layout_x is not None and np.ndim(layout_x) == 2:
+            if self.core.solver["type"] != "turbine_grid":
+                layouts = np.concatenate([layout_x, layout_y], axis=1)
+                _, case_layouts = np.unique(layouts, axis=0, return_inverse=True)
+                farm_power = np.zeros((n_cases, flow_field.n_findex))
+                for i_layout in np.unique(case_layouts):
+                    ix = np.flatnonzero(case_layouts.flatten() == i_layout)
+                    farm_power[ix] = self._get_stacked_farm_power(
+                        yaw_angles=yaw_angles[ix],
+                        power_setpoints=power_setpoints[ix],
+                        turbine_weights=turbine_weights,
+                        layout_x=layout_x[ix[0]],
+                        layout_y=layout_y[ix[0]],
+                    )
+                return farm_power
+
+            # Give each findex of each case the layout of its case
+            layout_x = np.repeat(layout_x, flow_field.n_findex, axis=0)
+            layout_y = np.repeat(layout_y, flow_field.n_findex, axis=0)
+
+        heterogeneous_inflow_config = flow_field.heterogeneous_inflow_config
+        if heterogeneous_inflow_config is not None:
+            # Reference the speed multiplier rows rather than copying them for every case
+            heterogeneous_inflow_config = dict(heterogeneous_inflow_config)
+            indices = heterogeneous_inflow_config.get(
+                "speed_multiplier_indices", np.arange(flow_field.n_findex)
+            )
+            heterogeneous_inflow_config["speed_multiplier_indices"] = np.tile(indices, n_cases)
+
+        if turbine_weights is not None and np.ndim(turbine_weights) == 2:
+            turbine_weights = np.tile(turbine_weights, (n_cases, 1))
+
+        fmodel = self.copy()
+        fmodel.set(
+            wind_directions=np.tile(flow_field.wind_directions, n_cases),
+            wind_speeds=np.tile(flow_field.wind_speeds, n_cases),
+            turbulence_intensities=np.tile(flow_field.turbulence_intensities, n_cases),
+            heterogeneous_inflow_config=heterogeneous_inflow_config,
+            layout_x=layout_x,
+            layout_y=layout_y,
+            yaw_angles=np.reshape(yaw_angles, (-1, farm.n_turbines)),
+            power_setpoints=np.reshape(power_setpoints, (-1, farm.n_turbines)),
+            awc_modes=np.tile(farm.awc_modes, (n_cases, 1)),
+            awc_amplitudes=np.tile(farm.awc_amplitudes, (n_cases, 1)),
+            awc_frequencies=np.tile(farm.awc_frequencies, (n_cases, 1)),
+        )
+        fmodel.run()
+
+        return fmodel._get_farm_power(turbine_weights=turbine_weights).reshape(n_cases, -1)
+
     def get_turbine_ais(self) -> NDArrayFloat:
         turbine_ais = axial_induction(
             velocities=self.core.flow_field.u,
@@ -998,8 +1586,9 @@ class FlorisModel(LoggingManager):
         if findex_for_viz is None:
             findex_for_viz = 0
 
-        # Store the current state for reinitialization
-        fmodel_viz = copy.deepcopy(self)
+        # Store the current state for reinitialization. set_for_viz replaces the core of the
+        # copy, so a shallow copy leaves this model untouched.
+        fmodel_viz = copy.copy(self)
 
         # Set the solver to a flow field planar grid
         solver_settings = {
@@ -1064,8 +1653,9 @@ class FlorisModel(LoggingManager):
         if findex_for_viz is None:
             findex_for_viz = 0
 
-        # Store the current state for reinitialization
-        fmodel_viz = copy.deepcopy(self)
+        # Store the current state for reinitialization. set_for_viz replaces the core of the
+        # copy, so a shallow copy leaves this model untouched.
+        fmodel_viz = copy.copy(self)
 
         # Set the solver to a flow field planar grid
         solver_settings = {
@@ -1136,8 +1726,9 @@ class FlorisModel(LoggingManager):
         if findex_for_viz is None:
             findex_for_viz = 0
 
-        # Store the current state for reinitialization
-        fmodel_viz = copy.deepcopy(self)
+        # Store the current state for reinitialization. set_for_viz replaces the core of the
+        # copy, so a shallow copy leaves this model untouched.
+        fmodel_viz = copy.copy(self)
 
         # Set the solver to a flow field planar grid
         solver_settings = {
@@ -1430,7 +2021,7 @@ class FlorisModel(LoggingManager):
         if isinstance(operation_model, str):
             if len(self.core.farm.turbine_type) == 1:
                 # Set a single one here, then, and return
-                turbine_type = self.core.farm.turbine_definitions[0]
+                turbine_type = copy.deepcopy(self.core.farm.turbine_definitions[0])
                 turbine_type["operation_model"] = operation_model
                 self.set(turbine_type=[turbine_type])
                 return
@@ -1443,7 +2034,9 @@ class FlorisModel(LoggingManager):
                     "equal to the number of turbines."
                 )
 
-        turbine_type_list = self.core.farm.turbine_definitions
+        # Copy the definitions before modifying them since they are shared with copies of this
+        # model
+        turbine_type_list = copy.deepcopy(self.core.farm.turbine_definitions)
 
         for tindex in range(self.core.farm.n_turbines):
             turbine_type_list[tindex]["turbine_type"] = (
@@ -1454,8 +2047,85 @@ class FlorisModel(LoggingManager):
         self.set(turbine_type=turbine_type_list)
 
     def copy(self):
-        """Create an independent copy of the current FlorisModel object"""
-        return FlorisModel(self.core.as_dict())
+        """
+        Create an independent copy of the current FlorisModel object. The copy has default
+        operation setpoints and no stored wind_data. It shares the constructed turbine, wake
+        and grid objects with this model rather than rebuilding them; see
+        :py:meth:`~.core.Core.copy`.
+        """
+        fmodel_copy = copy.copy(self)
+        fmodel_copy.core = self.core.copy()
+        fmodel_copy._wind_data = None
+        return fmodel_copy
+
+    def save_snapshot(self, filename: str | Path, include_flow_field: bool = False) -> None:
+        """
+        Save the fully constructed model to a binary snapshot file. Unlike exporting the input
+        dictionary, the snapshot stores the constructed farm, turbine, wake and grid objects so
+        that loading it does not need to parse inputs or rebuild the model.
+
+        Args:
+            filename (str | Path): Path of the snapshot file to write.
+            include_flow_field (bool, optional): If True and the model has been run, the solved
+                flow field is stored as well so that outputs are available immediately after
+                loading. Defaults to False.
+        """
+        flow_field = self.core.flow_field
+        state = self.core.state
+        solved_fields = {}
+        if not include_flow_field:
+            # Temporarily detach the solved arrays so they are not written to the file
+            for name in FLOW_FIELD_SOLUTION_ATTRIBUTES:
+                solved_fields[name] = getattr(flow_field, name)
+                setattr(flow_field, name, np.array([]))
+            self.core.state = State.UNINITIALIZED
+
+        try:
+            write_snapshot(filename, {"core": self.core, "wind_data": self._wind_data})
+        finally:
+            for name, value in solved_fields.items():
+                setattr(flow_field, name, value)
+            self.core.state = state
+
+    @classmethod
+    def load_snapshot(cls, filename: str | Path, mmap: bool = True) -> FlorisModel:
+        """
+        Load a FlorisModel from a snapshot file written with
+        :py:meth:`~.FlorisModel.save_snapshot`. Snapshots are pickle based, so only load files
+        from trusted sources.
+
+        Args:
+            filename (str | Path): Path of the snapshot file.
+            mmap (bool, optional): If True, the model's arrays are copy-on-write views into a
+                memory map of the file rather than copies in memory. Defaults to True.
+
+        Returns:
+            FlorisModel: The restored model.
+        """
+        contents, header = read_snapshot(filename, mmap=mmap)
+
+        fmodel = cls.__new__(cls)
+        fmodel.configuration = filename
+        fmodel.core = contents["core"]
+        fmodel._wind_data = contents["wind_data"]
+
+        # Logging is configured during Core construction, which a snapshot skips
+        logging_manager.configure_console_log(
+            fmodel.core.logging["console"]["enable"],
+            fmodel.core.logging["console"]["level"],
+        )
+        logging_manager.configure_file_log(
+            fmodel.core.logging["file"]["enable"],
+            fmodel.core.logging["file"]["level"],
+        )
+
+        if header["floris_version"] != __version__:
+            fmodel.logger.warning(
+                f"The snapshot {filename} was written with FLORIS version "
+                f"{header['floris_version']}, but the current version is {__version__}."
+            )
+
+        return fmodel
 
     def get_param(
         self,
@@ -0,0 +1,131 @@
+"""
+Spacing and boundary constraints shared by the layout optimizers, with their analytic
+gradients with respect to the turbine coordinates.
+
+The spacing constraint only needs the distance of each turbine to its nearest neighbor,
+which is found with a KD-tree rather than from all pairwise distances. The boundary
+distances are computed for all turbines and boundary segments at once.
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def get_nearest_turbine_distances(x, y):
+    """
+    Find the distance of each turbine to its nearest neighbor.
+
+    Args:
+        x (NDArrayFloat): x-coordinates of the turbines (m).
+        y (NDArrayFloat): y-coordinates of the turbines (m).
+
+    Returns:
+        tuple[NDArrayFloat, NDArrayInt]: The distance of each turbine to its nearest
+            neighbor (m) and the index of that neighbor.
+    """
+    locs = np.column_stack((x, y))
+    distances, indices = cKDTree(locs).query(locs, k=2)
+
+    # The nearest point is usually the turbine itself, unless turbines coincide
+    is_self = indices[:, 0] == np.arange(len(locs))
+    nearest = np.where(is_self, indices[:, 1], indices[:, 0])
+    return np.where(is_self, distances[:, 1], distances[:, 0]), nearest
+
+
+def space_constraint(x, y, min_dist, rho=500, gradient=False):
+    """
+    Aggregate the spacing of all turbines into a single constraint with the
+    Kreisselmeier-Steinhauser function of 1 - d_i / min_dist, where d_i is the distance of
+    turbine i to its nearest neighbor. The constraint is satisfied when it is <= 0.
+
+    Args:
+        x (NDArrayFloat): x-coordinates of the turbines (m).
+        y (NDArrayFloat): y-coordinates of the turbines (m).
+        min_dist (float): The minimum distance between turbines (m).
+        rho (float, optional): Aggregation parameter of the KS function. Defaults to 500.
+        gradient (bool, optional): If True, the gradients of the constraint with respect to
+            the turbine coordinates are returned as well. Defaults to False.
+
+    Returns:
+        float | tuple[float, NDArrayFloat, NDArrayFloat]: The constraint and, if gradient is
+            True, its gradients with respect to x and y (1/m).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dist, nearest = get_nearest_turbine_distances(x, y)
+    g = 1 - dist / min_dist
+
+    # Following code copied from OpenMDAO KSComp().
+    g_max = np.max(g)
+    exponents = np.exp(rho * (g - g_max))
+    summation = np.sum(exponents)
+    KS_constraint = g_max + 1.0 / rho * np.log(summation)
+    if not gradient:
+        return KS_constraint
+
+    # dKS/dg_i are the softmax weights, and g_i only depends on turbine i and its neighbor
+    dKS_ddist = -exponents / summation / min_dist
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ux = np.nan_to_num((x - x[nearest]) / dist)
+        uy = np.nan_to_num((y - y[nearest]) / dist)
+    n_turbines = len(dist)
+    grad_x = dKS_ddist * ux - np.bincount(nearest, dKS_ddist * ux, minlength=n_turbines)
+    grad_y = dKS_ddist * uy - np.bincount(nearest, dKS_ddist * uy, minlength=n_turbines)
+
+    return KS_constraint, grad_x, grad_y
+
+
+def distance_from_boundaries(x, y, boundaries, gradient=False):
+    """
+    Compute the signed distance of each turbine to the boundary polygon, which is positive
+    inside of the polygon and negative outside of it. The polygon is closed if its last
+    vertex differs from its first.
+
+    Args:
+        x (NDArrayFloat): x-coordinates of the turbines (m).
+        y (NDArrayFloat): y-coordinates of the turbines (m).
+        boundaries (iterable(float, float)): Pairs of x- and y-coordinates that represent
+            the boundary's vertices (m).
+        gradient (bool, optional): If True, the gradients of each distance with respect to
+            the coordinates of its turbine are returned as well. Defaults to False.
+
+    Returns:
+        NDArrayFloat | tuple[NDArrayFloat, NDArrayFloat, NDArrayFloat]: The signed distance
+            of each turbine (m) and, if gradient is True, its derivatives with respect to the
+            x- and y-coordinate of the turbine.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    start = np.asarray(boundaries, dtype=float)
+    end = np.roll(start, -1, axis=0)
+    if np.all(start[0] == start[-1]):
+        start, end = start[:-1], end[:-1]
+    segment = end - start
+
+    # Closest point of each boundary segment to each turbine
+    px = x[:, None] - start[None, :, 0]
+    py = y[:, None] - start[None, :, 1]
+    t = (px * segment[:, 0] + py * segment[:, 1]) / np.sum(segment ** 2, axis=1)
+    t = np.clip(t, 0.0, 1.0)
+    dx = px - t * segment[:, 0]
+    dy = py - t * segment[:, 1]
+    distances = np.hypot(dx, dy)
+    closest = np.argmin(distances, axis=1)
+    turbines = np.arange(len(closest))
+
+    # Even-odd rule: count the segments crossed by a ray from each turbine in the +x direction
+    crosses = (start[:, 1] > y[:, None]) != (end[:, 1] > y[:, None])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_cross = start[:, 0] + (y[:, None] - start[:, 1]) * segment[:, 0] / segment[:, 1]
+    inside = np.sum(crosses & (x[:, None] < x_cross), axis=1) % 2 == 1
+    sign = np.where(inside, 1.0, -1.0)
+
+    boundary_con = sign * distances[turbines, closest]
+    if not gradient:
+        return boundary_con
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grad_x = np.nan_to_num(sign * dx[turbines, closest] / distances[turbines, closest])
+        grad_y = np.nan_to_num(sign * dy[turbines, closest] / distances[turbines, closest])
+
+    return boundary_con, grad_x, grad_y
@@ -101,9 +101,9 @@ class LayoutOptimization(LoggingManager):
         # NOTE: requires that child class saves x and y locations
         # as self.x and self.y and updates them during optimization.
         if self.enable_geometric_yaw:
-            self.yaw_opt.fmodel_subset.set(layout_x=self.x, layout_y=self.y)
-            df_opt = self.yaw_opt.optimize()
-            self.yaw_angles = np.vstack(df_opt['yaw_angles_opt'])[:, :]
+            # Geometric yaw only depends on the layout, so the layout is passed directly
+            # rather than set on the yaw optimizer's FlorisModel
+            self.yaw_angles = self.yaw_opt._get_geometric_yaw_angles(self.x, self.y)
         else:
             self.yaw_angles = None
 
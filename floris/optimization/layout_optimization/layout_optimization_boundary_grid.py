@@ -8,6 +8,7 @@ from shapely.geometry import (
     Polygon,
 )
 
+from .layout_constraints import get_nearest_turbine_distances, space_constraint
 from .layout_optimization_base import LayoutOptimization
 
 
@@ -628,21 +629,6 @@ class LayoutOptimizationBoundaryGrid(LayoutOptimization):
         plt.tick_params(which="both", labelsize=fontsize)
 
     def space_constraint(self, x, y, min_dist, rho=500):
-        # Calculate distances between turbines
-        locs = np.vstack((x, y)).T
-        distances = cdist(locs, locs)
-        arange = np.arange(distances.shape[0])
-        distances[arange, arange] = 1e10
-        dist = np.min(distances, axis=0)
-
-        g = 1 - np.array(dist) / min_dist
-
-        # Following code copied from OpenMDAO KSComp().
         # Constraint is satisfied when KS_constraint <= 0
-        g_max = np.max(np.atleast_2d(g), axis=-1)[:, np.newaxis]
-        g_diff = g - g_max
-        exponents = np.exp(rho * g_diff)
-        summation = np.sum(exponents, axis=-1)[:, np.newaxis]
-        KS_constraint = g_max + 1.0 / rho * np.log(summation)
-
-        return KS_constraint[0][0], dist
+        dist, _ = get_nearest_turbine_distances(x, y)
+        return space_constraint(x, y, min_dist, rho=rho), dist
@@ -0,0 +1,445 @@
+import json
+import os
+from pathlib import Path
+from time import perf_counter as timerpc
+
+import numpy as np
+import shapely
+
+from floris import FlorisModel
+from floris.optimization.yaw_optimization.yaw_optimizer_geometric import geometric_yaw
+
+from .layout_optimization_base import LayoutOptimization
+
+
+# Layout evaluation state of each worker of the warm pool. The FlorisModel is built once when
+# the worker starts, so that each generation only sends the candidate layouts to the workers.
+_worker_state = {}
+
+
+def _initialize_worker(state):
+    _worker_state.update(state)
+    _worker_state["fmodel"] = FlorisModel(state["fmodel"])
+
+
+def _get_layouts_AEP_worker(layouts):
+    return _get_layouts_AEP(_worker_state, *layouts)
+
+
+def _get_layouts_AEP(state, layouts_x, layouts_y):
+    """
+    Compute the AEP (or AVP) of several layouts by solving each batch of
+    state["n_layouts_per_solve"] layouts as a single stack of per-findex layouts.
+    """
+    fmodel = state["fmodel"]
+    farm = fmodel.core.farm
+    n_findex = fmodel.core.flow_field.n_findex
+
+    farm_AEP = np.zeros(len(layouts_x))
+    n_layouts_per_solve = state["n_layouts_per_solve"] or len(layouts_x)
+    for i in range(0, len(layouts_x), n_layouts_per_solve):
+        x = layouts_x[i:i + n_layouts_per_solve]
+        y = layouts_y[i:i + n_layouts_per_solve]
+        shape = (len(x), n_findex, farm.n_turbines)
+
+        if state["enable_geometric_yaw"]:
+            # Evaluate all findex of all layouts at once, each with the layout of its case
+            yaw_angles = geometric_yaw(
+                np.repeat(x, n_findex, axis=0),
+                np.repeat(y, n_findex, axis=0),
+                np.tile(fmodel.core.flow_field.wind_directions, len(x)),
+                state["rotor_diameter"],
+            ).reshape(shape)
+        else:
+            yaw_angles = np.broadcast_to(farm.yaw_angles, shape)
+
+        farm_power = fmodel._get_stacked_farm_power(
+            yaw_angles=yaw_angles,
+            power_setpoints=np.broadcast_to(farm.power_setpoints, shape),
+            layout_x=x,
+            layout_y=y,
+        )
+        farm_AEP[i:i + n_layouts_per_solve] = (
+            np.nansum(state["weights"] * farm_power, axis=1) * state["hours_per_year"]
+        )
+
+    return farm_AEP
+
+
+class LayoutOptimizationGenetic(LayoutOptimization):
+    """
+    This class provides a genetic algorithm for optimizing the layout of wind
+    turbines. The optimization objective is to maximize annual energy production
+    (AEP) or annual value production (AVP). Each generation is evaluated as a
+    whole: the candidate layouts are split across the workers of a warm process
+    pool and each worker solves its layouts as stacked per-findex layouts. The
+    spacing and boundary constraints are evaluated for the whole population at
+    once, and layouts that violate them are ranked by their violation without
+    being solved. The state of the optimization can be written to a checkpoint
+    file after every generation and resumed from it.
+
+    Args:
+        fmodel (FlorisModel): A FlorisModel object.
+        boundaries (iterable(float, float)): Pairs of x- and y-coordinates
+            that represent the boundary's vertices (m).
+        min_dist (float, optional): The minimum distance to be maintained
+            between turbines during the optimization (m). If not specified,
+            initializes to 2 rotor diameters. Defaults to None.
+        population_size (int, optional): Number of layouts in each generation.
+            Defaults to 20.
+        n_generations (int, optional): Number of generations to evolve.
+            Defaults to 50.
+        n_elite (int, optional): Number of best layouts that are carried over
+            unchanged to the next generation. Defaults to 2.
+        mutation_rate (float, optional): Probability that a turbine is moved
+            when a layout is mutated. If None, one turbine per layout is moved on
+            average. Defaults to None.
+        mutation_scale (float, optional): Standard deviation of the turbine
+            movements as a fraction of the extent of the boundaries. Defaults
+            to 0.05.
+        random_seed (int, optional): Seed of the random number generator.
+            Defaults to None.
+        interface (str, optional): Parallel computing interface used to
+            evaluate the population, one of 'multiprocessing', 'concurrent' or
+            'mpi4py'. If None, the population is evaluated in this process.
+            Defaults to None.
+        max_workers (int, optional): Number of workers of the process pool.
+            Defaults to None, in which case the default of the interface is used.
+        n_layouts_per_solve (int, optional): Maximum number of layouts that are
+            stacked in a single solve, which limits the memory use for large
+            farms and wind roses. If None, all layouts of a worker are solved
+            at once. Defaults to None.
+        checkpoint_file (str | Path, optional): Path of a .npz file to which the
+            state of the optimization is written after every generation.
+            Defaults to None, in which case no checkpoints are written.
+        enable_geometric_yaw (bool, optional): If True, enables geometric yaw
+            optimization. Defaults to False.
+        use_value (bool, optional): If True, the layout optimization objective
+            is to maximize annual value production using the value array in the
+            FLORIS model's WindData object. If False, the optimization
+            objective is to maximize AEP. Defaults to False.
+    """
+    def __init__(
+        self,
+        fmodel,
+        boundaries,
+        min_dist=None,
+        population_size=20,
+        n_generations=50,
+        n_elite=2,
+        mutation_rate=None,
+        mutation_scale=0.05,
+        random_seed=None,
+        interface=None,
+        max_workers=None,
+        n_layouts_per_solve=None,
+        checkpoint_file=None,
+        enable_geometric_yaw=False,
+        use_value=False,
+    ):
+        super().__init__(
+            fmodel,
+            boundaries,
+            min_dist=min_dist,
+            enable_geometric_yaw=enable_geometric_yaw,
+            use_value=use_value
+        )
+
+        if interface == "mpi4py":
+            import mpi4py.futures as mp
+            self._PoolExecutor = mp.MPIPoolExecutor
+        elif interface == "multiprocessing":
+            import multiprocessing as mp
+            self._PoolExecutor = mp.Pool
+        elif interface == "concurrent":
+            from concurrent.futures import ProcessPoolExecutor
+            self._PoolExecutor = ProcessPoolExecutor
+        elif interface is not None:
+            raise ValueError(
+                f"Interface '{interface}' not recognized. "
+                "Please use 'concurrent', 'multiprocessing', 'mpi4py' or None."
+            )
+        if n_elite >= population_size:
+            raise ValueError("n_elite must be smaller than population_size.")
+
+        self.population_size = population_size
+        self.n_generations = n_generations
+        self.n_elite = n_elite
+        self.mutation_rate = 1.0 / self.nturbs if mutation_rate is None else mutation_rate
+        self.mutation_scale = mutation_scale
+        self.interface = interface
+        self.max_workers = max_workers
+        self.n_layouts_per_solve = n_layouts_per_solve
+        self.checkpoint_file = None if checkpoint_file is None else Path(checkpoint_file)
+        self.rng = np.random.default_rng(random_seed)
+
+        self.x0 = np.array(self.fmodel.layout_x, dtype=float)
+        self.y0 = np.array(self.fmodel.layout_y, dtype=float)
+
+        self.generation = 0
+        self.n_evaluations = 0
+        self.history = []
+
+    # Private methods
+
+    def _get_evaluation_state(self):
+        n_findex = self.fmodel.core.flow_field.n_findex
+        if self.fmodel.wind_data is None:
+            freq = np.array([1.0 / n_findex])
+            value = np.array([1.0])
+        else:
+            freq = self.fmodel.wind_data.unpack_freq()
+            value = self.fmodel.wind_data.unpack_value()
+        weights = np.broadcast_to(freq, (n_findex,))
+        if self.use_value and value is not None:
+            weights = weights * value
+
+        return {
+            "fmodel": self.fmodel.core.as_dict(),
+            "weights": weights,
+            "hours_per_year": 8760,
+            "n_layouts_per_solve": self.n_layouts_per_solve,
+            "enable_geometric_yaw": self.enable_geometric_yaw,
+            "rotor_diameter": self.fmodel.core.farm.turbine_definitions[0]["rotor_diameter"],
+        }
+
+    def _get_constraint_violations(self, layouts_x, layouts_y):
+        """
+        Sum the violations of the spacing and boundary constraints of each layout (m).
+        """
+        # Spacing violation of each pair of turbines
+        distances = np.hypot(
+            layouts_x[:, :, None] - layouts_x[:, None, :],
+            layouts_y[:, :, None] - layouts_y[:, None, :],
+        )
+        spacing = np.triu(np.maximum(self.min_dist - distances, 0.0), k=1).sum(axis=(1, 2))
+
+        # Distance of each turbine outside of the boundaries
+        outside = ~shapely.contains_xy(self._boundary_polygon, layouts_x, layouts_y)
+        boundary = np.where(
+            outside,
+            shapely.distance(
+                self._boundary_polygon.exterior, shapely.points(layouts_x, layouts_y)
+            ),
+            0.0,
+        ).sum(axis=1)
+
+        return spacing + boundary
+
+    def _evaluate(self, layouts_x, layouts_y, pool):
+        """
+        Compute the fitness of each layout. Layouts that satisfy the constraints are ranked
+        by their normalized AEP (or AVP), which is positive. The others are only ranked by
+        their constraint violation relative to the minimum distance, which is negative.
+        """
+        violations = self._get_constraint_violations(layouts_x, layouts_y)
+        fitness = -violations / self.min_dist
+        feasible = np.flatnonzero(violations == 0.0)
+        if len(feasible) == 0:
+            return fitness
+
+        if pool is None:
+            farm_AEP = _get_layouts_AEP(
+                self._evaluation_state, layouts_x[feasible], layouts_y[feasible]
+            )
+        else:
+            chunks = np.array_split(feasible, min(len(feasible), self._n_chunks))
+            out = pool.map(
+                _get_layouts_AEP_worker,
+                [(layouts_x[chunk], layouts_y[chunk]) for chunk in chunks],
+            )
+            farm_AEP = np.concatenate(list(out))
+        self.n_evaluations += len(feasible)
+
+        fitness[feasible] = farm_AEP / self.initial_AEP_or_AVP
+        return fitness
+
+    def _initialize_population(self):
+        """
+        Start from the initial layout and random layouts with all turbines within the
+        boundaries.
+        """
+        n_random = self.population_size - 1
+        layouts_x = np.zeros((n_random, self.nturbs))
+        layouts_y = np.zeros((n_random, self.nturbs))
+        missing = np.ones((n_random, self.nturbs), dtype=bool)
+        while missing.any():
+            n_missing = missing.sum()
+            layouts_x[missing] = self.rng.uniform(self.xmin, self.xmax, n_missing)
+            layouts_y[missing] = self.rng.uniform(self.ymin, self.ymax, n_missing)
+            missing &= ~shapely.contains_xy(self._boundary_polygon, layouts_x, layouts_y)
+
+        self.layouts_x = np.vstack([self.x0, layouts_x])
+        self.layouts_y = np.vstack([self.y0, layouts_y])
+
+    def _get_offspring(self, n_offspring):
+        """
+        Select parents by binary tournament, combine them by uniform crossover of the turbine
+        positions and mutate the children with Gaussian moves of single turbines.
+        """
+        contenders = self.rng.integers(0, self.population_size, (2, n_offspring, 2))
+        winners = np.where(
+            self.fitness[contenders[:, :, 0]] >= self.fitness[contenders[:, :, 1]],
+            contenders[:, :, 0],
+            contenders[:, :, 1],
+        )
+        crossover = self.rng.random((n_offspring, self.nturbs)) < 0.5
+        parents = np.where(crossover, winners[0][:, None], winners[1][:, None])
+        turbines = np.arange(self.nturbs)
+        layouts_x = self.layouts_x[parents, turbines]
+        layouts_y = self.layouts_y[parents, turbines]
+
+        mutation = self.rng.random((n_offspring, self.nturbs)) < self.mutation_rate
+        scale = self.mutation_scale * np.array([self.xmax - self.xmin, self.ymax - self.ymin])
+        layouts_x += mutation * self.rng.normal(0.0, scale[0], mutation.shape)
+        layouts_y += mutation * self.rng.normal(0.0, scale[1], mutation.shape)
+
+        return (
+            np.clip(layouts_x, self.xmin, self.xmax),
+            np.clip(layouts_y, self.ymin, self.ymax),
+        )
+
+    def _step(self, pool):
+        elite = np.argsort(-self.fitness)[:self.n_elite]
+        layouts_x, layouts_y = self._get_offspring(self.population_size - self.n_elite)
+        fitness = self._evaluate(layouts_x, layouts_y, pool)
+
+        self.layouts_x = np.vstack([self.layouts_x[elite], layouts_x])
+        self.layouts_y = np.vstack([self.layouts_y[elite], layouts_y])
+        self.fitness = np.concatenate([self.fitness[elite], fitness])
+        self.generation += 1
+
+    def _optimize(self, resume=False, print_progress=False):
+        self._evaluation_state = self._get_evaluation_state()
+
+        if resume and self.checkpoint_file is not None and self.checkpoint_file.exists():
+            self.load_checkpoint(self.checkpoint_file)
+        else:
+            self._initialize_population()
+            self.fitness = None
+
+        pool = None
+        if self.interface is not None:
+            # The pool is kept warm for all generations of the optimization
+            worker_state = {**self._evaluation_state}
+            if self.interface == "multiprocessing":
+                pool = self._PoolExecutor(
+                    self.max_workers, _initialize_worker, (worker_state,)
+                )
+            else:
+                pool = self._PoolExecutor(
+                    self.max_workers, initializer=_initialize_worker, initargs=(worker_state,)
+                )
+            self._n_chunks = self.max_workers or os.cpu_count() or 1
+        else:
+            self._evaluation_state["fmodel"] = self.fmodel
+
+        try:
+            if self.fitness is None:
+                self.fitness = self._evaluate(self.layouts_x, self.layouts_y, pool)
+                self.history.append(np.max(self.fitness))
+                self._write_checkpoint()
+
+            while self.generation < self.n_generations:
+                t0 = timerpc()
+                self._step(pool)
+                self.history.append(np.max(self.fitness))
+                self._write_checkpoint()
+                if print_progress:
+                    print(
+                        f"Generation {self.generation}/{self.n_generations}: best objective "
+                        f"{self.history[-1]:.6f} ({timerpc() - t0:.2f} s)"
+                    )
+        finally:
+            if pool is not None:
+                if self.interface == "multiprocessing":
+                    pool.terminate()
+                else:
+                    pool.shutdown()
+
+        best = np.argmax(self.fitness)
+        self.x_opt = self.layouts_x[best]
+        self.y_opt = self.layouts_y[best]
+        return self.x_opt, self.y_opt
+
+    def _write_checkpoint(self):
+        if self.checkpoint_file is not None:
+            self.save_checkpoint(self.checkpoint_file)
+
+    def _get_initial_and_final_locs(self):
+        return self.x0, self.y0, self.x_opt, self.y_opt
+
+    # Public methods
+
+    def save_checkpoint(self, filename):
+        """
+        Write the population, its fitness and the state of the random number generator to a
+        .npz file. The file is replaced atomically, so an interrupted write leaves the
+        previous checkpoint intact.
+
+        Args:
+            filename (str | Path): Path of the checkpoint file.
+        """
+        filename = Path(filename)
+        tmp_filename = filename.with_name(filename.name + ".tmp.npz")
+        np.savez(
+            tmp_filename,
+            layouts_x=self.layouts_x,
+            layouts_y=self.layouts_y,
+            fitness=self.fitness,
+            history=np.array(self.history),
+            generation=self.generation,
+            n_evaluations=self.n_evaluations,
+            rng_state=json.dumps(self.rng.bit_generator.state),
+        )
+        os.replace(tmp_filename, filename)
+
+    def load_checkpoint(self, filename):
+        """
+        Restore the state of the optimization from a checkpoint file written by
+        save_checkpoint.
+
+        Args:
+            filename (str | Path): Path of the checkpoint file.
+        """
+        with np.load(filename) as data:
+            if data["layouts_x"].shape != (self.population_size, self.nturbs):
+                raise ValueError(
+                    f"The checkpoint {filename} holds a population with shape "
+                    f"{data['layouts_x'].shape}, but a population with shape "
+                    f"{(self.population_size, self.nturbs)} is expected."
+                )
+            self.layouts_x = data["layouts_x"]
+            self.layouts_y = data["layouts_y"]
+            self.fitness = data["fitness"]
+            self.history = list(data["history"])
+            self.generation = int(data["generation"])
+            self.n_evaluations = int(data["n_evaluations"])
+            self.rng.bit_generator.state = json.loads(str(data["rng_state"]))
+
+    def optimize(self, resume=False, print_progress=False):
+        """
+        This method finds the optimized layout of wind turbines for power
+        production given the provided frequencies of occurrence of wind
+        conditions (wind speed, direction).
+
+        Args:
+            resume (bool, optional): If True and the checkpoint file exists, the
+                optimization continues from the checkpoint. Defaults to False.
+            print_progress (bool, optional): If True, the best objective of each
+                generation is printed. Defaults to False.
+
+        Returns:
+            opt_locs (iterable): A list of the optimized locations of each
+            turbine (m).
+        """
+        print("=====================================================")
+        print("Optimizing turbine layout...")
+        print("Number of parameters to optimize = ", 2 * self.nturbs)
+        print("=====================================================")
+
+        x_opt, y_opt = self._optimize(resume=resume, print_progress=print_progress)
+
+        print("Optimization complete.")
+
+        return [list(x_opt), list(y_opt)]
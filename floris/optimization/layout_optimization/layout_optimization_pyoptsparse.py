@@ -1,9 +1,8 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.spatial.distance import cdist
-from shapely.geometry import Point
 
+from .layout_constraints import distance_from_boundaries, space_constraint
 from .layout_optimization_base import LayoutOptimization
 
 
@@ -106,24 +105,24 @@ class LayoutOptimizationPyOptSparse(LayoutOptimization):
         exec("self.opt = pyoptsparse." + self.solver + "(options=self.optOptions)")
 
     def _optimize(self):
-        if hasattr(self, "_sens"):
-            self.sol = self.opt(self.optProb, sens=self._sens)
+        # Supply the gradients from stacked solves unless the yaw angles depend on the
+        # layout through geometric yaw
+        sens = "CDR" if self.enable_geometric_yaw else self._sens
+        if self.timeLimit is not None:
+            self.sol = self.opt(
+                self.optProb,
+                sens=sens,
+                storeHistory=self.storeHistory,
+                timeLimit=self.timeLimit,
+                hotStart=self.hotStart
+            )
         else:
-            if self.timeLimit is not None:
-                self.sol = self.opt(
-                    self.optProb,
-                    sens="CDR",
-                    storeHistory=self.storeHistory,
-                    timeLimit=self.timeLimit,
-                    hotStart=self.hotStart
-                )
-            else:
-                self.sol = self.opt(
-                    self.optProb,
-                    sens="CDR",
-                    storeHistory=self.storeHistory,
-                    hotStart=self.hotStart
-                )
+            self.sol = self.opt(
+                self.optProb,
+                sens=sens,
+                storeHistory=self.storeHistory,
+                hotStart=self.hotStart
+            )
         return self.sol
 
     def _obj_func(self, varDict):
@@ -149,11 +148,44 @@ class LayoutOptimizationPyOptSparse(LayoutOptimization):
         fail = False
         return funcs, fail
 
-    # Optionally, the user can supply the optimization with gradients
-    # def _sens(self, varDict, funcs):
-    #     funcsSens = {}
-    #     fail = False
-    #     return funcsSens, fail
+    def _sens(self, varDict, funcs, step=1e-4):
+        # Parse the variable dictionary
+        self.parse_opt_vars(varDict)
+        self.fmodel.set(layout_x=self.x, layout_y=self.y)
+
+        # Gradient of the objective from stacked solves, in normalized coordinates
+        x_range = self.xmax - self.xmin
+        y_range = self.ymax - self.ymin
+        _, gradient = self.fmodel.get_farm_AEP_gradient(
+            variables=["layout_x", "layout_y"],
+            steps=[step * x_range, step * y_range],
+            use_value=self.use_value,
+        )
+        gradient = -1 * gradient / self.initial_AEP_or_AVP
+        funcsSens = {
+            "obj": {
+                "x": gradient[None, : self.nturbs] * x_range,
+                "y": gradient[None, self.nturbs :] * y_range,
+            }
+        }
+
+        # Analytic gradients of the geometric constraints. Each boundary distance only
+        # depends on the coordinates of its own turbine.
+        _, grad_x, grad_y = distance_from_boundaries(
+            self.x, self.y, self.boundaries, gradient=True
+        )
+        funcsSens["boundary_con"] = {
+            "x": -1 * np.diag(grad_x * x_range),
+            "y": -1 * np.diag(grad_y * y_range),
+        }
+        _, grad_x, grad_y = space_constraint(self.x, self.y, self.min_dist, gradient=True)
+        funcsSens["spacing_con"] = {
+            "x": grad_x[None, :] * x_range,
+            "y": grad_y[None, :] * y_range,
+        }
+
+        fail = False
+        return funcsSens, fail
 
     def parse_opt_vars(self, varDict):
         self.x = self._unnorm(varDict["x"], self.xmin, self.xmax)
@@ -186,34 +218,12 @@ class LayoutOptimizationPyOptSparse(LayoutOptimization):
         return funcs
 
     def space_constraint(self, x, y, rho=500):
-        # Calculate distances between turbines
-        locs = np.vstack((x, y)).T
-        distances = cdist(locs, locs)
-        arange = np.arange(distances.shape[0])
-        distances[arange, arange] = 1e10
-        dist = np.min(distances, axis=0)
-
-        g = 1 - np.array(dist) / self.min_dist
-
-        # Following code copied from OpenMDAO KSComp().
         # Constraint is satisfied when KS_constraint <= 0
-        g_max = np.max(np.atleast_2d(g), axis=-1)[:, np.newaxis]
-        g_diff = g - g_max
-        exponents = np.exp(rho * g_diff)
-        summation = np.sum(exponents, axis=-1)[:, np.newaxis]
-        KS_constraint = g_max + 1.0 / rho * np.log(summation)
-
-        return KS_constraint[0][0]
+        return space_constraint(x, y, self.min_dist, rho=rho)
 
     def distance_from_boundaries(self, x, y):
-        boundary_con = np.zeros(self.nturbs)
-        for i in range(self.nturbs):
-            loc = Point(x[i], y[i])
-            boundary_con[i] = loc.distance(self._boundary_line)
-            if self._boundary_polygon.contains(loc) is True:
-                boundary_con[i] *= -1.0
-
-        return boundary_con
+        # Constraint is satisfied when the distances are <= 0, i.e. inside of the boundaries
+        return -1 * distance_from_boundaries(x, y, self.boundaries)
 
     def _get_initial_and_final_locs(self):
         x_initial = self._unnorm(self.x0, self.xmin, self.xmax)
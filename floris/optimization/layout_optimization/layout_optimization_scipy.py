@@ -2,9 +2,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.optimize import minimize
-from scipy.spatial.distance import cdist
-from shapely.geometry import Point
 
+from .layout_constraints import distance_from_boundaries, space_constraint
 from .layout_optimization_base import LayoutOptimization
 
 
@@ -88,10 +87,14 @@ class LayoutOptimizationScipy(LayoutOptimization):
     # Private methods
 
     def _optimize(self):
+        # The AEP gradient is evaluated in stacked solves unless the yaw angles depend on
+        # the layout through geometric yaw, in which case the solver's own finite
+        # differences are used
         self.residual_plant = minimize(
             self._obj_func,
             self.x0,
             method=self.solver,
+            jac=None if self.enable_geometric_yaw else self._obj_grad,
             bounds=self.bnds,
             constraints=self.cons,
             options=self.optOptions,
@@ -118,6 +121,33 @@ class LayoutOptimizationScipy(LayoutOptimization):
         else:
             return -1 * self.fmodel.get_farm_AEP() / self.initial_AEP_or_AVP
 
+    def _obj_grad(self, locs):
+        locs_unnorm = [
+            self._unnorm(valx, self.xmin, self.xmax)
+            for valx in locs[0 : self.nturbs]
+        ] + [
+            self._unnorm(valy, self.ymin, self.ymax)
+            for valy in locs[self.nturbs : 2 * self.nturbs]
+        ]
+        self._change_coordinates(locs_unnorm)
+
+        # Use the solver's step size and bounds, converted from normalized coordinates to
+        # meters, so that the perturbed layouts stay within the bounds as in SciPy's own
+        # finite differences
+        eps = self.optOptions["eps"]
+        bnds = np.array(self.bnds, dtype=float)
+        bounds_x = self._unnorm(bnds[0 : self.nturbs].T, self.xmin, self.xmax)
+        bounds_y = self._unnorm(bnds[self.nturbs : 2 * self.nturbs].T, self.ymin, self.ymax)
+        _, gradient = self.fmodel.get_farm_AEP_gradient(
+            variables=["layout_x", "layout_y"],
+            steps=[eps * (self.xmax - self.xmin), eps * (self.ymax - self.ymin)],
+            use_value=self.use_value,
+            bounds={"layout_x": tuple(bounds_x), "layout_y": tuple(bounds_y)},
+        )
+        gradient[0 : self.nturbs] *= self.xmax - self.xmin
+        gradient[self.nturbs : 2 * self.nturbs] *= self.ymax - self.ymin
+
+        return -1 * gradient / self.initial_AEP_or_AVP
 
     def _change_coordinates(self, locs):
         # Parse the layout coordinates
@@ -135,10 +165,12 @@ class LayoutOptimizationScipy(LayoutOptimization):
         tmp1 = {
             "type": "ineq",
             "fun": lambda x, *args: self._space_constraint(x),
+            "jac": lambda x, *args: self._space_constraint_jac(x),
         }
         tmp2 = {
             "type": "ineq",
             "fun": lambda x: self._distance_from_boundaries(x),
+            "jac": lambda x: self._distance_from_boundaries_jac(x),
         }
 
         self.cons = [tmp1, tmp2]
@@ -146,54 +178,34 @@ class LayoutOptimizationScipy(LayoutOptimization):
     def _set_opt_bounds(self):
         self.bnds = [(0.0, 1.0) for _ in range(2 * self.nturbs)]
 
-    def _space_constraint(self, x_in, rho=500):
-        x = [
-            self._unnorm(valx, self.xmin, self.xmax)
-            for valx in x_in[0 : self.nturbs]
-        ]
-        y =  [
-            self._unnorm(valy, self.ymin, self.ymax)
-            for valy in x_in[self.nturbs : 2 * self.nturbs]
-        ]
-
-        # Calculate distances between turbines
-        locs = np.vstack((x, y)).T
-        distances = cdist(locs, locs)
-        arange = np.arange(distances.shape[0])
-        distances[arange, arange] = 1e10
-        dist = np.min(distances, axis=0)
+    def _unnorm_locs(self, x_in):
+        x = self._unnorm(x_in[0 : self.nturbs], self.xmin, self.xmax)
+        y = self._unnorm(x_in[self.nturbs : 2 * self.nturbs], self.ymin, self.ymax)
+        return x, y
 
-        g = 1 - np.array(dist) / self.min_dist
-
-        # Following code copied from OpenMDAO KSComp().
-        # Constraint is satisfied when KS_constraint <= 0
-        g_max = np.max(np.atleast_2d(g), axis=-1)[:, np.newaxis]
-        g_diff = g - g_max
-        exponents = np.exp(rho * g_diff)
-        summation = np.sum(exponents, axis=-1)[:, np.newaxis]
-        KS_constraint = g_max + 1.0 / rho * np.log(summation)
-
-        return -1*KS_constraint[0][0]
+    def _space_constraint(self, x_in, rho=500):
+        # Constraint is satisfied when the KS constraint is <= 0
+        x, y = self._unnorm_locs(x_in)
+        return -1 * space_constraint(x, y, self.min_dist, rho=rho)
+
+    def _space_constraint_jac(self, x_in, rho=500):
+        x, y = self._unnorm_locs(x_in)
+        _, grad_x, grad_y = space_constraint(x, y, self.min_dist, rho=rho, gradient=True)
+        return -1 * np.concatenate(
+            [grad_x * (self.xmax - self.xmin), grad_y * (self.ymax - self.ymin)]
+        )
 
     def _distance_from_boundaries(self, x_in):
-        x = [
-            self._unnorm(valx, self.xmin, self.xmax)
-            for valx in x_in[0 : self.nturbs]
-        ]
-        y =  [
-            self._unnorm(valy, self.ymin, self.ymax)
-            for valy in x_in[self.nturbs : 2 * self.nturbs]
-        ]
-        boundary_con = np.zeros(self.nturbs)
-        for i in range(self.nturbs):
-            loc = Point(x[i], y[i])
-            boundary_con[i] = loc.distance(self._boundary_line)
-            if self._boundary_polygon.contains(loc) is True:
-                boundary_con[i] *= 1.0
-            else:
-                boundary_con[i] *= -1.0
-
-        return boundary_con
+        x, y = self._unnorm_locs(x_in)
+        return distance_from_boundaries(x, y, self.boundaries)
+
+    def _distance_from_boundaries_jac(self, x_in):
+        # Each distance only depends on the coordinates of its own turbine
+        x, y = self._unnorm_locs(x_in)
+        _, grad_x, grad_y = distance_from_boundaries(x, y, self.boundaries, gradient=True)
+        return np.hstack(
+            [np.diag(grad_x * (self.xmax - self.xmin)), np.diag(grad_y * (self.ymax - self.ymin))]
+        )
 
     def _get_initial_and_final_locs(self):
         x_initial = [
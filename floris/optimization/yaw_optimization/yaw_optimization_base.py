@@ -7,7 +7,7 @@ import pandas as pd
 
 from floris.logging_manager import LoggingManager
 
-from .yaw_optimization_tools import derive_downstream_turbines
+from .yaw_optimization_tools import get_wake_adjacency
 
 
 class YawOptimization(LoggingManager):
@@ -236,12 +236,12 @@ class YawOptimization(LoggingManager):
 
         # Define which turbines to optimize for
         if self.exclude_downstream_turbines:
-            for iw, wd in enumerate(self.fmodel.core.flow_field.wind_directions):
-                # Remove turbines from turbs_to_opt that are downstream
-                downstream_turbines = derive_downstream_turbines(self.fmodel, wd)
-                downstream_turbines = np.array(downstream_turbines, dtype=int)
-                self.turbs_to_opt[iw, downstream_turbines] = False
-                turbs_to_opt_subset = copy.deepcopy(self.turbs_to_opt)  # Update
+            # Remove turbines from turbs_to_opt that are downstream
+            downstream_turbines = get_wake_adjacency(self.fmodel).get_downstream_turbines(
+                self.fmodel.core.flow_field.wind_directions
+            )
+            self.turbs_to_opt[downstream_turbines] = False
+            turbs_to_opt_subset = copy.deepcopy(self.turbs_to_opt)  # Update
 
         # Set up a template yaw angles array with default solutions. The default
         # solutions are either 0.0 or the allowable yaw angle closest to 0.0 deg.
@@ -273,6 +273,67 @@ class YawOptimization(LoggingManager):
         self._yaw_angles_template_subset = yaw_angles_template_subset
         self._yaw_angles_baseline_subset = yaw_angles_baseline_subset
 
+    def _get_warm_start_parents(self, stride=None):
+        """
+        Order the wind conditions for a warm-started optimization and find, for each
+        condition, the two neighboring conditions whose optimal yaw angles it can be seeded
+        from. Conditions with equal wind speed and turbulence intensity form a row sorted by
+        wind direction, and rows are sorted by wind speed and then turbulence intensity.
+
+        Args:
+            stride (int, optional): If None, each condition is seeded from its predecessor
+                in its row and from the condition with the same wind direction in the row of
+                the next lower wind speed, both of which are solved before it. If an integer,
+                every stride-th condition of a row is an anchor that is not seeded, and the
+                other conditions are seeded from the nearest anchors on either side of them in
+                their row, so that all seeded conditions can be optimized together. Defaults
+                to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The indices of the conditions to optimize in the
+                order in which they should be solved, and an array of shape (n_findex, 2) with
+                the indices of the conditions that each condition is seeded from, or -1 where
+                there is no such condition. Conditions without any seed need a full-range
+                search.
+        """
+        flow_field = self.fmodel_subset.core.flow_field
+        _, wd_rank = np.unique(np.round(flow_field.wind_directions, 6), return_inverse=True)
+        _, ws_rank = np.unique(np.round(flow_field.wind_speeds, 6), return_inverse=True)
+        _, ti_rank = np.unique(
+            np.round(flow_field.turbulence_intensities, 6), return_inverse=True
+        )
+
+        order = np.lexsort((wd_rank, ws_rank, ti_rank))
+        order = order[self._turbs_to_opt_subset[order].any(axis=1)]
+        parents = np.full((self._n_findex_subset, 2), -1)
+        if len(order) == 0:
+            return order, parents
+
+        # Split the ordered conditions into rows of equal wind speed and turbulence intensity
+        row_keys = np.column_stack((ti_rank[order], ws_rank[order]))
+        row_starts = np.flatnonzero(np.any(np.diff(row_keys, axis=0) != 0, axis=1)) + 1
+        rows = np.split(order, row_starts)
+
+        if stride is None:
+            first_in_row = {}
+            for row in rows:
+                for i in row:
+                    first_in_row.setdefault((ti_rank[i], ws_rank[i], wd_rank[i]), i)
+            for row in rows:
+                parents[row[1:], 0] = row[:-1]
+                for i in row:
+                    parents[i, 1] = first_in_row.get((ti_rank[i], ws_rank[i] - 1, wd_rank[i]), -1)
+            return order, parents
+
+        for row in rows:
+            position = np.arange(len(row))
+            is_anchor = position % stride == 0
+            left = position - position % stride
+            right = np.where(left + stride < len(row), left + stride, left)
+            parents[row[~is_anchor], 0] = row[left[~is_anchor]]
+            parents[row[~is_anchor], 1] = row[right[~is_anchor]]
+        return order, parents
+
     def _normalize_control_problem(self):
         """
         This private function normalizes variables for the optimization
@@ -325,7 +386,7 @@ class YawOptimization(LoggingManager):
             farm_power (float): Weighted wind farm power.
         """
         # Unpack all variables, whichever are defined.
-        fmodel_subset = copy.deepcopy(self.fmodel_subset)
+        fmodel_subset = self.fmodel_subset.copy()
         if wd_array is None:
             wd_array = fmodel_subset.core.flow_field.wind_directions
         if ws_array is None:
@@ -337,8 +398,9 @@ class YawOptimization(LoggingManager):
         if turbine_weights is None:
             turbine_weights = self._turbine_weights_subset
         if heterogeneous_speed_multipliers is not None:
-            fmodel_subset.core.flow_field.\
-                heterogeneous_inflow_config['speed_multipliers'] = heterogeneous_speed_multipliers
+            heterogeneous_inflow_config = fmodel_subset.core.flow_field.heterogeneous_inflow_config
+            heterogeneous_inflow_config['speed_multipliers'] = heterogeneous_speed_multipliers
+            heterogeneous_inflow_config.pop('speed_multiplier_indices', None)
 
         # Ensure format [incompatible with _subset notation]
         yaw_angles = self._unpack_variable(yaw_angles, subset=True)
@@ -1,5 +1,4 @@
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
@@ -37,86 +36,40 @@ def derive_downstream_turbines(fmodel, wind_direction, wake_slope=0.30, plot_lin
     """
 
     # Get farm layout
-    x = fmodel.layout_x
-    y = fmodel.layout_y
-    D = np.ones_like(x) * fmodel.core.farm.rotor_diameters_sorted[0][0]
-    n_turbs = len(x)
-
-    # Rotate farm and determine freestream/waked turbines
-    is_downstream = [False for _ in range(n_turbs)]
-    x_rot = (
-        np.cos((wind_direction - 270.0) * np.pi / 180.0) * x
-        - np.sin((wind_direction - 270.0) * np.pi / 180.0) * y
-    )
-    y_rot = (
-        np.sin((wind_direction - 270.0) * np.pi / 180.0) * x
-        + np.cos((wind_direction - 270.0) * np.pi / 180.0) * y
-    )
+    x = np.array(fmodel.layout_x, dtype=float)
+    y = np.array(fmodel.layout_y, dtype=float)
+    D = fmodel.core.farm.rotor_diameters_sorted[0][0]
+
+    # Rotate farm and determine the turbines whose wakes do not reach other turbines
+    x_rot, y_rot, adjacency = derive_wake_adjacency(x, y, [wind_direction], D, wake_slope)
+    x_rot, y_rot = x_rot[0], y_rot[0]
+    turbs_downstream = list(np.where(~adjacency[0].any(axis=1))[0])
 
     if plot_lines:
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots()
-        for ii in range(n_turbs):
-            ax.plot(
-                x_rot[ii] * np.ones(2),
-                [y_rot[ii] - D[ii] / 2, y_rot[ii] + D[ii] / 2],
-                "k",
-            )
-        for ii in range(n_turbs):
+        for ii in range(len(x)):
+            ax.plot(x_rot[ii] * np.ones(2), [y_rot[ii] - D / 2, y_rot[ii] + D / 2], "k")
             ax.text(x_rot[ii], y_rot[ii], "T%03d" % ii)
         ax.axis("equal")
 
-    srt = np.argsort(x_rot)
-    x_rot_srt = x_rot[srt]
-    y_rot_srt = y_rot[srt]
-    for ii in range(n_turbs):
-        x0 = x_rot_srt[ii]
-        y0 = y_rot_srt[ii]
-
-        def wake_profile_ub_turbii(x):
-            y = (y0 + D[ii]) + (x - x0) * wake_slope
-            if isinstance(y, (float, np.float64, np.float32)):
-                if x < (x0 + 0.01):
-                    y = -np.Inf
-            else:
-                y[x < x0 + 0.01] = -np.Inf
-            return y
-
-        def wake_profile_lb_turbii(x):
-            y = (y0 - D[ii]) - (x - x0) * wake_slope
-            if isinstance(y, (float, np.float64, np.float32)):
-                if x < (x0 + 0.01):
-                    y = -np.Inf
-            else:
-                y[x < x0 + 0.01] = -np.Inf
-            return y
-
-        def determine_if_in_wake(xt, yt):
-            return (yt < wake_profile_ub_turbii(xt)) & (yt > wake_profile_lb_turbii(xt))
-
-        is_downstream[ii] = not any(
-            determine_if_in_wake(x_rot_srt[iii], y_rot_srt[iii]) for iii in range(n_turbs)
-        )
-
-        if plot_lines:
-            x1 = np.max(x_rot_srt) + 500.0
+        x1 = np.max(x_rot) + 500.0
+        for ii in range(len(x)):
+            x0 = x_rot[ii] + 0.02
             ax.fill_between(
                 [x0, x1, x1, x0],
                 [
-                    wake_profile_ub_turbii(x0 + 0.02),
-                    wake_profile_ub_turbii(x1),
-                    wake_profile_lb_turbii(x1),
-                    wake_profile_lb_turbii(x0 + 0.02),
+                    y_rot[ii] + D + 0.02 * wake_slope,
+                    y_rot[ii] + D + (x1 - x_rot[ii]) * wake_slope,
+                    y_rot[ii] - D - (x1 - x_rot[ii]) * wake_slope,
+                    y_rot[ii] - D - 0.02 * wake_slope,
                 ],
                 alpha=0.1,
                 color="k",
                 edgecolor=None,
             )
 
-    usrt = np.argsort(srt)
-    is_downstream = [is_downstream[i] for i in usrt]
-    turbs_downstream = list(np.where(is_downstream)[0])
-
-    if plot_lines:
         ax.set_title("wind_direction = %03d" % wind_direction)
         ax.set_xlim([np.min(x_rot) - 500.0, x1])
         ax.set_ylim([np.min(y_rot) - 500.0, np.max(y_rot) + 500.0])
@@ -128,3 +81,161 @@ def derive_downstream_turbines(fmodel, wind_direction, wake_slope=0.30, plot_lin
         )
 
     return turbs_downstream
+
+
+def derive_wake_adjacency(
+    layout_x,
+    layout_y,
+    wind_directions,
+    rotor_diameter,
+    wake_slope=0.30,
+    max_array_size=10_000_000,
+):
+    """Determine which turbines are in the wake of which other turbines for
+    several wind directions at once, using the linearly diverging wake profile
+    of :py:meth:`derive_downstream_turbines`. Turbine j is in the wake of
+    turbine i if it is at least 0.01 m downstream of turbine i and its lateral
+    offset is smaller than rotor_diameter + wake_slope * (downstream distance).
+
+    Args:
+        layout_x (NDArrayFloat): x-coordinates of the turbines (m).
+        layout_y (NDArrayFloat): y-coordinates of the turbines (m).
+        wind_directions (NDArrayFloat): The wind directions in the FLORIS frame
+            of reference (deg).
+        rotor_diameter (float): Rotor diameter of the turbines (m).
+        wake_slope (float, optional): linear slope of the wake (dy/dx).
+            Defaults to 0.30.
+        max_array_size (int, optional): Maximum number of turbine pairs that
+            are compared at once, which limits the memory use for large farms
+            and many wind directions. Defaults to 10,000,000.
+
+    Returns:
+        tuple[NDArrayFloat, NDArrayFloat, NDArrayBool]: The rotated x- and
+            y-coordinates of the turbines with shape (n_wind_directions,
+            n_turbines) and the adjacency with shape (n_wind_directions,
+            n_turbines, n_turbines), where adjacency[k, i, j] is True if turbine
+            i wakes turbine j at wind direction k.
+    """
+    layout_x = np.asarray(layout_x, dtype=float)
+    layout_y = np.asarray(layout_y, dtype=float)
+    angle = (np.asarray(wind_directions, dtype=float)[:, None] - 270.0) * np.pi / 180.0
+    x_rot = np.cos(angle) * layout_x - np.sin(angle) * layout_y
+    y_rot = np.sin(angle) * layout_x + np.cos(angle) * layout_y
+
+    n_turbines = len(layout_x)
+    adjacency = np.zeros((len(angle), n_turbines, n_turbines), dtype=bool)
+    chunk_size = max(1, max_array_size // max(1, n_turbines ** 2))
+    for k in range(0, len(angle), chunk_size):
+        x0 = x_rot[k:k + chunk_size, :, None]
+        y0 = y_rot[k:k + chunk_size, :, None]
+        xt = x_rot[k:k + chunk_size, None, :]
+        yt = y_rot[k:k + chunk_size, None, :]
+        adjacency[k:k + chunk_size] = (
+            (xt >= x0 + 0.01)
+            & (yt < (y0 + rotor_diameter) + (xt - x0) * wake_slope)
+            & (yt > (y0 - rotor_diameter) - (xt - x0) * wake_slope)
+        )
+
+    return x_rot, y_rot, adjacency
+
+
+class WakeAdjacency:
+    """Cache of the wake adjacency of a single layout. The adjacency is
+    computed once for each unique wind direction, rounded to the given number
+    of decimals, and reused by all conditions and later calls that share the
+    wind direction.
+
+    Args:
+        layout_x (NDArrayFloat): x-coordinates of the turbines (m).
+        layout_y (NDArrayFloat): y-coordinates of the turbines (m).
+        rotor_diameter (float): Rotor diameter of the turbines (m).
+        wake_slope (float, optional): linear slope of the wake (dy/dx).
+            Defaults to 0.30.
+        decimals (int, optional): Number of decimals to which the wind
+            directions are rounded. Defaults to 6.
+    """
+
+    def __init__(self, layout_x, layout_y, rotor_diameter, wake_slope=0.30, decimals=6):
+        self.layout_x = np.array(layout_x, dtype=float)
+        self.layout_y = np.array(layout_y, dtype=float)
+        self.rotor_diameter = rotor_diameter
+        self.wake_slope = wake_slope
+        self.decimals = decimals
+        self._x_rot = {}
+        self._adjacency = {}
+
+    def _get_unique(self, wind_directions):
+        wind_directions = np.round(np.asarray(wind_directions, dtype=float), self.decimals)
+        unique_wd, inverse = np.unique(wind_directions, return_inverse=True)
+
+        missing = [wd for wd in unique_wd if wd not in self._adjacency]
+        if len(missing) > 0:
+            x_rot, _, adjacency = derive_wake_adjacency(
+                self.layout_x,
+                self.layout_y,
+                missing,
+                self.rotor_diameter,
+                self.wake_slope,
+            )
+            self._x_rot.update(zip(missing, x_rot))
+            self._adjacency.update(zip(missing, adjacency))
+
+        return unique_wd, inverse.flatten()
+
+    def get_adjacency(self, wind_directions):
+        """Get the adjacency of each wind direction, where adjacency[k, i, j] is
+        True if turbine i wakes turbine j at wind direction k.
+        """
+        unique_wd, inverse = self._get_unique(wind_directions)
+        return np.stack([self._adjacency[wd] for wd in unique_wd])[inverse]
+
+    def get_downstream_turbines(self, wind_directions):
+        """Get a boolean array with shape (n_wind_directions, n_turbines) that
+        is True for the turbines whose wakes do not affect any other turbine.
+        """
+        unique_wd, inverse = self._get_unique(wind_directions)
+        downstream = np.array([~self._adjacency[wd].any(axis=1) for wd in unique_wd])
+        return downstream[inverse]
+
+    def get_turbine_orders(self, wind_directions):
+        """Get the turbine indices of each wind direction ordered from upstream
+        to downstream.
+        """
+        unique_wd, inverse = self._get_unique(wind_directions)
+        orders = np.array([np.argsort(self._x_rot[wd]) for wd in unique_wd])
+        return orders[inverse]
+
+
+# Wake adjacencies of the most recently used layouts
+_wake_adjacency_cache = {}
+WAKE_ADJACENCY_CACHE_SIZE = 8
+
+
+def get_wake_adjacency(fmodel, wake_slope=0.30):
+    """Get the cached :py:class:`WakeAdjacency` of the layout of a FlorisModel,
+    creating it if the layout has not been seen before.
+
+    Args:
+        fmodel (FlorisModel): A FlorisModel object.
+        wake_slope (float, optional): linear slope of the wake (dy/dx).
+            Defaults to 0.30.
+
+    Returns:
+        WakeAdjacency: The wake adjacency of the layout.
+    """
+    layout_x = np.array(fmodel.layout_x, dtype=float)
+    layout_y = np.array(fmodel.layout_y, dtype=float)
+    rotor_diameter = float(fmodel.core.farm.rotor_diameters_sorted[0][0])
+    key = (layout_x.tobytes(), layout_y.tobytes(), rotor_diameter, wake_slope)
+
+    if key in _wake_adjacency_cache:
+        # Move the layout to the end of the cache as the most recently used one
+        _wake_adjacency_cache[key] = _wake_adjacency_cache.pop(key)
+    else:
+        if len(_wake_adjacency_cache) >= WAKE_ADJACENCY_CACHE_SIZE:
+            _wake_adjacency_cache.pop(next(iter(_wake_adjacency_cache)))
+        _wake_adjacency_cache[key] = WakeAdjacency(
+            layout_x, layout_y, rotor_diameter, wake_slope
+        )
+
+    return _wake_adjacency_cache[key]
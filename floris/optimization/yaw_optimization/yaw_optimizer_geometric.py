@@ -32,6 +32,30 @@ class YawOptimizationGeometric(YawOptimization):
             calc_baseline_power=False
         )
 
+    def _get_geometric_yaw_angles(self, layout_x, layout_y):
+        """
+        Compute the geometric yaw angles of a layout for every wind direction at once.
+        Assumes all wind turbines have the same rotor diameter.
+
+        Args:
+            layout_x (NDArrayFloat): x-coordinates of the turbines (m).
+            layout_y (NDArrayFloat): y-coordinates of the turbines (m).
+
+        Returns:
+            NDArrayFloat: Yaw angles in degrees with shape (n_findex, n_turbines).
+        """
+        # WS ignored!
+        return geometric_yaw(
+            layout_x,
+            layout_y,
+            self.fmodel_subset.core.flow_field.wind_directions,
+            self.fmodel.core.farm.turbine_definitions[0]["rotor_diameter"],
+            top_left_yaw_upper=self.maximum_yaw_angle[0, 0],
+            bottom_left_yaw_upper=self.maximum_yaw_angle[0, 0],
+            top_left_yaw_lower=self.minimum_yaw_angle[0, 0],
+            bottom_left_yaw_lower=self.minimum_yaw_angle[0, 0],
+        )
+
     def optimize(self):
         """
         Find rough yaw angles based on wind farm geometry.
@@ -41,20 +65,10 @@ class YawOptimizationGeometric(YawOptimization):
             opt_yaw_angles (np.array): Optimal yaw angles in degrees. This
             array is equal in length to the number of turbines in the farm.
         """
-        # Loop through every WD individually. WS ignored!
-        wd_array = self.fmodel_subset.core.flow_field.wind_directions
-
-        for nwdi, wd in enumerate(wd_array):
-            self._yaw_angles_opt_subset[nwdi, :] = geometric_yaw(
-                self.fmodel_subset.layout_x,
-                self.fmodel_subset.layout_y,
-                wd,
-                self.fmodel.core.farm.turbine_definitions[0]["rotor_diameter"],
-                top_left_yaw_upper=self.maximum_yaw_angle[0, 0],
-                bottom_left_yaw_upper=self.maximum_yaw_angle[0, 0],
-                top_left_yaw_lower=self.minimum_yaw_angle[0, 0],
-                bottom_left_yaw_lower=self.minimum_yaw_angle[0, 0],
-            )
+        self._yaw_angles_opt_subset[:, :] = self._get_geometric_yaw_angles(
+            self.fmodel_subset.layout_x,
+            self.fmodel_subset.layout_y,
+        )
 
         # Finalize optimization, i.e., retrieve full solutions
         df_opt = self._finalize()
@@ -81,9 +95,10 @@ def geometric_yaw(
     bottom_right_yaw_lower=0.0,
 ):
     """
-    turbine_x: unrotated x turbine coords
-    turbine_y: unrotated y turbine coords
-    wind_direction: float, degrees
+    turbine_x: unrotated x turbine coords, with shape (n_turbines) or, for a layout per
+        wind direction, (n_wind_directions, n_turbines)
+    turbine_y: unrotated y turbine coords, with the same shape as turbine_x
+    wind_direction: float or array of wind directions, degrees
     rotor_diameter: float
     left_x: where we start the trapezoid. Should be left as 0.
     top_left_y: trapezoid top left coord
@@ -98,38 +113,42 @@ def geometric_yaw(
     top_right_yaw_lower: yaw angle associated with top right point
     bottom_left_yaw_lower: yaw angle associated with bottom left point
     bottom_right_yaw_lower: yaw angle associated with bottom right point
+
+    Returns the yaw angles with shape (n_turbines) for a single wind direction and
+    (n_wind_directions, n_turbines) for an array of wind directions.
     """
 
-    nturbs = len(turbine_x)
-    turbine_coordinates_array = np.zeros((nturbs,3))
-    turbine_coordinates_array[:,0] = turbine_x[:]
-    turbine_coordinates_array[:,1] = turbine_y[:]
+    turbine_x = np.asarray(turbine_x, dtype=float)
+    turbine_y = np.asarray(turbine_y, dtype=float)
+    turbine_coordinates_array = np.stack(
+        [turbine_x, turbine_y, np.zeros_like(turbine_x)],
+        axis=-1,
+    )
 
     rotated_x, rotated_y, _, _, _ = rotate_coordinates_rel_west(
-        np.array([wind_direction]),
+        np.atleast_1d(np.asarray(wind_direction, dtype=float)),
         turbine_coordinates_array
     )
-    processed_x, processed_y = _process_layout(rotated_x[0], rotated_y[0], rotor_diameter)
-    yaw_array = np.zeros(nturbs)
-    for i in range(nturbs):
-        # TODO: fix shape of top left yaw etc?
-        yaw_array[i] = _get_yaw_angles(
-            processed_x[i],
-            processed_y[i],
-            left_x,
-            top_left_y,
-            right_x,
-            top_right_y,
-            top_left_yaw_upper,
-            top_right_yaw_upper,
-            bottom_left_yaw_upper,
-            bottom_right_yaw_upper,
-            top_left_yaw_lower,
-            top_right_yaw_lower,
-            bottom_left_yaw_lower,
-            bottom_right_yaw_lower,
-        )
+    processed_x, processed_y = _process_layout(rotated_x, rotated_y, rotor_diameter)
+    yaw_array = _get_yaw_angles(
+        processed_x,
+        processed_y,
+        left_x,
+        top_left_y,
+        right_x,
+        top_right_y,
+        top_left_yaw_upper,
+        top_right_yaw_upper,
+        bottom_left_yaw_upper,
+        bottom_right_yaw_upper,
+        top_left_yaw_lower,
+        top_right_yaw_lower,
+        bottom_left_yaw_lower,
+        bottom_right_yaw_lower,
+    )
 
+    if np.ndim(wind_direction) == 0 and turbine_x.ndim == 1:
+        return yaw_array[0]
     return yaw_array
 
 def _process_layout(
@@ -144,13 +163,11 @@ def _process_layout(
     wake spread, but this could/should be modified to be the same as the trapezoid rule
     used to determine the yaw angles.
 
-    turbine_x: turbine x coords (rotated)
-    turbine_y: turbine y coords (rotated)
+    turbine_x: turbine x coords (rotated), with shape (..., n_turbines)
+    turbine_y: turbine y coords (rotated), with shape (..., n_turbines)
     rotor_diameter: turbine rotor diameter (float)
     spread=0.1: Jensen alpha wake spread value
     """
-    len(turbine_x)
-
     # # Intialize storage
     # dx = np.zeros(nturbs) + 1E10
     # dy = np.zeros(nturbs)
@@ -169,9 +186,10 @@ def _process_layout(
     # dx_ = dx
     # dy_ = dy
 
-    # Compute distances
-    x_dists = turbine_x.reshape(-1,1).T - turbine_x.reshape(-1,1)
-    y_dists = turbine_y.reshape(-1,1).T - turbine_y.reshape(-1,1)
+    # Compute distances from each turbine (second to last axis) to every other turbine
+    # (last axis)
+    x_dists = turbine_x[..., None, :] - turbine_x[..., :, None]
+    y_dists = turbine_y[..., None, :] - turbine_y[..., :, None]
 
     # Any turbines upstream or at the turbine location are ineligble
     x_dists[x_dists <= 0.] = np.inf
@@ -181,13 +199,13 @@ def _process_layout(
     x_dists[~in_Jensen_wake] = np.inf
 
     # Get minimums (and arguments to select the correct y values also)
-    dx = x_dists.min(axis=1)
-    dy = y_dists[range(len(turbine_x)), x_dists.argmin(axis=1)]
+    dx = x_dists.min(axis=-1)
+    dy = np.take_along_axis(y_dists, x_dists.argmin(axis=-1)[..., None], axis=-1)[..., 0]
 
     # Handle last turbine downstream
-    furthest_ds_turb_idx = np.where(dx == np.inf)[0]
-    dx[furthest_ds_turb_idx] = 0.
-    dy[furthest_ds_turb_idx] = 0.
+    furthest_ds_turb = (dx == np.inf)
+    dx[furthest_ds_turb] = 0.
+    dy[furthest_ds_turb] = 0.
 
     return dx/rotor_diameter, dy/rotor_diameter
 
@@ -216,7 +234,7 @@ def _get_yaw_angles(
     ________________________________________
 
     x and y: dx and dy to the nearest downstream turbine in rotor diameteters with
-        turbines rotated so wind is coming left to right
+        turbines rotated so wind is coming left to right, as floats or arrays of equal shape
     left_x: where we start the trapezoid. Should be left as 0.
     top_left_y: trapezoid top left coord
     right_x: where to stop the trapezoid downstream.
@@ -232,20 +250,27 @@ def _get_yaw_angles(
     bottom_right_yaw_lower: yaw angle associated with bottom right point
     """
 
-    if x <= 0:
-        return 0.0
-    else:
-        dx = (x-left_x)/(right_x-left_x)
-        if dx >= 1.0:
-            return 0.0
-        edge_y = top_left_y + (top_right_y-top_left_y)*dx
-        if abs(y) > edge_y:
-            return 0.0
-        elif y >= -0.01: # Tolerance to handle numerical issues
-            top_yaw = top_left_yaw_upper + (top_right_yaw_upper-top_left_yaw_upper)*dx
-            bottom_yaw = bottom_left_yaw_upper + (bottom_right_yaw_upper-bottom_left_yaw_upper)*dx
-            return bottom_yaw + (top_yaw-bottom_yaw)*abs(y)/edge_y
-        elif y < -0.01:
-            top_yaw = top_left_yaw_lower + (top_right_yaw_lower-top_left_yaw_lower)*dx
-            bottom_yaw = bottom_left_yaw_lower + (bottom_right_yaw_lower-bottom_left_yaw_lower)*dx
-            return bottom_yaw + (top_yaw-bottom_yaw)*abs(y)/edge_y
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    dx = (x-left_x)/(right_x-left_x)
+    edge_y = top_left_y + (top_right_y-top_left_y)*dx
+
+    # Interpolate within the upper trapezoid, or the lower one for negative y
+    upper = y >= -0.01 # Tolerance to handle numerical issues
+    top_yaw = np.where(
+        upper,
+        top_left_yaw_upper + (top_right_yaw_upper-top_left_yaw_upper)*dx,
+        top_left_yaw_lower + (top_right_yaw_lower-top_left_yaw_lower)*dx,
+    )
+    bottom_yaw = np.where(
+        upper,
+        bottom_left_yaw_upper + (bottom_right_yaw_upper-bottom_left_yaw_upper)*dx,
+        bottom_left_yaw_lower + (bottom_right_yaw_lower-bottom_left_yaw_lower)*dx,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yaw = bottom_yaw + (top_yaw-bottom_yaw)*abs(y)/edge_y
+
+    # Only turbines whose nearest downstream turbine lies within the trapezoid are yawed
+    in_trapezoid = (x > 0) & (dx < 1.0) & ~(abs(y) > edge_y)
+    return np.where(in_trapezoid, yaw, 0.0)[()]
@@ -5,12 +5,36 @@ from scipy.optimize import minimize
 from .yaw_optimization_base import YawOptimization
 
 
+# SciPy minimize methods that are supplied with the gradient of the cost function
+GRADIENT_METHODS = ("SLSQP", "L-BFGS-B", "TNC", "trust-constr", "BFGS", "CG")
+
+# Finite-difference steps that SciPy uses by default when no "eps" option is given
+SCIPY_DEFAULT_EPS = {"L-BFGS-B": 1e-8, "TNC": 1e-8}
+SCIPY_DEFAULT_EPS_OTHER = np.sqrt(np.finfo(float).eps)
+
+
 class YawOptimizationScipy(YawOptimization):
     """
     YawOptimizationScipy is a subclass of
     :py:class:`floris.optimization.general_library.YawOptimization` that is
     used to optimize the yaw angles of all turbines in a Floris Farm for a single
     set of inflow conditions using the SciPy optimize package.
+
+    With batched=True, all wind conditions are instead optimized together with a
+    projected gradient ascent. The trial yaw angles of every condition and all of their
+    finite-difference perturbations are stacked along the findex axis and evaluated in a
+    single FLORIS solve per iteration, rather than one scipy.optimize.minimize call and
+    many single-condition solves per condition. The "maxiter", "eps" and "ftol" entries
+    of opt_options are used, together with an optional "xtol", the step size in
+    normalized yaw angles at which a condition is considered converged (1e-3 by
+    default).
+
+    With warm_start=True, the wind conditions are instead optimized in order of wind speed
+    and wind direction. Each condition starts from the best of x0 and the optimal yaw angles
+    of its predecessors in wind direction and in wind speed, and is searched within
+    warm_start_window degrees of that starting point. Conditions whose solution ends on the
+    edge of this narrowed range are optimized further over the full range, and conditions
+    whose solution is below the baseline farm power are optimized again from x0.
     """
 
     def __init__(
@@ -25,6 +49,9 @@ class YawOptimizationScipy(YawOptimization):
         turbine_weights=None,
         exclude_downstream_turbines=True,
         verify_convergence=False,
+        batched=False,
+        warm_start=False,
+        warm_start_window=5.0,
     ):
         """
         Instantiate YawOptimizationScipy object with a FlorisModel object
@@ -55,6 +82,12 @@ class YawOptimizationScipy(YawOptimization):
 
         self.opt_method = opt_method
         self.opt_options = opt_options
+        self.batched = batched
+        self.warm_start = warm_start
+        self.warm_start_window = warm_start_window
+
+        if batched and warm_start:
+            raise ValueError("warm_start is not supported with batched=True.")
 
     def optimize(self):
         """
@@ -67,11 +100,22 @@ class YawOptimizationScipy(YawOptimization):
             opt_yaw_angles (np.array): Optimal yaw angles in degrees. This
             array is equal in length to the number of turbines in the farm.
         """
+        if self.batched:
+            self._optimize_batched()
+            return self._finalize()
+
         # Loop through every wind condition individually
         wd_array = self.fmodel_subset.core.flow_field.wind_directions
         ws_array = self.fmodel_subset.core.flow_field.wind_speeds
         ti_array = self.fmodel_subset.core.flow_field.turbulence_intensities
-        for i, (wd, ws, ti) in enumerate(zip(wd_array, ws_array, ti_array)):
+        if self.warm_start:
+            order, parents = self._get_warm_start_parents()
+        else:
+            order = np.arange(self._n_findex_subset)
+            parents = np.full((self._n_findex_subset, 2), -1)
+
+        for i in order:
+            wd, ws, ti = wd_array[i], ws_array[i], ti_array[i]
 
             self.fmodel_subset.set(
                 wind_directions=[wd],
@@ -100,9 +144,7 @@ class YawOptimizationScipy(YawOptimization):
             # Handle heterogeneous inflow, if there is one
             if (hasattr(self.fmodel.core.flow_field, 'heterogeneous_inflow_config') and
                 self.fmodel.core.flow_field.heterogeneous_inflow_config is not None):
-                het_sm_orig = np.array(
-                    self.fmodel.core.flow_field.heterogeneous_inflow_config['speed_multipliers']
-                )
+                het_sm_orig = self.fmodel.core.flow_field.get_speed_multipliers()
                 het_sm = het_sm_orig[i, :].reshape(1, -1)
             else:
                 het_sm = None
@@ -122,15 +164,85 @@ class YawOptimizationScipy(YawOptimization):
                     )[0] / J0
                 )
 
-            # Perform optimization
-            residual_plant = minimize(
-                fun=cost,
-                x0=x0,
-                bounds=bnds,
-                method=self.opt_method,
-                options=self.opt_options,
+            # Define gradient of the cost function, evaluated in a single stacked solve with the
+            # same step as SciPy's own finite differences, kept within the yaw bounds
+            eps = self.opt_options.get(
+                "eps", SCIPY_DEFAULT_EPS.get(self.opt_method, SCIPY_DEFAULT_EPS_OTHER)
+            )
+            yaw_bounds = (
+                self._minimum_yaw_angle_subset[i:i + 1, :],
+                self._maximum_yaw_angle_subset[i:i + 1, :],
             )
 
+            def cost_jacobian(x):
+                x_full = np.array(yaw_template, copy=True)
+                x_full[0, turbs_to_opt] = x * self._normalization_length
+                fmodel = self.fmodel_subset.copy()
+                if het_sm is not None:
+                    heterogeneous_inflow_config = fmodel.core.flow_field.heterogeneous_inflow_config
+                    heterogeneous_inflow_config['speed_multipliers'] = het_sm
+                    heterogeneous_inflow_config.pop('speed_multiplier_indices', None)
+                fmodel.set(
+                    wind_directions=[wd],
+                    wind_speeds=[ws],
+                    turbulence_intensities=[ti],
+                    yaw_angles=x_full,
+                )
+                _, jacobian = fmodel.get_farm_power_jacobian(
+                    "yaw_angles",
+                    steps=eps * self._normalization_length,
+                    turbine_weights=turbine_weights,
+                    bounds={"yaw_angles": yaw_bounds},
+                )
+                return -1.0 * jacobian[0, turbs_to_opt] * self._normalization_length / J0
+
+            # Perform optimization
+            def solve(x0, bnds):
+                return minimize(
+                    fun=cost,
+                    x0=x0,
+                    jac=cost_jacobian if self.opt_method in GRADIENT_METHODS else None,
+                    bounds=bnds,
+                    method=self.opt_method,
+                    options=self.opt_options,
+                )
+
+            candidates = parents[i][parents[i] >= 0]
+            if len(candidates) == 0:
+                residual_plant = solve(x0, bnds)
+            else:
+                # Start from the best of the neighboring solutions and x0, and search close
+                # to it
+                window = self.warm_start_window / self._normalization_length
+                seeds = np.clip(
+                    self._yaw_angles_opt_subset[candidates][:, turbs_to_opt]
+                    / self._normalization_length,
+                    yaw_lb,
+                    yaw_ub,
+                )
+                seeds = np.vstack([seeds, x0])
+                x0_warm = seeds[np.argmin([cost(seed) for seed in seeds])]
+                warm_lb = np.maximum(x0_warm - window, yaw_lb)
+                warm_ub = np.minimum(x0_warm + window, yaw_ub)
+                residual_plant = solve(x0_warm, list(zip(warm_lb, warm_ub)))
+
+                # Improvement check: continue over the full range if the solution is on the
+                # edge of the narrowed range, or restart from x0 if it does not improve on
+                # the baseline
+                tol = 1e-6
+                on_edge = (
+                    ((residual_plant.x <= warm_lb + tol) & (warm_lb > yaw_lb + tol))
+                    | ((residual_plant.x >= warm_ub - tol) & (warm_ub < yaw_ub - tol))
+                )
+                if -residual_plant.fun < 1.0:
+                    residual_plant_full = solve(x0, bnds)
+                elif np.any(on_edge):
+                    residual_plant_full = solve(residual_plant.x, bnds)
+                else:
+                    residual_plant_full = residual_plant
+                if residual_plant_full.fun < residual_plant.fun:
+                    residual_plant = residual_plant_full
+
             # Undo normalization/masks and save results to self
             self._farm_power_opt_subset[i] = -residual_plant.fun * J0
             self._yaw_angles_opt_subset[i, turbs_to_opt] = (
@@ -140,3 +252,106 @@ class YawOptimizationScipy(YawOptimization):
         # Finalize optimization, i.e., retrieve full solutions
         df_opt = self._finalize()
         return df_opt
+
+    def _optimize_batched(self):
+        """
+        Optimize the yaw angles of all wind conditions together using a projected gradient
+        ascent on the normalized farm power. Each iteration evaluates a trial step for every
+        unconverged condition together with the finite-difference gradient at that trial
+        point in one stacked FLORIS solve. Accepted steps grow the step size of their
+        condition, rejected steps halve it and reuse the gradient at the current point.
+        """
+        maxiter = self.opt_options.get("maxiter", 100)
+        eps = self.opt_options.get("eps", 0.1)
+        ftol = self.opt_options.get("ftol", 1e-12)
+        xtol = self.opt_options.get("xtol", 1e-3)
+
+        turbs_to_opt = self._turbs_to_opt_subset
+        yaw_lb = self._minimum_yaw_angle_subset_norm
+        yaw_ub = self._maximum_yaw_angle_subset_norm
+        x = np.where(
+            turbs_to_opt,
+            self._x0_subset_norm,
+            self._yaw_angles_template_subset / self._normalization_length,
+        )
+
+        flow_field = self.fmodel_subset.core.flow_field
+        wd_array = flow_field.wind_directions
+        ws_array = flow_field.wind_speeds
+        ti_array = flow_field.turbulence_intensities
+        if flow_field.heterogeneous_inflow_config is not None:
+            het_sm = flow_field.get_speed_multipliers()
+        else:
+            het_sm = None
+        J0 = self._farm_power_baseline_subset
+        J0 = np.where(J0 > 0.0, J0, 1.0)
+
+        def evaluate(x_trial, conds):
+            # Stack the trial points and one perturbation per optimized turbine
+            cond_ids, turb_ids = np.nonzero(turbs_to_opt[conds])
+            step = np.where(
+                x_trial[cond_ids, turb_ids] + eps <= yaw_ub[conds[cond_ids], turb_ids],
+                eps,
+                -eps,
+            )
+            x_perturbed = x_trial[cond_ids]
+            x_perturbed[np.arange(len(cond_ids)), turb_ids] += step
+            rows = np.concatenate([conds, conds[cond_ids]])
+
+            farm_power = self._calculate_farm_power(
+                yaw_angles=np.vstack([x_trial, x_perturbed]) * self._normalization_length,
+                wd_array=wd_array[rows],
+                ws_array=ws_array[rows],
+                ti_array=ti_array[rows],
+                turbine_weights=self._turbine_weights_subset[rows],
+                heterogeneous_speed_multipliers=None if het_sm is None else het_sm[rows],
+            ) / J0[rows]
+
+            f = farm_power[:len(conds)]
+            gradient = np.zeros_like(x_trial)
+            gradient[cond_ids, turb_ids] = (farm_power[len(conds):] - f[cond_ids]) / step
+            return f, gradient
+
+        active = np.flatnonzero(turbs_to_opt.any(axis=1))
+        if len(active) == 0:
+            return
+
+        f = np.zeros(len(x))
+        gradient = np.zeros_like(x)
+        f[active], gradient[active] = evaluate(x[active], active)
+        step_size = np.full(len(x), 0.2)
+
+        for _ in range(maxiter):
+            # Step along the gradient scaled to a unit maximum, projected onto the bounds
+            g_max = np.max(np.abs(gradient[active]), axis=1)
+            direction = gradient[active] / np.where(g_max > 0.0, g_max, 1.0)[:, None]
+            x_trial = np.clip(
+                x[active] + step_size[active, None] * direction,
+                yaw_lb[active],
+                yaw_ub[active],
+            )
+            x_trial = np.where(turbs_to_opt[active], x_trial, x[active])
+            moving = np.max(np.abs(x_trial - x[active]), axis=1) >= xtol
+            active, x_trial = active[moving], x_trial[moving]
+            if len(active) == 0:
+                break
+
+            f_trial, gradient_trial = evaluate(x_trial, active)
+            accept = f_trial > f[active] + ftol
+            accepted = active[accept]
+            x[accepted] = x_trial[accept]
+            f[accepted] = f_trial[accept]
+            gradient[accepted] = gradient_trial[accept]
+            step_size[accepted] = np.minimum(1.5 * step_size[accepted], 1.0)
+            step_size[active[~accept]] *= 0.5
+
+            active = active[step_size[active] >= xtol]
+            if len(active) == 0:
+                break
+
+        # Undo normalization/masks and save results to self
+        conds = np.flatnonzero(turbs_to_opt.any(axis=1))
+        self._farm_power_opt_subset[conds] = f[conds] * J0[conds]
+        self._yaw_angles_opt_subset[turbs_to_opt] = (
+            x[turbs_to_opt] * self._normalization_length
+        )
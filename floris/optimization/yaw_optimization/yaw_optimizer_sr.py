@@ -6,10 +6,12 @@ from time import perf_counter as timerpc
 import numpy as np
 import pandas as pd
 
+from floris.core import sequential_solver
 from floris.logging_manager import LoggingManager
 
 # from .yaw_optimizer_scipy import YawOptimizationScipy
 from .yaw_optimization_base import YawOptimization
+from .yaw_optimization_tools import get_wake_adjacency
 
 
 class YawOptimizationSR(YawOptimization, LoggingManager):
@@ -24,10 +26,43 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
         turbine_weights=None,
         exclude_downstream_turbines=True,
         verify_convergence=False,
+        warm_start=False,
+        warm_start_stride=3,
+        warm_start_window=None,
     ):
         """
         Instantiate YawOptimizationSR object with a FlorisModel object
         and assign parameter values.
+
+        With warm_start=True, the wind conditions are sorted by wind speed and wind
+        direction, and only every warm_start_stride-th condition of each wind speed gets
+        the full Serial Refine search. The other conditions start from the best of the
+        baseline, the optimal yaw angles of the nearest of those conditions on either side
+        and the mirror images of those yaw angles, and skip the first pass, searching within
+        warm_start_window degrees of that start for the turbines that are part of the
+        optimization problem. While the solution ends on the edge of this narrowed range,
+        the range is moved to the solution and searched again. A seeded condition is
+        optimized again over the full range if its solution is still on the edge of the
+        range after as many moves as the first pass has points, does not improve on the
+        baseline farm power, or gains less than half as much as either of its anchors.
+        Conditions whose anchors gain nothing over the baseline farm power get the full
+        search directly, which stops after the first pass if that pass finds no gain and
+        the later passes would evaluate the same yaw angles. warm_start_window defaults to
+        half the step size of the first pass, which gives the same final resolution as the
+        full search.
+
+        Warm starting is a heuristic. It assumes that the optimal yaw angles change
+        smoothly between neighboring wind directions. For wake models whose farm power is
+        not smooth in the yaw angles, such as the jensen model, the optimum can jump
+        between neighboring conditions, so that warm starting can find less power than
+        the full search.
+
+        The candidate yaw angles of each turbine depth are evaluated in a single solve of
+        a persistent model that holds a copy of the wind conditions for every candidate.
+        This model is built once and only its yaw angles are updated between solves. For
+        wake models that are solved turbine by turbine, the wakes of the turbines upstream
+        of the turbine depth are solved once at the current optimal yaw angles and shared
+        by all candidates.
         """
 
         # Initialize base class
@@ -43,8 +78,13 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
             verify_convergence=verify_convergence,
         )
 
-        # Start a timer for FLORIS computations
+        # Start a timer and a counter for FLORIS computations
         self.time_spent_in_floris = 0
+        self.n_floris_evaluations = 0
+
+        # Persistent models for the evaluation grids, built on first use
+        self._stacked_models = {}
+        self._upstream_model = None
 
         # Confirm that Ny_passes are integers and odd/even
         for Nii, Ny in enumerate(Ny_passes):
@@ -66,25 +106,23 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
         #         self.fmodel.core.farm.turbines[ti].initialize_turbine()
         #         print("Reducing ngrid. Unsure if this functionality works!")
 
+        if warm_start and len(Ny_passes) < 2:
+            raise ValueError("warm_start requires at least two entries in Ny_passes.")
+
         # Save optimization choices to self
         self.Ny_passes = Ny_passes
+        self.warm_start = warm_start
+        self.warm_start_stride = warm_start_stride
+        self.warm_start_window = warm_start_window
 
         # For each wind direction, determine the order of turbines
         self._get_turbine_orders()
 
     def _get_turbine_orders(self):
-        layout_x = self.fmodel.layout_x
-        layout_y = self.fmodel.layout_y
-        turbines_ordered_array = []
-        for wd in self.fmodel_subset.core.flow_field.wind_directions:
-            layout_x_rot = (
-                np.cos((wd - 270.0) * np.pi / 180.0) * layout_x
-                - np.sin((wd - 270.0) * np.pi / 180.0) * layout_y
-            )
-            turbines_ordered = np.argsort(layout_x_rot)
-            turbines_ordered_array.append(turbines_ordered)
-        self.turbines_ordered_array_subset = np.vstack(turbines_ordered_array)
-
+        # For each wind direction, order the turbines from upstream to downstream
+        self.turbines_ordered_array_subset = get_wake_adjacency(self.fmodel).get_turbine_orders(
+            self.fmodel_subset.core.flow_field.wind_directions
+        )
 
     def _calc_powers_with_memory(self, yaw_angles_subset, use_memory=True):
         # Define current optimal solutions and floris wind directions locally
@@ -126,17 +164,24 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
         else:
             idx = np.zeros(yaw_angles_subset.shape[0], dtype=bool)
 
-        if not np.all(idx):
+        if eval_multiple_passes and np.sum(~idx) >= 0.5 * len(idx):
+            # Evaluate the whole grid in a single solve of the persistent model
+            start_time = timerpc()
+            self.n_floris_evaluations += np.sum(~idx)
+            farm_powers[~idx] = self._calc_stacked_farm_powers(
+                np.reshape(yaw_angles_subset, (Ny, -1, self.nturbs))
+            ).flatten()[~idx]
+            self.time_spent_in_floris += (timerpc() - start_time)
+        elif not np.all(idx):
             # Now calculate farm powers for conditions we haven't yet evaluated previously
             start_time = timerpc()
             if (hasattr(self.fmodel.core.flow_field, 'heterogeneous_inflow_config') and
                 self.fmodel.core.flow_field.heterogeneous_inflow_config is not None):
-                het_sm_orig = np.array(
-                    self.fmodel.core.flow_field.heterogeneous_inflow_config['speed_multipliers']
-                )
+                het_sm_orig = self.fmodel.core.flow_field.get_speed_multipliers()
                 het_sm = np.tile(het_sm_orig, (Ny, 1))[~idx, :]
             else:
                 het_sm = None
+            self.n_floris_evaluations += np.sum(~idx)
             farm_powers[~idx] = self._calculate_farm_power(
                 wd_array=wd_array_subset[~idx],
                 ws_array=ws_array_subset[~idx],
@@ -159,6 +204,125 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
 
         return farm_powers
 
+    def _get_stacked_model(self, Ny):
+        """
+        Get the persistent FlorisModel that holds Ny copies of the wind conditions, stacked
+        along the findex axis. The model is built and its domain initialized on first use.
+        """
+        if Ny not in self._stacked_models:
+            fmodel = self.fmodel_subset.copy()
+            flow_field = fmodel.core.flow_field
+            heterogeneous_inflow_config = flow_field.heterogeneous_inflow_config
+            if heterogeneous_inflow_config is not None:
+                # Reference the speed multiplier rows rather than copying them for every copy
+                heterogeneous_inflow_config = dict(heterogeneous_inflow_config)
+                indices = heterogeneous_inflow_config.get(
+                    "speed_multiplier_indices", np.arange(flow_field.n_findex)
+                )
+                heterogeneous_inflow_config["speed_multiplier_indices"] = np.tile(indices, Ny)
+            fmodel.set(
+                wind_directions=np.tile(flow_field.wind_directions, Ny),
+                wind_speeds=np.tile(flow_field.wind_speeds, Ny),
+                turbulence_intensities=np.tile(flow_field.turbulence_intensities, Ny),
+                heterogeneous_inflow_config=heterogeneous_inflow_config,
+            )
+            fmodel.core.initialize_domain()
+            self._stacked_models[Ny] = fmodel
+        return self._stacked_models[Ny]
+
+    def _solve_upstream_turbines(self, n_upstream):
+        """
+        Solve the wakes of the first n_upstream turbines in the sorted turbine order of every
+        wind condition at the current optimal yaw angles. The solution is kept and advanced
+        by later calls. It is only solved again from the first turbine when n_upstream
+        decreases or when the yaw angles of the solved turbines have changed.
+        """
+        if self._upstream_model is None:
+            self._upstream_model = self.fmodel_subset.copy()
+            self._upstream_model.core.initialize_domain()
+            self._n_upstream_solved = 0
+        core = self._upstream_model.core
+        flow_field = core.flow_field
+        yaw_angles_sorted = np.take_along_axis(
+            self._yaw_angles_opt_subset, core.grid.sorted_indices[:, :, 0, 0], axis=1
+        )
+
+        n_solved = self._n_upstream_solved
+        yaw_angles_solved = core.farm.yaw_angles_sorted[:, :n_solved]
+        if n_solved > n_upstream or np.any(yaw_angles_sorted[:, :n_solved] != yaw_angles_solved):
+            n_solved = 0
+        if n_solved == 0:
+            flow_field.u_sorted = flow_field.u_initial_sorted.copy()
+            flow_field.v_sorted = flow_field.v_initial_sorted.copy()
+            flow_field.w_sorted = flow_field.w_initial_sorted.copy()
+            self._upstream_solver_state = None
+
+        core.farm.set_yaw_angles(self._yaw_angles_opt_subset)
+        core.farm.initialize(core.grid.sorted_indices)
+        if n_upstream > n_solved:
+            self._upstream_solver_state = sequential_solver(
+                core.farm,
+                flow_field,
+                core.grid,
+                core.wake,
+                turbine_range=(n_solved, n_upstream),
+                solver_state=self._upstream_solver_state,
+            )
+        self._n_upstream_solved = n_upstream
+
+    def _calc_stacked_farm_powers(self, yaw_angles_subset):
+        """
+        Calculate the weighted farm power of a grid of yaw angles with shape
+        (Ny, n_findex, n_turbines) in a single solve of the persistent model that holds Ny
+        copies of the wind conditions.
+        """
+        Ny = len(yaw_angles_subset)
+        fmodel = self._get_stacked_model(Ny)
+        core = fmodel.core
+        flow_field = core.flow_field
+        core.farm.set_yaw_angles(np.reshape(yaw_angles_subset, (-1, self.nturbs)))
+
+        if core.wake.model_strings["velocity_model"] in ["cc", "turbopark", "empirical_gauss"]:
+            # These solvers do not solve turbine by turbine, so solve all turbines
+            core.initialize_domain()
+            core.steady_state_atmospheric_condition()
+        else:
+            core.farm.initialize(core.grid.sorted_indices)
+
+            # The turbines ahead of the first turbine with differing yaw angles share their
+            # wakes between all candidates
+            positions = np.argsort(core.grid.sorted_indices[:self._n_findex_subset, :, 0, 0])
+            varied = np.any(yaw_angles_subset != self._yaw_angles_opt_subset, axis=0)
+            n_upstream = np.min(positions[varied], initial=self.nturbs)
+            if n_upstream > 0:
+                self._solve_upstream_turbines(n_upstream)
+                upstream_flow_field = self._upstream_model.core.flow_field
+                flow_field.u_sorted = np.tile(upstream_flow_field.u_sorted, (Ny, 1, 1, 1))
+                flow_field.v_sorted = np.tile(upstream_flow_field.v_sorted, (Ny, 1, 1, 1))
+                flow_field.w_sorted = np.tile(upstream_flow_field.w_sorted, (Ny, 1, 1, 1))
+                solver_state = {
+                    key: np.tile(value, (Ny, 1, 1, 1))
+                    for key, value in self._upstream_solver_state.items()
+                }
+            else:
+                flow_field.u_sorted = flow_field.u_initial_sorted.copy()
+                flow_field.v_sorted = flow_field.v_initial_sorted.copy()
+                flow_field.w_sorted = flow_field.w_initial_sorted.copy()
+                solver_state = None
+            sequential_solver(
+                core.farm,
+                flow_field,
+                core.grid,
+                core.wake,
+                turbine_range=(n_upstream, self.nturbs),
+                solver_state=solver_state,
+            )
+            core.finalize()
+
+        turbine_weights = np.tile(self._turbine_weights_subset, (Ny, 1))
+        farm_powers = np.sum(turbine_weights * fmodel._get_turbine_powers(), axis=1)
+        return np.reshape(farm_powers, (Ny, self._n_findex_subset))
+
     def _generate_evaluation_grid(self, pass_depth, turbine_depth):
         """
         Calculate the yaw angles for every iteration in the SR algorithm, for turbine,
@@ -218,19 +382,21 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
         farm_powers = self._calc_powers_with_memory(evaluation_grid)
         return farm_powers
 
-    def optimize(self, print_progress=True):
+    def _optimize_passes(self, passes, active):
         """
-        Find the yaw angles that maximize the power production for every wind direction,
-        wind speed and turbulence intensity.
+        Run the given Serial Refine passes for the active wind conditions. The search
+        range of every other condition is collapsed onto its current optimal yaw angles,
+        so that those conditions are taken from memory rather than evaluated again.
         """
-        self.print_progress = print_progress
+        self._yaw_lbs[~active] = self._yaw_angles_opt_subset[~active]
+        self._yaw_ubs[~active] = self._yaw_angles_opt_subset[~active]
 
         # For each pass, from front to back
         ii = 0
-        for Nii in range(len(self.Ny_passes)):
+        for Nii in passes:
             # Disturb yaw angles for one turbine at a time, from front to back
             for turbine_depth in range(self.nturbs):
-                p = 100.0 * ii / (len(self.Ny_passes) * self.nturbs)
+                p = 100.0 * ii / (len(passes) * self.nturbs)
                 ii += 1
                 if self.print_progress:
                     print(
@@ -306,6 +472,132 @@ class YawOptimizationSR(YawOptimization, LoggingManager):
                 self._farm_power_opt_subset = farm_power_opt
                 self._yaw_angles_opt_subset = yaw_angles_opt
 
+    def _get_relative_gains(self):
+        """
+        Get the relative gain in farm power of the current optimal yaw angles over the
+        baseline yaw angles for every wind condition, zero where the baseline farm power
+        is zero.
+        """
+        baseline = self._farm_power_baseline_subset
+        return np.divide(
+            self._farm_power_opt_subset - baseline,
+            baseline,
+            out=np.zeros_like(baseline),
+            where=baseline > 0.0,
+        )
+
+    def _optimize_warm_started(self):
+        """
+        Optimize the anchor conditions over the full yaw range, seed all other conditions
+        with the best of the solutions of their anchors and the mirror images of those
+        solutions, and refine them within a narrowed range that follows the solution while
+        it ends on the edge of the range. Seeded conditions that fail the improvement check
+        get the full search. This is a heuristic that can find less power than the full
+        search where the optimal yaw angles are not smooth in the wind direction.
+        """
+        _, parents = self._get_warm_start_parents(stride=self.warm_start_stride)
+        seeded = parents[:, 0] >= 0
+        self._optimize_passes(range(len(self.Ny_passes)), ~seeded)
+        if not np.any(seeded):
+            return
+
+        # Conditions whose anchors gain nothing over the baseline have no solution to be
+        # seeded from and get the full search instead
+        anchor_gains = np.where(seeded[:, None], self._get_relative_gains()[parents], 0.0)
+        unseeded = seeded & np.all(anchor_gains <= 0.0, axis=1)
+        seeded = seeded & ~unseeded
+
+        # Start from the best of the baseline, the solutions of both anchors and their mirror
+        # images, which catch the optimum switching sides where the turbines line up
+        yaw_lb = self._minimum_yaw_angle_subset
+        yaw_ub = self._maximum_yaw_angle_subset
+        seed_grid = np.tile(self._yaw_angles_opt_subset, (5, 1, 1))
+        for k in range(2):
+            anchor_yaw_angles = self._yaw_angles_opt_subset[parents[seeded, k]]
+            mirrored_yaw_angles = np.where(
+                self._turbs_to_opt_subset[seeded], -anchor_yaw_angles, anchor_yaw_angles
+            )
+            seed_grid[1 + k, seeded] = np.clip(anchor_yaw_angles, yaw_lb[seeded], yaw_ub[seeded])
+            seed_grid[3 + k, seeded] = np.clip(
+                mirrored_yaw_angles, yaw_lb[seeded], yaw_ub[seeded]
+            )
+        seed_powers = self._calc_powers_with_memory(seed_grid)
+        best = np.expand_dims(np.argmax(seed_powers, axis=0), axis=0)
+        self._farm_power_opt_subset = np.take_along_axis(seed_powers, best, axis=0)[0]
+        seeds = np.take_along_axis(seed_grid, np.expand_dims(best, axis=2), axis=0)[0]
+        self._yaw_angles_opt_subset = seeds
+
+        # Refine within the narrowed range, and move the range to the solution while it ends
+        # on the edge of the range, up to the number of steps that cross the full range
+        if self.warm_start_window is None:
+            window = 0.5 * (yaw_ub - yaw_lb) / (self.Ny_passes[0] - 1)
+        else:
+            window = self.warm_start_window
+        window = np.where(self._turbs_to_opt_subset, window, 0.0)
+        refine = seeded
+        on_edge = np.zeros_like(self._turbs_to_opt_subset)
+        for _ in range(self.Ny_passes[0]):
+            yaw_angles_start = self._yaw_angles_opt_subset
+            warm_lb = np.clip(yaw_angles_start - window, yaw_lb, yaw_ub)
+            warm_ub = np.clip(yaw_angles_start + window, yaw_lb, yaw_ub)
+            self._yaw_lbs[refine] = warm_lb[refine]
+            self._yaw_ubs[refine] = warm_ub[refine]
+            self._optimize_passes(range(1, len(self.Ny_passes)), refine)
+
+            yaw_angles_opt = self._yaw_angles_opt_subset
+            on_edge = self._turbs_to_opt_subset & (
+                ((yaw_angles_opt <= warm_lb + 1e-6) & (warm_lb > yaw_lb + 1e-6))
+                | ((yaw_angles_opt >= warm_ub - 1e-6) & (warm_ub < yaw_ub - 1e-6))
+            )
+            refine = refine & np.any(on_edge, axis=1)
+            if not np.any(refine):
+                break
+
+        # Improvement check: the optimum must lie within the narrowed range, improve on the
+        # baseline farm power, and gain at least half as much as both of its anchors
+        failed = unseeded | refine | (seeded & (
+            (self._farm_power_opt_subset <= self._farm_power_baseline_subset)
+            | (self._get_relative_gains() < 0.5 * np.min(anchor_gains, axis=1))
+        ))
+        if not np.any(failed):
+            return
+
+        # Fall back to a full-range search, keeping the warm-started solution if it is better
+        farm_power_warm = np.array(self._farm_power_opt_subset, copy=True)
+        yaw_angles_warm = np.array(self._yaw_angles_opt_subset, copy=True)
+        self._farm_power_opt_subset[failed] = self._farm_power_baseline_subset[failed]
+        self._yaw_angles_opt_subset[failed] = self._yaw_angles_baseline_subset[failed]
+        self._yaw_lbs[failed] = yaw_lb[failed]
+        self._yaw_ubs[failed] = yaw_ub[failed]
+        self._optimize_passes([0], failed)
+
+        # A condition that gains nothing in the first pass keeps the full range as its bounds,
+        # so later passes with one point less than the first evaluate the same yaw angles and
+        # are skipped
+        if all(Ny + 1 == self.Ny_passes[0] for Ny in self.Ny_passes[1:]):
+            failed = failed & (self._farm_power_opt_subset > self._farm_power_baseline_subset)
+        if np.any(failed):
+            self._optimize_passes(range(1, len(self.Ny_passes)), failed)
+
+        keep_warm = failed & (farm_power_warm > self._farm_power_opt_subset)
+        self._farm_power_opt_subset[keep_warm] = farm_power_warm[keep_warm]
+        self._yaw_angles_opt_subset[keep_warm] = yaw_angles_warm[keep_warm]
+
+    def optimize(self, print_progress=True):
+        """
+        Find the yaw angles that maximize the power production for every wind direction,
+        wind speed and turbulence intensity.
+        """
+        self.print_progress = print_progress
+
+        if self.warm_start:
+            self._optimize_warm_started()
+        else:
+            self._optimize_passes(
+                range(len(self.Ny_passes)),
+                np.ones(self._n_findex_subset, dtype=bool),
+            )
+
         # Finalize optimization, i.e., retrieve full solutions
         df_opt = self._finalize()
         return df_opt
@@ -122,6 +122,7 @@ class ParallelFlorisModel(LoggingManager):
             self._n_unexpanded = fmodel.n_unexpanded
             self._n_sample_points = fmodel.n_sample_points
             self._map_to_expanded_inputs = fmodel.map_to_expanded_inputs
+            self._interpolation_weights = fmodel.interpolation_weights
         self.core = self.fmodel.core # Static copy as a placeholder
 
         # Save to self
@@ -300,6 +301,7 @@ class ParallelFlorisModel(LoggingManager):
                 n_unexpanded=self._n_unexpanded,
                 n_sample_points=self._n_sample_points,
                 n_turbines=self.fmodel.core.farm.n_turbines,
+                interpolation_weights=self._interpolation_weights,
             )
         t_postprocessing = timerpc() - t2
         t_total = timerpc() - t0
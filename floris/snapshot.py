@@ -0,0 +1,138 @@
+"""
+Binary snapshot container for fully constructed FLORIS objects.
+
+A snapshot file has the following layout:
+
+- 8 byte magic string, ``SNAPSHOT_MAGIC``
+- 4 byte little-endian unsigned integer with the container format version
+- 8 byte little-endian unsigned integer with the length of the JSON header
+- JSON header with the location of the pickle payload and of each array buffer
+- The data section: the pickled object graph (pickle protocol 5) followed by the raw array
+  buffers, each aligned to ``SNAPSHOT_ALIGNMENT`` bytes
+
+Locations in the header are relative to the start of the data section, which is itself aligned.
+
+Arrays are stored out-of-band from the pickle stream so that, on load, they can be
+reconstructed as views into a memory map of the file rather than copied into memory.
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from floris import __version__
+
+
+SNAPSHOT_MAGIC = b"FLORSNAP"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct("<8sIQ")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+
+def write_snapshot(filename: str | Path, obj: Any) -> None:
+    """
+    Write an object graph to a snapshot file. All contiguous Numpy arrays in the object graph
+    are written as raw, aligned buffers after the pickled object structure.
+
+    Args:
+        filename (str | Path): Path of the snapshot file to write.
+        obj (Any): The object to store. It must be picklable.
+    """
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [b.raw() for b in buffers]
+
+    offset = 0
+    locations = []
+    for data in [payload, *raw_buffers]:
+        locations.append([offset, data.nbytes if isinstance(data, memoryview) else len(data)])
+        offset = _align(offset + locations[-1][1])
+    header = json.dumps(
+        {
+            "floris_version": __version__,
+            "payload": locations[0],
+            "buffers": locations[1:],
+        }
+    ).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    with open(filename, "wb") as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)))
+        f.write(header)
+        for (offset, _), data in zip(locations, [payload, *raw_buffers]):
+            f.write(b"\0" * (data_start + offset - f.tell()))
+            f.write(data)
+
+
+def read_snapshot_header(filename: str | Path) -> dict:
+    """
+    Read and validate the header of a snapshot file.
+
+    Args:
+        filename (str | Path): Path of the snapshot file.
+
+    Raises:
+        ValueError: If the file is not a FLORIS snapshot or was written with a newer
+            container format version than this version of FLORIS supports.
+
+    Returns:
+        dict: The JSON header with the ``format_version`` and ``data_start`` added.
+    """
+    with open(filename, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{filename} is not a FLORIS snapshot file.")
+        magic, format_version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{filename} is not a FLORIS snapshot file.")
+        if format_version > SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"{filename} was written with snapshot format version {format_version}, but "
+                f"this version of FLORIS supports up to version {SNAPSHOT_FORMAT_VERSION}."
+            )
+        header = json.loads(f.read(header_length))
+    header["format_version"] = format_version
+    header["data_start"] = _align(_PREAMBLE.size + header_length)
+    return header
+
+
+def read_snapshot(filename: str | Path, mmap: bool = True) -> tuple[Any, dict]:
+    """
+    Read an object graph from a snapshot file. Snapshots are pickle based, so only load
+    files from trusted sources.
+
+    Args:
+        filename (str | Path): Path of the snapshot file.
+        mmap (bool, optional): If True, the arrays in the returned object are copy-on-write
+            views into a memory map of the file so large arrays are not read until they are
+            used. If False, the file is read into memory. Defaults to True.
+
+    Returns:
+        tuple[Any, dict]: The stored object and the snapshot header.
+    """
+    header = read_snapshot_header(filename)
+
+    if mmap:
+        data = np.memmap(filename, dtype=np.uint8, mode="c")
+    else:
+        with open(filename, "rb") as f:
+            data = memoryview(bytearray(f.read()))
+
+    start = header["data_start"]
+    payload, *buffers = [
+        data[start + offset:start + offset + length]
+        for offset, length in [header["payload"], *header["buffers"]]
+    ]
+    obj = pickle.loads(payload, buffers=buffers)
+    return obj, header
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import copy
+from collections import OrderedDict
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 
 from floris import FlorisModel
 from floris.logging_manager import LoggingManager
@@ -20,6 +23,23 @@ from floris.wind_data import (
 )
 
 
+# Arguments to UncertainFlorisModel.set() that only change the conditions represented in the
+# rows of the unique inputs, and so leave previously solved rows valid
+CONDITION_CACHE_SET_KEYS = {
+    "wind_directions",
+    "wind_speeds",
+    "turbulence_intensities",
+    "wind_data",
+    "yaw_angles",
+    "power_setpoints",
+    "awc_amplitudes",
+    "disable_turbines",
+}
+
+# Largest Gauss-Hermite order tried when adaptively refining the wind direction quadrature
+GAUSS_HERMITE_MAX_ORDER = 15
+
+
 class UncertainFlorisModel(LoggingManager):
     """
     An interface for handling uncertainty in wind farm simulations.
@@ -60,6 +80,37 @@ class UncertainFlorisModel(LoggingManager):
             direction such that the yaw misalignment changes depending on the sampled wind
             direction.  Defaults to False.
         verbose (bool, optional): Verbosity flag for printing messages. Defaults to False.
+        interpolation (str, optional): How the wind direction, wind speed and turbulence
+            intensity are reduced to the specified resolutions. With 'nearest', each is rounded
+            to the nearest multiple of its resolution. With 'linear', the conditions are solved
+            at the corners of the lattice cell that brackets them and the turbine powers are
+            multilinearly interpolated to the exact conditions, with wind direction treated as
+            periodic. 'linear' gives similar accuracy to 'nearest' at much coarser resolutions.
+            Yaw angles, power setpoints and AWC amplitudes are always rounded.
+            Defaults to "nearest".
+        condition_cache_size (int, optional): Maximum number of solved unique conditions whose
+            turbine powers are kept between calls to run(). When greater than 0, run() only
+            solves the unique conditions that are not already in the cache, which avoids
+            repeated solves when, for example, neighboring wind directions share perturbed
+            conditions or an optimizer revisits the same setpoints. The least recently used
+            conditions are discarded first. The cache is shared with copies and is replaced
+            when set() changes anything other than the wind conditions and operation
+            setpoints. It is not used with heterogeneous inflow or non-baseline AWC modes.
+            Defaults to 0, which disables the cache.
+        wd_quadrature_order (int, optional): If provided, the wind direction sample points and
+            weights are the nodes and weights of the Gauss-Hermite quadrature rule of this
+            order for a normal distribution with standard deviation wd_std, rather than
+            wd_sample_points with sampled Gaussian weights. The order must be odd so that the
+            nominal wind direction is one of the nodes. An order of 3 to 5 gives the accuracy of
+            many equally spaced sample points. Because the nodes are generally not multiples of
+            wd_resolution, this is best combined with interpolation="linear".
+            Defaults to None.
+        wd_quadrature_tolerance (float, optional): If provided, run() starts from the
+            Gauss-Hermite rule of order wd_quadrature_order (3 if not provided) and increases the
+            order by 2 until the farm power of every findex changes by less than this fraction
+            between successive orders, up to an order of GAUSS_HERMITE_MAX_ORDER. The sample
+            points and weights of the final order are kept until the next call to run().
+            Defaults to None.
     """
 
     def __init__(
@@ -75,7 +126,23 @@ class UncertainFlorisModel(LoggingManager):
         wd_sample_points=None,
         fix_yaw_to_nominal_direction=False,
         verbose=False,
+        interpolation="nearest",
+        condition_cache_size=0,
+        wd_quadrature_order=None,
+        wd_quadrature_tolerance=None,
     ):
+        if interpolation not in ("nearest", "linear"):
+            raise ValueError(
+                f"Unknown interpolation method: '{interpolation}'. "
+                "Available methods are 'nearest' and 'linear'"
+            )
+        if wd_quadrature_tolerance is not None and wd_quadrature_order is None:
+            wd_quadrature_order = 3
+        if wd_quadrature_order is not None and wd_sample_points is not None:
+            raise ValueError(
+                "wd_sample_points cannot be provided together with wd_quadrature_order."
+            )
+
         # Save these inputs
         self.wd_resolution = wd_resolution
         self.ws_resolution = ws_resolution
@@ -86,16 +153,26 @@ class UncertainFlorisModel(LoggingManager):
         self.wd_std = wd_std
         self.fix_yaw_to_nominal_direction = fix_yaw_to_nominal_direction
         self.verbose = verbose
-
-        # If wd_sample_points, default to 1 and 2 std
-        if wd_sample_points is None:
-            wd_sample_points = [-2 * wd_std, -1 * wd_std, 0, wd_std, 2 * wd_std]
-
-        self.wd_sample_points = wd_sample_points
-        self.n_sample_points = len(self.wd_sample_points)
-
-        # Get the weights
-        self.weights = self._get_weights(self.wd_std, self.wd_sample_points)
+        self.interpolation = interpolation
+        self.condition_cache_size = condition_cache_size
+        self._condition_cache = OrderedDict()
+        self._unique_turbine_powers = None
+        self.wd_quadrature_order = wd_quadrature_order
+        self.wd_quadrature_tolerance = wd_quadrature_tolerance
+
+        if wd_quadrature_order is not None:
+            # Take the sample points and weights from the Gauss-Hermite rule
+            self._set_wd_quadrature(wd_quadrature_order)
+        else:
+            # If wd_sample_points, default to 1 and 2 std
+            if wd_sample_points is None:
+                wd_sample_points = [-2 * wd_std, -1 * wd_std, 0, wd_std, 2 * wd_std]
+
+            self.wd_sample_points = wd_sample_points
+            self.n_sample_points = len(self.wd_sample_points)
+
+            # Get the weights
+            self.weights = self._get_weights(self.wd_std, self.wd_sample_points)
 
         # Instantiate the un-expanded FlorisModel
         self.fmodel_unexpanded = FlorisModel(configuration)
@@ -118,6 +195,11 @@ class UncertainFlorisModel(LoggingManager):
         Args:
             **kwargs: The wind farm conditions to set.
         """
+        # Solved conditions are only valid for the same farm and models, so start a new
+        # cache if anything else is changed
+        if not set(kwargs).issubset(CONDITION_CACHE_SET_KEYS):
+            self._condition_cache = OrderedDict()
+
         # Call the nominal set function
         self.fmodel_unexpanded.set(**kwargs)
 
@@ -167,6 +249,10 @@ class UncertainFlorisModel(LoggingManager):
             self.awc_amplitude_resolution,
         )
 
+        # When interpolating, the wind conditions are kept exact until the lattice is formed
+        if self.interpolation == "linear":
+            self.rounded_inputs[:, :3] = self.unexpanded_inputs[:, :3]
+
         # Get the expanded inputs
         self._expanded_wind_directions = self._expand_wind_directions(
             self.rounded_inputs,
@@ -176,9 +262,21 @@ class UncertainFlorisModel(LoggingManager):
         )
         self.n_expanded = self._expanded_wind_directions.shape[0]
 
+        # Replace each expanded condition by the corners of its bracketing lattice cell
+        if self.interpolation == "linear":
+            lattice_inputs, self.interpolation_weights = self._get_lattice_inputs(
+                self._expanded_wind_directions,
+                self.wd_resolution,
+                self.ws_resolution,
+                self.ti_resolution,
+            )
+        else:
+            lattice_inputs = self._expanded_wind_directions
+            self.interpolation_weights = None
+
         # Get the unique inputs
         self.unique_inputs, self.map_to_expanded_inputs = self._get_unique_inputs(
-            self._expanded_wind_directions
+            lattice_inputs
         )
         self.n_unique = self.unique_inputs.shape[0]
 
@@ -188,27 +286,103 @@ class UncertainFlorisModel(LoggingManager):
             print(f"Expanded num rows: {self.n_expanded}")
             print(f"Unique num rows: {self.n_unique}")
 
-        # Initiate the expanded FlorisModel
-        self.fmodel_expanded = self.fmodel_unexpanded.copy()
-
-        # Now set the underlying wd/ws/ti/yaw/setpoint to check only the unique conditions
-        self.fmodel_expanded.set(
-            wind_directions=self.unique_inputs[:, 0],
-            wind_speeds=self.unique_inputs[:, 1],
-            turbulence_intensities=self.unique_inputs[:, 2],
-            yaw_angles=self.unique_inputs[:, 3 : 3 + self.fmodel_unexpanded.core.farm.n_turbines],
-            power_setpoints=self.unique_inputs[
-                :,
-                3 + self.fmodel_unexpanded.core.farm.n_turbines : 3
-                + 2 * self.fmodel_unexpanded.core.farm.n_turbines,
-            ],
-            awc_amplitudes=self.unique_inputs[
-                :,
-                3 + 2 * self.fmodel_unexpanded.core.farm.n_turbines : 3
-                + 3 * self.fmodel_unexpanded.core.farm.n_turbines,
-            ],
+        # The expanded FlorisModel is built from the unique conditions when it is first needed
+        self._fmodel_expanded = None
+        self._unique_turbine_powers = None
+
+    @property
+    def fmodel_expanded(self):
+        """
+        The FlorisModel set to the unique conditions of the expanded set of conditions.
+
+        Returns:
+            FlorisModel: The expanded FlorisModel.
+        """
+        if self._fmodel_expanded is None:
+            self._fmodel_expanded = self._get_model_for_inputs(self.unique_inputs)
+        return self._fmodel_expanded
+
+    def _get_model_for_inputs(self, inputs):
+        """
+        Create a copy of the unexpanded FlorisModel set to the conditions in the rows of inputs.
+
+        Args:
+            inputs (numpy.ndarray): An array of shape (m, 3 + 3 * n_turbines) whose columns are
+                the wind direction, wind speed, turbulence intensity, yaw angles, power setpoints
+                and AWC amplitudes.
+
+        Returns:
+            FlorisModel: The FlorisModel with m findices.
+        """
+        n_turbines = self.fmodel_unexpanded.core.farm.n_turbines
+        fmodel = self.fmodel_unexpanded.copy()
+        fmodel.set(
+            wind_directions=inputs[:, 0],
+            wind_speeds=inputs[:, 1],
+            turbulence_intensities=inputs[:, 2],
+            yaw_angles=inputs[:, 3 : 3 + n_turbines],
+            power_setpoints=inputs[:, 3 + n_turbines : 3 + 2 * n_turbines],
+            awc_amplitudes=inputs[:, 3 + 2 * n_turbines : 3 + 3 * n_turbines],
+        )
+        return fmodel
+
+    def _condition_cache_enabled(self):
+        """
+        Check whether solved conditions can be stored in and read from the condition cache.
+        The cache is keyed on the unique input rows only, so it cannot be used when the powers
+        also depend on per-findex inputs that are not part of those rows.
+
+        Returns:
+            bool: True if the condition cache can be used.
+        """
+        farm = self.fmodel_unexpanded.core.farm
+        return (
+            self.condition_cache_size > 0
+            and self.fmodel_unexpanded.core.flow_field.heterogeneous_inflow_config is None
+            and np.all(farm.awc_modes == "baseline")
+            and np.all(farm.awc_frequencies == 0)
         )
 
+    def _run_with_condition_cache(self):
+        """
+        Compute the turbine powers of the unique conditions, solving only those that are not
+        in the condition cache, and add the newly solved conditions to the cache.
+        """
+        keys = [row.tobytes() for row in self.unique_inputs]
+        unique_turbine_powers = np.empty(
+            (self.n_unique, self.fmodel_unexpanded.core.farm.n_turbines)
+        )
+
+        missing = []
+        for i, key in enumerate(keys):
+            turbine_powers = self._condition_cache.get(key)
+            if turbine_powers is None:
+                missing.append(i)
+            else:
+                unique_turbine_powers[i] = turbine_powers
+                self._condition_cache.move_to_end(key)
+
+        if self.verbose:
+            print(f"Cached unique rows: {self.n_unique - len(missing)}")
+
+        if missing:
+            fmodel = self._get_model_for_inputs(self.unique_inputs[missing])
+            fmodel.run()
+            unique_turbine_powers[missing] = fmodel._get_turbine_powers()
+
+            for i in missing:
+                self._condition_cache[keys[i]] = unique_turbine_powers[i].copy()
+            while len(self._condition_cache) > self.condition_cache_size:
+                self._condition_cache.popitem(last=False)
+
+        self._unique_turbine_powers = unique_turbine_powers
+
+    def clear_condition_cache(self):
+        """
+        Remove all solved conditions from the condition cache.
+        """
+        self._condition_cache = OrderedDict()
+
     def reset_operation(self):
         """
         Reset the operation of the underlying FlorisModel object.
@@ -228,7 +402,52 @@ class UncertainFlorisModel(LoggingManager):
         Run the simulation in the underlying FlorisModel object.
         """
 
-        self.fmodel_expanded.run()
+        if self.wd_quadrature_tolerance is not None:
+            self._run_adaptive_quadrature()
+        else:
+            self._run()
+
+    def _run(self):
+        """
+        Solve the unique conditions with the current wind direction sample points.
+        """
+
+        if self._condition_cache_enabled():
+            self._run_with_condition_cache()
+        else:
+            self.fmodel_expanded.run()
+            self._unique_turbine_powers = None
+
+    def _run_adaptive_quadrature(self):
+        """
+        Solve the unique conditions with Gauss-Hermite rules of increasing order, starting from
+        wd_quadrature_order, until the farm power of every findex changes by less than
+        wd_quadrature_tolerance, as a fraction, between successive orders.
+        """
+        order = self.wd_quadrature_order
+        self._set_wd_quadrature(order)
+        self._set_uncertain()
+        self._run()
+        farm_power = self._get_turbine_powers().sum(axis=1)
+
+        while order < GAUSS_HERMITE_MAX_ORDER:
+            order += 2
+            self._set_wd_quadrature(order)
+            self._set_uncertain()
+            self._run()
+            previous_farm_power = farm_power
+            farm_power = self._get_turbine_powers().sum(axis=1)
+
+            if np.all(
+                np.abs(farm_power - previous_farm_power)
+                <= self.wd_quadrature_tolerance * np.abs(farm_power)
+            ):
+                return
+
+        self.logger.warning(
+            f"Wind direction quadrature did not converge to a tolerance of "
+            f"{self.wd_quadrature_tolerance} by order {order}."
+        )
 
     def run_no_wake(self):
         """
@@ -236,6 +455,7 @@ class UncertainFlorisModel(LoggingManager):
         """
 
         self.fmodel_expanded.run_no_wake()
+        self._unique_turbine_powers = None
 
     def _get_turbine_powers(self):
         """Calculates the power at each turbine in the wind farm.
@@ -248,14 +468,20 @@ class UncertainFlorisModel(LoggingManager):
 
         """
 
+        if self._unique_turbine_powers is not None:
+            unique_turbine_powers = self._unique_turbine_powers
+        else:
+            unique_turbine_powers = self.fmodel_expanded._get_turbine_powers()
+
         # Pass to off-class function
         result = map_turbine_powers_uncertain(
-            unique_turbine_powers=self.fmodel_expanded._get_turbine_powers(),
+            unique_turbine_powers=unique_turbine_powers,
             map_to_expanded_inputs=self.map_to_expanded_inputs,
             weights=self.weights,
             n_unexpanded=self.n_unexpanded,
             n_sample_points=self.n_sample_points,
             n_turbines=self.fmodel_unexpanded.core.farm.n_turbines,
+            interpolation_weights=self.interpolation_weights,
         )
 
         return result
@@ -599,6 +825,80 @@ class UncertainFlorisModel(LoggingManager):
 
         return rounded_input_array
 
+    def _get_lattice_inputs(
+        self,
+        input_array,
+        wd_resolution=1.0,  # Degree
+        ws_resolution=1.0,  # m/s
+        ti_resolution=0.01,
+    ):
+        """
+        Find the corners of the wind direction, wind speed and turbulence intensity lattice cell
+        that brackets each row of the input array, along with the multilinear interpolation
+        weight of each corner. Wind directions are periodic, so the cell above 360 - wd_resolution
+        wraps around to 0. Along a dimension where a row lies on the lattice, both corners are
+        the row itself so that no additional conditions need to be solved. The same holds for
+        wind speeds and turbulence intensities below the first positive lattice point, which
+        are solved exactly rather than interpolated from zero.
+
+        Args:
+            input_array (numpy.ndarray): An array of shape (m, n) whose first three columns are
+                the wind direction, wind speed and turbulence intensity.
+            wd_resolution (float): Lattice spacing of wind direction in degrees.
+                Default is 1.0 degree.
+            ws_resolution (float): Lattice spacing of wind speed in m/s. Default is 1.0 m/s.
+            ti_resolution (float): Lattice spacing of turbulence intensity. Default is 0.01.
+
+        Returns:
+            tuple: A tuple containing:
+                numpy.ndarray: The lattice corners, of shape (8 * m, n), ordered by corner and
+                    then by row of input_array. Columns after the third are unchanged.
+                numpy.ndarray: The interpolation weight of each corner, of shape (8, m).
+        """
+        lower = []
+        upper = []
+        fractions = []
+        for column, resolution in enumerate([wd_resolution, ws_resolution, ti_resolution]):
+            scaled = input_array[:, column] / resolution
+            nearest = np.round(scaled)
+
+            # Treat values within round off of the lattice as on it
+            on_lattice = np.abs(scaled - nearest) < 1e-9
+            lower_index = np.where(on_lattice, nearest, np.floor(scaled))
+
+            lower_value = lower_index * resolution
+            upper_value = np.where(on_lattice, lower_index, lower_index + 1) * resolution
+            fraction = np.where(on_lattice, 0.0, scaled - lower_index)
+
+            # FLORIS gives NaN at zero wind speed and turbulence intensity, so rows below the
+            # first positive lattice point are solved exactly rather than bracketed by zero
+            if column > 0:
+                exact = ~on_lattice & (lower_index <= 0)
+                lower_value = np.where(exact, input_array[:, column], lower_value)
+                upper_value = np.where(exact, input_array[:, column], upper_value)
+                fraction = np.where(exact, 0.0, fraction)
+
+            fractions.append(fraction)
+            lower.append(lower_value)
+            upper.append(upper_value)
+        lower[0] = lower[0] % 360.0
+        upper[0] = upper[0] % 360.0
+
+        n_rows = input_array.shape[0]
+        lattice_inputs = np.tile(input_array, (8, 1))
+        weights = np.ones((8, n_rows))
+        for corner in range(8):
+            rows = slice(corner * n_rows, (corner + 1) * n_rows)
+            for column in range(3):
+                if (corner >> column) & 1:
+                    lattice_inputs[rows, column] = upper[column]
+                    weights[corner] *= fractions[column]
+                else:
+                    lattice_inputs[rows, column] = lower[column]
+                    weights[corner] *= 1.0 - fractions[column]
+
+        return lattice_inputs, weights
+
     def _expand_wind_directions(
         self, input_array, wd_sample_points, fix_yaw_to_nominal_direction=False, n_turbines=None
     ):
@@ -649,27 +949,19 @@ class UncertainFlorisModel(LoggingManager):
         num_samples = len(wd_sample_points)
         num_rows = input_array.shape[0]
 
-        # Create an array to hold the expanded data
-        output_array = np.zeros((num_rows * num_samples, input_array.shape[1]))
-
-        # Repeat each row of input_array for each sample point
-        for i in range(num_samples):
-            start_idx = i * num_rows
-            end_idx = start_idx + num_rows
-            output_array[start_idx:end_idx, :] = input_array.copy()
-
-            # Perturb the wd column by the current sample point
-            output_array[start_idx:end_idx, 0] = (
-                output_array[start_idx:end_idx, 0] + wd_sample_points[i]
-            ) % 360
-
-            # If fix_yaw_to_nominal_direction is True, set the yaw angle to relative
-            # to the nominal wind direction
-            if fix_yaw_to_nominal_direction:
-                # Wrap between -180 and 180
-                output_array[start_idx:end_idx, 3 : 3 + n_turbines] = wrap_180(
-                    output_array[start_idx:end_idx, 3 : 3 + n_turbines] + wd_sample_points[i]
-                )
+        # Repeat the input array for each sample point, ordered by sample point, and perturb
+        # the wd column by the corresponding sample point
+        output_array = np.tile(np.asarray(input_array, dtype=float), (num_samples, 1))
+        wd_offsets = np.repeat(np.asarray(wd_sample_points, dtype=float), num_rows)
+        output_array[:, 0] = (output_array[:, 0] + wd_offsets) % 360
+
+        # If fix_yaw_to_nominal_direction is True, set the yaw angle to relative
+        # to the nominal wind direction
+        if fix_yaw_to_nominal_direction:
+            # Wrap between -180 and 180
+            output_array[:, 3 : 3 + n_turbines] = wrap_180(
+                output_array[:, 3 : 3 + n_turbines] + wd_offsets[:, None]
+            )
 
         return output_array
 
@@ -678,21 +970,38 @@ class UncertainFlorisModel(LoggingManager):
         Finds unique rows in the input numpy array and constructs a mapping array
         to reconstruct the input array from the unique rows.
 
+        The rows are deduplicated with a hash table on a 64-bit hash of each row rather than by
+        sorting, so the cost grows linearly with the number of rows. The result is checked
+        against the input and, in the unlikely event of a hash collision, the rows are instead
+        deduplicated with np.unique.
+
         Args:
             input_array (numpy.ndarray): Input array of shape (m, n).
 
         Returns:
             tuple: A tuple containing:
                 numpy.ndarray: An array of unique rows found in the input_array, of shape (r, n),
-                            where r <= m.
+                            where r <= m, in order of first occurrence.
                 numpy.ndarray: A 1D array of indices mapping each row of the input_array
                             to the corresponding row in the unique_inputs array.
                             It represents how to reconstruct the input_array from the unique rows.
         """
-
-        unique_inputs, indices, map_to_expanded_inputs = np.unique(
-            input_array, axis=0, return_index=True, return_inverse=True
+        input_array = np.asarray(input_array)
+
+        # Codes are assigned in order of first occurrence, so a row is the first occurrence of
+        # its code if the code is larger than all preceding codes
+        map_to_expanded_inputs, _ = pd.factorize(_hash_rows(input_array))
+        is_first_occurrence = np.ones(len(map_to_expanded_inputs), dtype=bool)
+        is_first_occurrence[1:] = (
+            map_to_expanded_inputs[1:] > np.maximum.accumulate(map_to_expanded_inputs)[:-1]
         )
+        unique_inputs = input_array[is_first_occurrence]
+
+        if not _rows_equal(unique_inputs, map_to_expanded_inputs, input_array):
+            unique_inputs, map_to_expanded_inputs = np.unique(
+                input_array, axis=0, return_inverse=True
+            )
+            map_to_expanded_inputs = map_to_expanded_inputs.reshape(-1)
 
         return unique_inputs, map_to_expanded_inputs
 
@@ -718,21 +1027,48 @@ class UncertainFlorisModel(LoggingManager):
 
         return weights
 
+    def _get_gauss_hermite_points(self, wd_std, order):
+        """Generates the nodes and weights of a Gauss-Hermite quadrature rule for the expected
+        value over a normal distribution of wind direction.
+
+        Args:
+            wd_std (float): The standard deviation of the normal distribution.
+            order (int): The number of nodes of the rule. Must be odd so that the middle node
+                is 0.
+
+        Returns:
+            tuple: A tuple containing:
+                numpy.ndarray: The wind direction offsets of the nodes, in ascending order.
+                numpy.ndarray: The weights of the nodes, which sum to 1.
+        """
+        if int(order) != order or order < 1 or order % 2 != 1:
+            raise ValueError(f"The quadrature order must be a positive odd integer, not {order}.")
+
+        # hermegauss gives the rule for the weight function exp(-x**2 / 2)
+        nodes, weights = np.polynomial.hermite_e.hermegauss(int(order))
+
+        # The middle node is 0 analytically
+        nodes[len(nodes) // 2] = 0.0
+
+        return wd_std * nodes, weights / np.sum(weights)
+
+    def _set_wd_quadrature(self, order):
+        """
+        Set the wind direction sample points and weights to the Gauss-Hermite rule of the
+        given order.
+
+        Args:
+            order (int): The order of the rule.
+        """
+        self.wd_sample_points, self.weights = self._get_gauss_hermite_points(self.wd_std, order)
+        self.n_sample_points = len(self.wd_sample_points)
+
     def copy(self):
         """Create an independent copy of the current UncertainFlorisModel object"""
-        return UncertainFlorisModel(
-            self.fmodel_unexpanded.core.as_dict(),
-            wd_resolution=self.wd_resolution,
-            ws_resolution=self.ws_resolution,
-            ti_resolution=self.ti_resolution,
-            yaw_resolution=self.yaw_resolution,
-            power_setpoint_resolution=self.power_setpoint_resolution,
-            awc_amplitude_resolution=self.awc_amplitude_resolution,
-            wd_std=self.wd_std,
-            wd_sample_points=self.wd_sample_points,
-            fix_yaw_to_nominal_direction=self.fix_yaw_to_nominal_direction,
-            verbose=self.verbose,
-        )
+        self_copy = copy.copy(self)
+        self_copy.fmodel_unexpanded = self.fmodel_unexpanded.copy()
+        self_copy._set_uncertain()
+        return self_copy
 
     @property
     def layout_x(self):
@@ -822,6 +1158,7 @@ def map_turbine_powers_uncertain(
     n_unexpanded,
     n_sample_points,
     n_turbines,
+    interpolation_weights=None,
 ):
     """Calculates the power at each turbine in the wind farm based on uncertainty weights.
 
@@ -837,6 +1174,10 @@ def map_turbine_powers_uncertain(
         n_unexpanded (int): The number of unexpanded conditions
         n_sample_points (int): The number of wind direction sample points
         n_turbines (int): The number of turbines in the wind farm
+        interpolation_weights (NDArrayFloat, optional): An array of shape
+            (n_corners, n_expanded) with the weights of the lattice corners of each expanded
+            condition. If provided, map_to_expanded_inputs maps the unique powers to the
+            corners, ordered by corner and then by expanded condition. Defaults to None.
 
     Returns:
         NDArrayFloat: An array containing the powers at each turbine for each findex.
@@ -846,6 +1187,14 @@ def map_turbine_powers_uncertain(
     # Expand back to the expanded value
     expanded_turbine_powers = unique_turbine_powers[map_to_expanded_inputs]
 
+    # Interpolate the powers at the lattice corners to the expanded conditions
+    if interpolation_weights is not None:
+        expanded_turbine_powers = np.einsum(
+            "ce,cet->et",
+            interpolation_weights,
+            expanded_turbine_powers.reshape(interpolation_weights.shape + (n_turbines,)),
+        )
+
     # Reshape the weights array to make it compatible with broadcasting
     weights_reshaped = weights[:, np.newaxis]
 
@@ -865,13 +1214,63 @@ def map_turbine_powers_uncertain(
     return result
 
 
+def _hash_rows(input_array):
+    """
+    Compute a 64-bit hash of each row of a 2D array. Rows with equal values have equal hashes;
+    -0.0 and 0.0 are treated as equal.
+
+    Args:
+        input_array (NDArrayFloat): Array of shape (m, n).
+
+    Returns:
+        NDArrayInt: Array of shape (m) of unsigned 64-bit hashes.
+    """
+    hashes = np.zeros(input_array.shape[0], dtype=np.uint64)
+
+    # Mix the bits of each column with the splitmix64 finalizer and fold them into the hash one
+    # column at a time so that only one column is copied at once
+    for column in input_array.T:
+        bits = np.add(column, 0.0, dtype=np.float64).view(np.uint64)
+        bits ^= bits >> np.uint64(30)
+        bits *= np.uint64(0xBF58476D1CE4E5B9)
+        bits ^= bits >> np.uint64(27)
+        bits *= np.uint64(0x94D049BB133111EB)
+        bits ^= bits >> np.uint64(31)
+        hashes *= np.uint64(0x9E3779B97F4A7C15)
+        hashes ^= bits
+
+    return hashes
+
+
+def _rows_equal(unique_inputs, map_to_expanded_inputs, input_array, block_size=65536):
+    """
+    Check that the unique rows mapped back to the expanded rows reproduce the input array,
+    comparing in blocks of rows to limit memory use.
+
+    Args:
+        unique_inputs (NDArrayFloat): Array of shape (r, n) of unique rows.
+        map_to_expanded_inputs (NDArrayInt): Array of shape (m) of indices into unique_inputs.
+        input_array (NDArrayFloat): Array of shape (m, n).
+        block_size (int, optional): Number of rows to compare at once. Defaults to 65536.
+
+    Returns:
+        bool: True if unique_inputs[map_to_expanded_inputs] equals input_array.
+    """
+    for start in range(0, input_array.shape[0], block_size):
+        rows = slice(start, start + block_size)
+        if not np.array_equal(unique_inputs[map_to_expanded_inputs[rows]], input_array[rows]):
+            return False
+    return True
+
+
 class ApproxFlorisModel(UncertainFlorisModel):
     """
     The ApproxFlorisModel overloads the UncertainFlorisModel with the special case that
     the wd_sample_points = [0].  This is a special case where no uncertainty is added
     but the resolution of the values wind direction, wind speed etc are still reduced
     by the specified resolution.  This allows for cases to be reused and a faster approximate
-    result computed
+    result computed.  With interpolation="linear", the turbine powers are interpolated from
+    the surrounding lattice of resolved conditions rather than taken from the nearest one.
     """
 
     def __init__(
@@ -884,6 +1283,8 @@ class ApproxFlorisModel(UncertainFlorisModel):
         power_setpoint_resolution=100,  # kW
         awc_amplitude_resolution=0.1,  # Deg
         verbose=False,
+        interpolation="nearest",
+        condition_cache_size=0,
     ):
         super().__init__(
             configuration,
@@ -897,6 +1298,8 @@ class ApproxFlorisModel(UncertainFlorisModel):
             wd_sample_points=[0],
             fix_yaw_to_nominal_direction=False,
             verbose=verbose,
+            interpolation=interpolation,
+            condition_cache_size=condition_cache_size,
         )
 
         self.wd_resolution = wd_resolution
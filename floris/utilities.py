@@ -131,6 +131,8 @@ def rotate_coordinates_rel_west(
         wind_directions (NDArrayFloat): Series of wind directions to base the rotation.
         coordinates (NDArrayFloat): Series of coordinates to rotate with shape (N coordinates, 3)
             so that each element of the array coordinates[i] yields a three-component coordinate.
+            Coordinates with shape (n_findex, N coordinates, 3) are rotated separately for each
+            wind direction about the center of their own row.
         x_center_of_rotation (float, optional): The x-coordinate for the rotation center of the
             input coordinates. Defaults to None.
         y_center_of_rotation (float, optional): The y-coordinate for the rotational center of the
@@ -142,13 +144,22 @@ def rotate_coordinates_rel_west(
     wind_deviation_from_west = np.reshape(wind_deviation_from_west, (len(wind_directions), 1))
 
     # Construct the arrays storing the turbine locations
-    x_coordinates, y_coordinates, z_coordinates = coordinates.T
+    x_coordinates, y_coordinates, z_coordinates = np.moveaxis(coordinates, -1, 0)
 
     # Find center of rotation - this is the center of box bounding all of the turbines
+    # For per-findex coordinates, each findex is rotated about the center of its own layout
+    axis = None if coordinates.ndim < 3 else (-1,)
+    keepdims = coordinates.ndim == 3
     if x_center_of_rotation is None:
-        x_center_of_rotation = (np.min(x_coordinates) + np.max(x_coordinates)) / 2
+        x_center_of_rotation = (
+            np.min(x_coordinates, axis=axis, keepdims=keepdims)
+            + np.max(x_coordinates, axis=axis, keepdims=keepdims)
+        ) / 2
     if y_center_of_rotation is None:
-        y_center_of_rotation = (np.min(y_coordinates) + np.max(y_coordinates)) / 2
+        y_center_of_rotation = (
+            np.min(y_coordinates, axis=axis, keepdims=keepdims)
+            + np.max(y_coordinates, axis=axis, keepdims=keepdims)
+        ) / 2
 
     # Rotate turbine coordinates about the center
     x_coord_offset = x_coordinates - x_center_of_rotation
@@ -186,9 +197,9 @@ def reverse_rotate_coordinates_rel_west(
         grid_y (NDArrayFloat): Y-coordinates to be rotated.
         grid_z (NDArrayFloat): Z-coordinates to be rotated.
         x_center_of_rotation (float): The x-coordinate for the rotation center of the
-            input coordinates.
+            input coordinates, or an array with one center per wind direction.
         y_center_of_rotation (float): The y-coordinate for the rotational center of the
-            input coordinates.
+            input coordinates, or an array with one center per wind direction.
     """
     # Calculate the difference in given wind direction from 270 / West
     # We are rotating in the other direction
@@ -203,18 +214,25 @@ def reverse_rotate_coordinates_rel_west(
         y_rot = grid_y[wii]
         z_rot = grid_z[wii]
 
+        # Per-findex layouts carry one center of rotation for each wind direction
+        x_center = x_center_of_rotation
+        y_center = y_center_of_rotation
+        if np.ndim(x_center) > 0:
+            x_center = x_center[wii]
+            y_center = y_center[wii]
+
         # Rotate turbine coordinates about the center
-        x_rot_offset = x_rot - x_center_of_rotation
-        y_rot_offset = y_rot - y_center_of_rotation
+        x_rot_offset = x_rot - x_center
+        y_rot_offset = y_rot - y_center
         x = (
             x_rot_offset * cosd(angle_rotation)
             - y_rot_offset * sind(angle_rotation)
-            + x_center_of_rotation
+            + x_center
         )
         y = (
             x_rot_offset * sind(angle_rotation)
             + y_rot_offset * cosd(angle_rotation)
-            + y_center_of_rotation
+            + y_center
         )
         z = z_rot  # Nothing changed in this rotation
 
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import inspect
+import json
+import zipfile
 from abc import abstractmethod
+from numbers import Real
 from pathlib import Path
 
-import matplotlib.cm as cm
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from pandas.api.types import CategoricalDtype
-from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator
 
+from floris import __version__
 from floris.type_dec import NDArrayFloat
 
 
@@ -141,31 +141,275 @@ class WindDataBase:
                 "Within the heterogeneous_inflow_config_by_wd dictionary"
             )
 
-        # Calculate closest wind direction indices (accounting for angles)
-        angle_diffs = np.abs(wind_directions[:, None] - het_wd)
-        min_angle_diffs = np.minimum(angle_diffs, 360 - angle_diffs)
-        closest_wd_indices = np.argmin(min_angle_diffs, axis=1)
+        # Construct the output array using the closest wind direction indices
+        return speed_multipliers[self._get_closest_wd_indices(het_wd, wind_directions)]
 
-        # Construct the output array using the calculated indices
-        return speed_multipliers[closest_wd_indices]
+    @staticmethod
+    def _get_closest_wd_indices(het_wd, wind_directions):
+        """
+        Find the index of the closest of a set of wind directions to each of the given wind
+        directions, accounting for the periodicity of wind direction. Ties go to the lower
+        index. Only the two configured directions on either side of each wind direction are
+        compared, so memory and time scale with the number of wind directions rather than with
+        its product with the number of configured directions.
+
+        Args:
+            het_wd (NDArrayFloat): The configured wind directions (degrees).
+            wind_directions (NDArrayFloat): The wind directions to match (degrees).
+
+        Returns:
+            NDArrayInt: The index into het_wd of the closest configured wind direction for
+                each wind direction.
+        """
+        het_wd = np.asarray(het_wd, dtype=float)
+        wind_directions = np.asarray(wind_directions, dtype=float)
+
+        # Distinct configured directions in increasing order, each with the index of its first
+        # occurrence, and the neighbors on either side of each wind direction around the circle
+        sorted_wd, first_index = np.unique(het_wd, return_index=True)
+        upper = np.searchsorted(sorted_wd, wind_directions) % len(sorted_wd)
+        lower = (upper - 1) % len(sorted_wd)
+
+        def angle_diff(neighbor):
+            diff = np.abs(wind_directions - sorted_wd[neighbor])
+            return np.minimum(diff, 360 - diff)
+
+        lower_diff = angle_diff(lower)
+        upper_diff = angle_diff(upper)
+        lower_index = first_index[lower]
+        upper_index = first_index[upper]
+        use_lower = (lower_diff < upper_diff) | (
+            (lower_diff == upper_diff) & (lower_index < upper_index)
+        )
+        return np.where(use_lower, lower_index, upper_index)
 
     def get_heterogeneous_inflow_config(self, heterogeneous_inflow_config_by_wd, wind_directions):
+        """
+        Build the heterogeneous_inflow_config for the given wind directions from a
+        heterogeneous_inflow_config_by_wd. The speed multipliers are given by reference: the
+        rows of the configuration by wind direction are kept as they are and
+        'speed_multiplier_indices' gives the row of the closest configured wind direction for
+        each findex, so the size of the result does not grow with the number of findices.
+
+        Args:
+            heterogeneous_inflow_config_by_wd (dict | None): The heterogeneous inflow
+                configuration by wind direction. See get_speed_multipliers_by_wd.
+            wind_directions (NDArrayFloat): Wind directions of each findex (degrees).
+
+        Returns:
+            dict | None: The heterogeneous_inflow_config with keys 'speed_multipliers',
+                'speed_multiplier_indices', 'x' and 'y', or None if
+                heterogeneous_inflow_config_by_wd is None.
+        """
         # If heterogeneous_inflow_config_by_wd is None, return None
         if heterogeneous_inflow_config_by_wd is None:
             return None
 
-        # If heterogeneous_inflow_config_by_wd is not None, then process it
-        # Build the n-findex version of the het map
-        speed_multipliers = self.get_speed_multipliers_by_wd(
-            heterogeneous_inflow_config_by_wd, wind_directions
-        )
+        speed_multipliers = np.array(heterogeneous_inflow_config_by_wd["speed_multipliers"])
+        het_wd = np.array(heterogeneous_inflow_config_by_wd["wind_directions"])
+        if len(het_wd) != speed_multipliers.shape[0]:
+            raise ValueError(
+                "The legnth of het_wd must equal the number of rows speed_multipliers"
+                "Within the heterogeneous_inflow_config_by_wd dictionary"
+            )
+
         # Return heterogeneous_inflow_config
         return {
             "speed_multipliers": speed_multipliers,
+            "speed_multiplier_indices": self._get_closest_wd_indices(het_wd, wind_directions),
             "x": heterogeneous_inflow_config_by_wd["x"],
             "y": heterogeneous_inflow_config_by_wd["y"],
         }
 
+    @staticmethod
+    def _interpolate_regular_grid(axes, tables, new_axes, method="linear"):
+        """
+        Interpolate tables defined on a regular (tensor-product) grid of wind directions and
+        other variables onto a new regular grid. The interpolation is applied one axis at a
+        time to all tables together, which for linear interpolation is equivalent to
+        multilinear interpolation. The wind direction axis, which must be the first axis, is
+        treated as periodic with a period of 360 degrees. Axes with a single entry are held
+        constant.
+
+        Args:
+            axes (list[NDArrayFloat]): Increasing grid coordinates along each axis of the
+                tables, starting with the wind directions.
+            tables (list[NDArrayFloat]): Tables to interpolate, each with shape given by the
+                lengths of axes.
+            new_axes (list[NDArrayFloat]): Increasing grid coordinates to interpolate onto.
+            method (str, optional): Interpolation method, either 'linear' or 'nearest'.
+                Linear interpolation returns NaN outside of the range of the grid.
+                Defaults to "linear".
+
+        Returns:
+            list[NDArrayFloat]: The interpolated tables, each with shape given by the lengths
+                of new_axes.
+        """
+        if method not in ("linear", "nearest"):
+            raise ValueError(
+                f"Unknown interpolation method: '{method}'. "
+                "Available methods are 'linear' and 'nearest'"
+            )
+
+        values = np.stack([np.asarray(table, dtype=float) for table in tables], axis=-1)
+        axes = [np.asarray(axis, dtype=float) for axis in axes]
+        new_axes = [np.asarray(new_axis, dtype=float) for new_axis in new_axes]
+
+        # Close the wind direction axis by repeating the first wind direction 360 degrees
+        # later, and map the new wind directions into the closed range
+        wind_directions = axes[0]
+        if len(wind_directions) > 1 and wind_directions[-1] < wind_directions[0] + 360.0:
+            axes[0] = np.append(wind_directions, wind_directions[0] + 360.0)
+            values = np.concatenate((values, values[:1]), axis=0)
+            new_axes[0] = wind_directions[0] + np.mod(new_axes[0] - wind_directions[0], 360.0)
+
+        has_nan = np.isnan(values).any()
+        for dim, (axis, new_axis) in enumerate(zip(axes, new_axes)):
+            if len(axis) == 1:
+                values = np.repeat(values, len(new_axis), axis=dim)
+
+            elif method == "linear":
+                # Tolerate round off in the new grid at the ends of the axis
+                tol = 1e-9 * (axis[-1] - axis[0])
+                idx = np.clip(np.searchsorted(axis, new_axis, side="right") - 1, 0, len(axis) - 2)
+                weight = np.clip((new_axis - axis[idx]) / (axis[idx + 1] - axis[idx]), 0.0, 1.0)
+                lower = np.take(values, idx, axis=dim)
+                upper = np.take(values, idx + 1, axis=dim)
+                values = upper - lower
+                values *= weight.reshape([-1 if d == dim else 1 for d in range(values.ndim)])
+                values += lower
+
+                # Points that coincide with a grid point take its entry directly so that
+                # NaN entries do not spread to their neighbors
+                leading = (slice(None),) * dim
+                if has_nan:
+                    values[leading + (weight == 0.0,)] = lower[leading + (weight == 0.0,)]
+                    values[leading + (weight == 1.0,)] = upper[leading + (weight == 1.0,)]
+                outside = (new_axis < axis[0] - tol) | (new_axis > axis[-1] + tol)
+                values[leading + (outside,)] = np.nan
+
+            else:
+                idx = np.clip(np.searchsorted(axis, new_axis), 1, len(axis) - 1)
+                idx = idx - ((new_axis - axis[idx - 1]) <= (axis[idx] - new_axis))
+                values = np.take(values, idx, axis=dim)
+
+        return [values[..., i] for i in range(len(tables))]
+
+    # Attributes written by to_file, set by each subclass. Columns are 1D arrays with one
+    # entry per findex (or per bin of a wind rose) and metadata are the remaining arrays and
+    # scalars. Tables are restored on reading by reshaping the given column to the lengths of
+    # the grid axes.
+    _FILE_COLUMNS: tuple = ()
+    _FILE_METADATA: tuple = ()
+    _FILE_TABLES: dict = {}
+    _FILE_GRID_AXES: tuple = ()
+    _FILE_HETEROGENEOUS_CONFIGS: tuple = ()
+
+    def to_file(self, file_path: str | Path):
+        """
+        Write the wind data to a binary file that from_file reads back without parsing or
+        rebuilding any arrays. The format is determined by the file extension: NumPy .npz
+        (uncompressed, so that from_file can memory map it) or Parquet (.parquet or .pq),
+        which requires pyarrow. The per-findex (or per-bin) arrays are stored as columns, and
+        the remaining arrays, including any heterogeneous inflow configuration, are stored as
+        JSON metadata.
+
+        Args:
+            file_path (str | Path): Path of the file to write.
+        """
+        columns = {
+            name: np.asarray(getattr(self, name))
+            for name in self._FILE_COLUMNS
+            if getattr(self, name) is not None
+        }
+        metadata = {"class": type(self).__name__, "floris_version": __version__}
+        for name in self._FILE_METADATA:
+            metadata[name] = np.asarray(getattr(self, name)).tolist()
+        for name in self._FILE_HETEROGENEOUS_CONFIGS:
+            config = getattr(self, name)
+            if config is not None:
+                metadata[name] = {key: np.asarray(value).tolist() for key, value in config.items()}
+
+        suffix = Path(file_path).suffix.lower()
+        if suffix == ".npz":
+            np.savez(file_path, floris_metadata=json.dumps(metadata), **columns)
+        elif suffix in (".parquet", ".pq"):
+            pa, pq = _import_pyarrow()
+            table = pa.table(columns).replace_schema_metadata(
+                {"floris_metadata": json.dumps(metadata)}
+            )
+            pq.write_table(table, file_path)
+        else:
+            raise ValueError(
+                f"Unsupported wind data file type '{suffix}'. "
+                "Supported types are .npz and .parquet."
+            )
+
+    @classmethod
+    def from_file(cls, file_path: str | Path, mmap: bool = False):
+        """
+        Read wind data written by to_file. The gridded and flattened arrays of wind roses are
+        read from the file rather than rebuilt.
+
+        Args:
+            file_path (str | Path): Path of the file to read.
+            mmap (bool, optional): If True, the per-findex (or per-bin) arrays are copy-on-write
+                memory maps of the file rather than being read into memory, so long time
+                series can be opened without loading them. Parquet files are memory mapped by
+                pyarrow, which avoids copies when each column is stored in a single chunk.
+                Defaults to False.
+
+        Returns:
+            WindRose | WindTIRose | TimeSeries: The wind data. If called on WindDataBase,
+                the class stored in the file is returned. Otherwise the stored class must
+                match.
+        """
+        suffix = Path(file_path).suffix.lower()
+        if suffix == ".npz":
+            with np.load(file_path) as data:
+                metadata = json.loads(str(data["floris_metadata"]))
+                names = [name for name in data.files if name != "floris_metadata"]
+                if mmap:
+                    columns = {name: _memmap_npz_member(file_path, name) for name in names}
+                else:
+                    columns = {name: data[name] for name in names}
+        elif suffix in (".parquet", ".pq"):
+            _, pq = _import_pyarrow()
+            table = pq.read_table(file_path, memory_map=mmap)
+            metadata = json.loads(table.schema.metadata[b"floris_metadata"])
+            columns = {name: table.column(name).to_numpy() for name in table.column_names}
+        else:
+            raise ValueError(
+                f"Unsupported wind data file type '{suffix}'. "
+                "Supported types are .npz and .parquet."
+            )
+
+        wind_data_classes = {c.__name__: c for c in WindDataBase.__subclasses__()}
+        wind_data_class = wind_data_classes[metadata["class"]]
+        if cls is not WindDataBase and wind_data_class is not cls:
+            raise ValueError(
+                f"{file_path} contains a {wind_data_class.__name__}, not a {cls.__name__}."
+            )
+
+        # Set the attributes directly rather than through __init__ so that nothing is rebuilt
+        wind_data = wind_data_class.__new__(wind_data_class)
+        for name in wind_data_class._FILE_COLUMNS:
+            setattr(wind_data, name, columns.get(name))
+        for name in wind_data_class._FILE_METADATA:
+            value = metadata[name]
+            setattr(wind_data, name, np.array(value) if isinstance(value, list) else value)
+        for name in wind_data_class._FILE_HETEROGENEOUS_CONFIGS:
+            config = metadata.get(name)
+            if config is not None:
+                config = {key: np.array(value) for key, value in config.items()}
+            setattr(wind_data, name, config)
+        grid_shape = tuple(len(getattr(wind_data, axis)) for axis in wind_data._FILE_GRID_AXES)
+        for name, column in wind_data_class._FILE_TABLES.items():
+            flat = getattr(wind_data, column)
+            setattr(wind_data, name, None if flat is None else flat.reshape(grid_shape))
+
+        return wind_data
+
 
 class WindRose(WindDataBase):
     """
@@ -203,6 +447,25 @@ class WindRose(WindDataBase):
 
     """
 
+    _FILE_COLUMNS = (
+        "wd_flat",
+        "ws_flat",
+        "ti_table_flat",
+        "freq_table_flat",
+        "value_table_flat",
+        "non_zero_freq_mask",
+    )
+    _FILE_METADATA = ("wind_directions", "wind_speeds", "compute_zero_freq_occurrence", "n_findex")
+    _FILE_TABLES = {
+        "wd_grid": "wd_flat",
+        "ws_grid": "ws_flat",
+        "ti_table": "ti_table_flat",
+        "freq_table": "freq_table_flat",
+        "value_table": "value_table_flat",
+    }
+    _FILE_GRID_AXES = ("wind_directions", "wind_speeds")
+    _FILE_HETEROGENEOUS_CONFIGS = ("heterogeneous_inflow_config_by_wd",)
+
     def __init__(
         self,
         wind_directions: NDArrayFloat,
@@ -471,16 +734,6 @@ class WindRose(WindDataBase):
                 sizes. Only returned if inplace = False.
 
         """
-        if method == "linear":
-            interpolator = LinearNDInterpolator
-        elif method == "nearest":
-            interpolator = NearestNDInterpolator
-        else:
-            raise ValueError(
-                f"Unknown interpolation method: '{method}'. "
-                "Available methods are 'linear' and 'nearest'"
-            )
-
         # If either ws_step or wd_step is None, set it to the current step
         if ws_step is None:
             if len(self.wind_speeds) >= 2:
@@ -501,89 +754,18 @@ class WindRose(WindDataBase):
             self.wind_speeds[0], self.wind_speeds[-1] + ws_step / 2.0, ws_step
         )
 
-        # Set up for interpolation
-        wind_direction_column = self.wind_directions.copy()
-        wind_speed_column = self.wind_speeds.copy()
-        ti_matrix = self.ti_table.copy()
-        freq_matrix = self.freq_table.copy()
-        if self.value_table is not None:
-            value_matrix = self.value_table.copy()
-        else:
-            value_matrix = None
-
-        # If the first entry of wind_direction column is 0, and the last entry is not 360, then
-        # pad 360 to the end of the wind direction column and the last row of the ti_matrix and
-        # freq_matrix by copying the 0 entry
-        if len(wind_direction_column) > 1:
-            if wind_direction_column[0] == 0 and wind_direction_column[-1] != 360:
-                wind_direction_column = np.append(wind_direction_column, 360)
-                ti_matrix = np.vstack((ti_matrix, ti_matrix[0, :]))
-                freq_matrix = np.vstack((freq_matrix, freq_matrix[0, :]))
-                if self.value_table is not None:
-                    value_matrix = np.vstack((value_matrix, value_matrix[0, :]))
-
-        # If the wind_direction columns has length 1, then pad the wind_direction column with
-        # that value + and - 1 and expand the matrices accordingly
-        # (this avoids interpolation errors)
-        if len(wind_direction_column) == 1:
-            wind_direction_column = np.array(
-                [
-                    wind_direction_column[0] - 1,
-                    wind_direction_column[0],
-                    wind_direction_column[0] + 1,
-                ]
-            )
-            ti_matrix = np.vstack((ti_matrix, ti_matrix[0, :], ti_matrix[0, :]))
-            freq_matrix = np.vstack((freq_matrix, freq_matrix[0, :], freq_matrix[0, :]))
-            if self.value_table is not None:
-                value_matrix = np.vstack((value_matrix, value_matrix[0, :], value_matrix[0, :]))
-
-        # If the wind_speed column has length 1, then pad the wind_speed column with
-        # that value + and - 1
-        # and expand the matrices accordingly (this avoids interpolation errors)
-        if len(wind_speed_column) == 1:
-            wind_speed_column = np.array(
-                [wind_speed_column[0] - 1, wind_speed_column[0], wind_speed_column[0] + 1]
-            )
-            ti_matrix = np.hstack((ti_matrix, ti_matrix[:, 0][:, None], ti_matrix[:, 0][:, None]))
-            freq_matrix = np.hstack(
-                (freq_matrix, freq_matrix[:, 0][:, None], freq_matrix[:, 0][:, None])
-            )
-            if self.value_table is not None:
-                value_matrix = np.hstack(
-                    (value_matrix, value_matrix[:, 0][:, None], value_matrix[:, 0][:, None])
-                )
-
-        # Grid wind directions and wind speeds to match the ti_matrix and freq_matrix when flattened
-        wd_grid, ws_grid = np.meshgrid(wind_direction_column, wind_speed_column, indexing="ij")
-
-        # Form wd_grid and ws_grid to a 2-column matrix
-        wd_ws_mat = np.array([wd_grid.flatten(), ws_grid.flatten()]).T
-
-        # Build the interpolator from wd_grid, ws_grid, to ti_matrix, freq_matrix and value_matrix
-        ti_interpolator = interpolator(wd_ws_mat, ti_matrix.flatten())
-        freq_interpolator = interpolator(wd_ws_mat, freq_matrix.flatten())
+        # Interpolate the TI, frequency and value tables onto the new grid together
+        tables = [self.ti_table, self.freq_table]
         if self.value_table is not None:
-            value_interpolator = interpolator(wd_ws_mat, value_matrix.flatten())
-
-        # Grid the new wind directions and wind speeds
-        new_wd_grid, new_ws_grid = np.meshgrid(new_wind_directions, new_wind_speeds, indexing="ij")
-        new_wd_ws_mat = np.array([new_wd_grid.flatten(), new_ws_grid.flatten()]).T
-
-        # Create the new ti_matrix and freq_matrix
-        new_ti_matrix = ti_interpolator(new_wd_ws_mat).reshape(
-            (len(new_wind_directions), len(new_wind_speeds))
-        )
-        new_freq_matrix = freq_interpolator(new_wd_ws_mat).reshape(
-            (len(new_wind_directions), len(new_wind_speeds))
+            tables.append(self.value_table)
+        new_tables = self._interpolate_regular_grid(
+            [self.wind_directions, self.wind_speeds],
+            tables,
+            [new_wind_directions, new_wind_speeds],
+            method=method,
         )
-
-        if self.value_table is not None:
-            new_value_matrix = value_interpolator(new_wd_ws_mat).reshape(
-                (len(new_wind_directions), len(new_wind_speeds))
-            )
-        else:
-            new_value_matrix = None
+        new_ti_matrix, new_freq_matrix = new_tables[:2]
+        new_value_matrix = new_tables[2] if self.value_table is not None else None
 
         # Create the resampled wind rose
         resampled_wind_rose = WindRose(
@@ -647,6 +829,9 @@ class WindRose(WindDataBase):
         ws_bins = wind_rose_aggregate.wind_speeds
         freq_table = wind_rose_aggregate.freq_table
 
+        import matplotlib.cm as cm
+        import matplotlib.pyplot as plt
+
         # Set up figure
         if ax is None:
             _, ax = plt.subplots(subplot_kw={"polar": True})
@@ -746,6 +931,8 @@ class WindRose(WindDataBase):
         # TODO: Plot mean and std. devs. of TI in each ws bin in addition to
         # individual points
 
+        import matplotlib.pyplot as plt
+
         # Set up figure
         if ax is None:
             _, ax = plt.subplots()
@@ -850,6 +1037,8 @@ class WindRose(WindDataBase):
         # TODO: Plot mean and std. devs. of value in each ws bin in addition to
         # individual points
 
+        import matplotlib.pyplot as plt
+
         # Set up figure
         if ax is None:
             _, ax = plt.subplots()
@@ -986,6 +1175,31 @@ class WindTIRose(WindDataBase):
 
     """
 
+    _FILE_COLUMNS = (
+        "wd_flat",
+        "ws_flat",
+        "ti_flat",
+        "freq_table_flat",
+        "value_table_flat",
+        "non_zero_freq_mask",
+    )
+    _FILE_METADATA = (
+        "wind_directions",
+        "wind_speeds",
+        "turbulence_intensities",
+        "compute_zero_freq_occurrence",
+        "n_findex",
+    )
+    _FILE_TABLES = {
+        "wd_grid": "wd_flat",
+        "ws_grid": "ws_flat",
+        "ti_grid": "ti_flat",
+        "freq_table": "freq_table_flat",
+        "value_table": "value_table_flat",
+    }
+    _FILE_GRID_AXES = ("wind_directions", "wind_speeds", "turbulence_intensities")
+    _FILE_HETEROGENEOUS_CONFIGS = ("heterogeneous_inflow_config_by_wd",)
+
     def __init__(
         self,
         wind_directions: NDArrayFloat,
@@ -1263,16 +1477,6 @@ class WindTIRose(WindDataBase):
                 sizes. Only returned if inplace = False.
 
         """
-        if method == "linear":
-            interpolator = LinearNDInterpolator
-        elif method == "nearest":
-            interpolator = NearestNDInterpolator
-        else:
-            raise ValueError(
-                f"Unknown interpolation method: '{method}'. "
-                "Available methods are 'linear' and 'nearest'"
-            )
-
         # If either ws_step or wd_step is None, set it to the current step
         if ws_step is None:
             if len(self.wind_speeds) >= 2:
@@ -1301,132 +1505,18 @@ class WindTIRose(WindDataBase):
             self.turbulence_intensities[0], self.turbulence_intensities[-1] + ti_step / 2.0, ti_step
         )
 
-        # Set up for interpolation
-        wind_direction_column = self.wind_directions.copy()
-        wind_speed_column = self.wind_speeds.copy()
-        turbulence_intensity_column = self.turbulence_intensities.copy()
-        freq_matrix = self.freq_table.copy()
+        # Interpolate the frequency and value tables onto the new grid together
+        tables = [self.freq_table]
         if self.value_table is not None:
-            value_matrix = self.value_table.copy()
-        else:
-            value_matrix = None
-
-        # If the first entry of wind_direction column is 0, and the last entry is not 360, then
-        # pad 360 to the end of the wind direction column and the last row of the ti_matrix and
-        # freq_matrix by copying the 0 entry
-        if len(wind_direction_column) > 1:
-            if wind_direction_column[0] == 0 and wind_direction_column[-1] != 360:
-                wind_direction_column = np.append(wind_direction_column, 360)
-                freq_matrix = np.concatenate(
-                    (freq_matrix, freq_matrix[0, :, :][None, :, :]), axis=0
-                )
-                if self.value_table is not None:
-                    value_matrix = np.concatenate((value_matrix, value_matrix[0, :, :][None, :, :]))
-
-        # If the wind_direction columns has length 1, then pad the wind_direction column with
-        # that value + and - 1 and expand the matrices accordingly
-        # (this avoids interpolation errors)
-        if len(wind_direction_column) == 1:
-            wind_direction_column = np.array(
-                [
-                    wind_direction_column[0] - 1,
-                    wind_direction_column[0],
-                    wind_direction_column[0] + 1,
-                ]
-            )
-            freq_matrix = np.concatenate(
-                (freq_matrix, freq_matrix[0, :, :][None, :, :], freq_matrix[0, :, :][None, :, :]),
-                axis=0,
-            )
-            if self.value_table is not None:
-                value_matrix = np.concatenate(
-                    (
-                        value_matrix,
-                        value_matrix[0, :, :][None, :, :],
-                        value_matrix[0, :, :][None, :, :],
-                    ),
-                    axis=0,
-                )
-
-        # If the wind_speed column has length 1, then pad the wind_speed column with
-        # that value + and - 1
-        # and expand the matrices accordingly (this avoids interpolation errors)
-        if len(wind_speed_column) == 1:
-            wind_speed_column = np.array(
-                [wind_speed_column[0] - 1, wind_speed_column[0], wind_speed_column[0] + 1]
-            )
-            freq_matrix = np.concatenate(
-                (freq_matrix, freq_matrix[:, 0, :][:, None, :], freq_matrix[:, 0, :][:, None, :]),
-                axis=1,
-            )
-            if self.value_table is not None:
-                value_matrix = np.concatenate(
-                    (
-                        value_matrix,
-                        value_matrix[:, 0, :][:, None, :],
-                        value_matrix[:, 0, :][:, None, :],
-                    ),
-                    axis=1,
-                )
-
-        # If the turbulence_intensity column has length 1, then
-        # pad the turbulence_intensity column with
-        # that value + and - 1
-        # and expand the matrices accordingly (this avoids interpolation errors)
-        if len(turbulence_intensity_column) == 1:
-            turbulence_intensity_column = np.array(
-                [
-                    turbulence_intensity_column[0] - 1,
-                    turbulence_intensity_column[0],
-                    turbulence_intensity_column[0] + 1,
-                ]
-            )
-            freq_matrix = np.concatenate(
-                (freq_matrix, freq_matrix[:, :, 0][:, :, None], freq_matrix[:, :, 0][:, :, None]),
-                axis=2,
-            )
-            if self.value_table is not None:
-                value_matrix = np.concatenate(
-                    (
-                        value_matrix,
-                        value_matrix[:, :, 0][:, :, None],
-                        value_matrix[:, :, 0][:, :, None],
-                    ),
-                    axis=2,
-                )
-
-        # Grid wind directions and wind speeds to match the ti_matrix and freq_matrix when flattened
-        wd_grid, ws_grid, ti_grid = np.meshgrid(
-            wind_direction_column, wind_speed_column, turbulence_intensity_column, indexing="ij"
+            tables.append(self.value_table)
+        new_tables = self._interpolate_regular_grid(
+            [self.wind_directions, self.wind_speeds, self.turbulence_intensities],
+            tables,
+            [new_wind_directions, new_wind_speeds, new_turbulence_intensities],
+            method=method,
         )
-
-        # Form wd_grid and ws_grid to a 2-column matrix
-        wd_ws_ti_mat = np.array([wd_grid.flatten(), ws_grid.flatten(), ti_grid.flatten()]).T
-
-        # Build the interpolator from wd_grid, ws_grid, to ti_matrix, freq_matrix and value_matrix
-        freq_interpolator = interpolator(wd_ws_ti_mat, freq_matrix.flatten())
-        if self.value_table is not None:
-            value_interpolator = interpolator(wd_ws_ti_mat, value_matrix.flatten())
-
-        # Grid the new wind directions and wind speeds
-        new_wd_grid, new_ws_grid, new_ti_grid = np.meshgrid(
-            new_wind_directions, new_wind_speeds, new_turbulence_intensities, indexing="ij"
-        )
-        new_wd_ws_ti_mat = np.array(
-            [new_wd_grid.flatten(), new_ws_grid.flatten(), new_ti_grid.flatten()]
-        ).T
-
-        # Create the new freq_matrix and value_matrix
-        new_freq_matrix = freq_interpolator(new_wd_ws_ti_mat).reshape(
-            (len(new_wind_directions), len(new_wind_speeds), len(new_turbulence_intensities))
-        )
-
-        if self.value_table is not None:
-            new_value_matrix = value_interpolator(new_wd_ws_ti_mat).reshape(
-                (len(new_wind_directions), len(new_wind_speeds), len(new_turbulence_intensities))
-            )
-        else:
-            new_value_matrix = None
+        new_freq_matrix = new_tables[0]
+        new_value_matrix = new_tables[1] if self.value_table is not None else None
 
         # Create the resampled wind rose
         resampled_wind_rose = WindTIRose(
@@ -1514,6 +1604,9 @@ class WindTIRose(WindDataBase):
 
         wd_bins = wind_rose_aggregated.wind_directions
 
+        import matplotlib.cm as cm
+        import matplotlib.pyplot as plt
+
         # Set up figure
         if ax is None:
             _, ax = plt.subplots(subplot_kw={"polar": True})
@@ -1571,6 +1664,8 @@ class WindTIRose(WindDataBase):
         # TODO: Plot individual points and std. devs. of TI in addition to mean
         # values
 
+        import matplotlib.pyplot as plt
+
         # Set up figure
         if ax is None:
             _, ax = plt.subplots()
@@ -1680,6 +1775,8 @@ class WindTIRose(WindDataBase):
         # TODO: Plot mean and std. devs. of value in each ws bin in addition to
         # individual points
 
+        import matplotlib.pyplot as plt
+
         # Set up figure
         if ax is None:
             _, ax = plt.subplots()
@@ -1801,8 +1898,18 @@ class TimeSeries(WindDataBase):
                     of speed multipliers.
             * 'x': A 1D NumPy array (size num_points) of x-coordinates (meters).
             * 'y': A 1D NumPy array (size num_points) of y-coordinates (meters).
+            * 'speed_multiplier_indices' (optional): A 1D NumPy array (size n_findex) of
+                    the row of 'speed_multipliers' to use for each findex. If given,
+                    'speed_multipliers' only needs the distinct rows.
     """
 
+    _FILE_COLUMNS = ("wind_directions", "wind_speeds", "turbulence_intensities", "values")
+    _FILE_METADATA = ("n_findex",)
+    _FILE_HETEROGENEOUS_CONFIGS = (
+        "heterogeneous_inflow_config_by_wd",
+        "heterogeneous_inflow_config",
+    )
+
     def __init__(
         self,
         wind_directions: float | NDArrayFloat,
@@ -1891,9 +1998,17 @@ class TimeSeries(WindDataBase):
 
         # if heterogeneous_inflow_config is not None, then the speed_multipliers
         # must be the same length as wind_directions
-        # in the 0th dimension
+        # in the 0th dimension, unless they are given by reference through
+        # speed_multiplier_indices, which must then be the same length
         if heterogeneous_inflow_config is not None:
-            if len(heterogeneous_inflow_config["speed_multipliers"]) != len(wind_directions):
+            if "speed_multiplier_indices" in heterogeneous_inflow_config:
+                if len(heterogeneous_inflow_config["speed_multiplier_indices"]) != len(
+                    wind_directions
+                ):
+                    raise ValueError(
+                        "speed_multiplier_indices must be the same length as wind_directions"
+                    )
+            elif len(heterogeneous_inflow_config["speed_multipliers"]) != len(wind_directions):
                 raise ValueError("speed_multipliers must be the same length as wind_directions")
 
         # Check that heterogeneous_inflow_config_by_wd is a dictionary with keys:
@@ -1935,6 +2050,44 @@ class TimeSeries(WindDataBase):
             heterogeneous_inflow_config,
         )
 
+    def iter_chunks(self, chunk_size: int):
+        """
+        Split the time series into consecutive TimeSeries objects of at most chunk_size
+        entries. The chunks are views into the arrays of this object.
+
+        Args:
+            chunk_size (int): Maximum number of entries in each chunk.
+
+        Yields:
+            TimeSeries: The next chunk of the time series.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        for start in range(0, self.n_findex, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            if self.heterogeneous_inflow_config is not None:
+                # Speed multipliers given by reference keep all rows and slice the indices
+                sliced_key = (
+                    "speed_multiplier_indices"
+                    if "speed_multiplier_indices" in self.heterogeneous_inflow_config
+                    else "speed_multipliers"
+                )
+                heterogeneous_inflow_config = {
+                    **self.heterogeneous_inflow_config,
+                    sliced_key: self.heterogeneous_inflow_config[sliced_key][chunk],
+                }
+            else:
+                heterogeneous_inflow_config = None
+            yield TimeSeries(
+                wind_directions=self.wind_directions[chunk],
+                wind_speeds=self.wind_speeds[chunk],
+                turbulence_intensities=self.turbulence_intensities[chunk],
+                values=None if self.values is None else self.values[chunk],
+                heterogeneous_inflow_config_by_wd=self.heterogeneous_inflow_config_by_wd,
+                heterogeneous_inflow_config=heterogeneous_inflow_config,
+            )
+
     def _wrap_wind_directions_near_360(self, wind_directions, wd_step):
         """
         Wraps the wind directions using `wd_step` to produce a wrapped version
@@ -1954,6 +2107,78 @@ class TimeSeries(WindDataBase):
         wind_directions_wrapped[mask] = wind_directions_wrapped[mask] - 360.0
         return wind_directions_wrapped
 
+    @staticmethod
+    def _bin_indices(x, edges):
+        """
+        Find the bin of each element of x for the bins [edges[i], edges[i + 1]). For
+        regularly spaced edges the index is computed arithmetically and then corrected
+        against the edges themselves, so the result is identical to a search of the edges.
+
+        Args:
+            x (NDArrayFloat): NumPy array of values to bin.
+            edges (NDArrayFloat): Monotonically increasing bin edges.
+
+        Returns:
+            NDArrayInt: Bin index of each element of x, or -1 for values outside of the
+                edges or NaN values.
+        """
+        n_bins = len(edges) - 1
+        if n_bins < 1:
+            return np.full(np.shape(x), -1)
+        step = edges[1] - edges[0]
+        if np.allclose(np.diff(edges), step, rtol=1e-9, atol=0.0):
+            with np.errstate(invalid="ignore"):
+                idx = np.floor((x - edges[0]) / step)
+            idx = np.clip(np.nan_to_num(idx, nan=0.0), 0, n_bins - 1).astype(int)
+            idx[x < edges[idx]] -= 1
+            idx[x >= edges[idx + 1]] += 1
+        else:
+            idx = np.searchsorted(edges, x, side="right") - 1
+
+        idx[(idx < 0) | (idx >= n_bins) | np.isnan(x)] = -1
+        return idx
+
+    @staticmethod
+    def _bin_tables(bin_indices, freq_val, mean_fields):
+        """
+        Compute the sum of freq_val and the mean of each of mean_fields over the bins of a
+        multidimensional table using np.bincount. Samples with a bin index of -1 in any
+        dimension are dropped and NaN entries are ignored, matching pandas groupby.
+
+        Args:
+            bin_indices (list[tuple[NDArrayInt, int]]): For each dimension of the table, the
+                bin index of each sample and the number of bins.
+            freq_val (NDArrayFloat): Frequency weight of each sample.
+            mean_fields (list[NDArrayFloat]): Arrays to average within each bin.
+
+        Returns:
+            tuple[NDArrayFloat, list[NDArrayFloat]]: The binned frequency sums and means,
+                each with shape given by the numbers of bins. Empty bins have a mean of NaN.
+        """
+        shape = tuple(n_bins for _, n_bins in bin_indices)
+        valid = np.all([idx >= 0 for idx, _ in bin_indices], axis=0)
+        flat_index = np.ravel_multi_index(
+            tuple(np.where(valid, idx, 0) for idx, _ in bin_indices), shape
+        )
+        n_total = int(np.prod(shape))
+
+        freq_val = np.nan_to_num(freq_val, nan=0.0)
+        freq_sum = np.bincount(
+            flat_index[valid], weights=freq_val[valid], minlength=n_total
+        ).reshape(shape)
+
+        means = []
+        for field in mean_fields:
+            field_valid = valid & ~np.isnan(field)
+            count = np.bincount(flat_index[field_valid], minlength=n_total)
+            total = np.bincount(
+                flat_index[field_valid], weights=field[field_valid], minlength=n_total
+            )
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means.append((total / count).reshape(shape))
+
+        return freq_sum, means
+
     def assign_ti_using_wd_ws_function(self, func):
         """
         Use the passed in function to new assign values to turbulence_intensities
@@ -2121,71 +2346,27 @@ class TimeSeries(WindDataBase):
         # Define the centers from the edges
         ws_centers = ws_edges[:-1] + ws_step / 2.0
 
-        # Now use pandas to get the tables need for wind rose
-        df = pd.DataFrame(
-            {
-                "wd": wind_directions_wrapped,
-                "ws": self.wind_speeds,
-                "freq_val": np.ones(len(wind_directions_wrapped)),
-            }
-        )
-
-        # If bin_weights are passed in, apply these to the frequency
-        # this is mostly used when resampling the wind rose
+        # Weight each sample by the bin weights, if any. These are mostly used when
+        # resampling the wind rose
+        freq_val = np.ones(len(wind_directions_wrapped))
         if bin_weights is not None:
-            df = df.assign(freq_val=df["freq_val"] * bin_weights)
+            freq_val = freq_val * bin_weights
 
-        # Add turbulence intensities to dataframe
-        df = df.assign(turbulence_intensities=self.turbulence_intensities)
-
-        # If values is not none, add to dataframe
+        # Bin wind direction and wind speed and accumulate the tables
+        mean_fields = [np.asarray(self.turbulence_intensities, dtype=float)]
         if self.values is not None:
-            df = df.assign(values=self.values)
-
-        # Bin wind speed and wind direction and then group things up
-        df = (
-            df.assign(
-                wd_bin=pd.cut(
-                    df.wd, bins=wd_edges, labels=wd_centers, right=False, include_lowest=True
-                )
-            )
-            .assign(
-                ws_bin=pd.cut(
-                    df.ws, bins=ws_edges, labels=ws_centers, right=False, include_lowest=True
-                )
-            )
-            .drop(["wd", "ws"], axis=1)
+            mean_fields.append(np.asarray(self.values, dtype=float))
+        freq_table, mean_tables = self._bin_tables(
+            [
+                (self._bin_indices(wind_directions_wrapped, wd_edges), len(wd_centers)),
+                (self._bin_indices(self.wind_speeds, ws_edges), len(ws_centers)),
+            ],
+            freq_val,
+            mean_fields,
         )
-
-        # Convert wd_bin and ws_bin to categoricals to ensure all combinations
-        # are considered and then group
-        wd_cat = CategoricalDtype(categories=wd_centers, ordered=True)
-        ws_cat = CategoricalDtype(categories=ws_centers, ordered=True)
-
-        df = (
-            df.assign(wd_bin=df["wd_bin"].astype(wd_cat))
-            .assign(ws_bin=df["ws_bin"].astype(ws_cat))
-            .groupby(["wd_bin", "ws_bin"], observed=False)
-            .agg(["sum", "mean"])
-        )
-        # Flatten and combine levels using an underscore
-        df.columns = ["_".join(col) for col in df.columns]
-
-        # Collect the frequency table and reshape
-        freq_table = df["freq_val_sum"].values.copy()
         freq_table = freq_table / freq_table.sum()
-        freq_table = freq_table.reshape((len(wd_centers), len(ws_centers)))
-
-        # Compute the TI table
-        ti_table = df["turbulence_intensities_mean"].values.copy()
-        ti_table = ti_table.reshape((len(wd_centers), len(ws_centers)))
-
-        # If values is not none, compute the table
-        if self.values is not None:
-            value_table = df["values_mean"].values.copy()
-            value_table = value_table.reshape((len(wd_centers), len(ws_centers)))
-        else:
-            value_table = None
+        ti_table = mean_tables[0]
+        value_table = mean_tables[1] if self.values is not None else None
 
         # Return a WindRose
         return WindRose(
@@ -2287,72 +2468,27 @@ class TimeSeries(WindDataBase):
         # Define the centers from the edges
         ti_centers = ti_edges[:-1] + ti_step / 2.0
 
-        # Now use pandas to get the tables need for wind rose
-        df = pd.DataFrame(
-            {
-                "wd": wind_directions_wrapped,
-                "ws": self.wind_speeds,
-                "ti": self.turbulence_intensities,
-                "freq_val": np.ones(len(wind_directions_wrapped)),
-            }
-        )
-
-        # If bin_weights are passed in, apply these to the frequency
-        # this is mostly used when resampling the wind rose
+        # Weight each sample by the bin weights, if any. These are mostly used when
+        # resampling the wind rose
+        freq_val = np.ones(len(wind_directions_wrapped))
         if bin_weights is not None:
-            df = df.assign(freq_val=df["freq_val"] * bin_weights)
+            freq_val = freq_val * bin_weights
 
-        # If values is not none, add to dataframe
+        # Bin wind direction, wind speed, and turbulence intensity and accumulate the tables
+        mean_fields = []
         if self.values is not None:
-            df = df.assign(values=self.values)
-
-        # Bin wind speed, wind direction, and turbulence intensity and then group things up
-        df = (
-            df.assign(
-                wd_bin=pd.cut(
-                    df.wd, bins=wd_edges, labels=wd_centers, right=False, include_lowest=True
-                )
-            )
-            .assign(
-                ws_bin=pd.cut(
-                    df.ws, bins=ws_edges, labels=ws_centers, right=False, include_lowest=True
-                )
-            )
-            .assign(
-                ti_bin=pd.cut(
-                    df.ti, bins=ti_edges, labels=ti_centers, right=False, include_lowest=True
-                )
-            )
-            .drop(["wd", "ws", "ti"], axis=1)
+            mean_fields.append(np.asarray(self.values, dtype=float))
+        freq_table, mean_tables = self._bin_tables(
+            [
+                (self._bin_indices(wind_directions_wrapped, wd_edges), len(wd_centers)),
+                (self._bin_indices(self.wind_speeds, ws_edges), len(ws_centers)),
+                (self._bin_indices(self.turbulence_intensities, ti_edges), len(ti_centers)),
+            ],
+            freq_val,
+            mean_fields,
         )
-
-        # Convert wd_bin, ws_bin, and ti_bin to categoricals to ensure all
-        # combinations are considered and then group
-        wd_cat = CategoricalDtype(categories=wd_centers, ordered=True)
-        ws_cat = CategoricalDtype(categories=ws_centers, ordered=True)
-        ti_cat = CategoricalDtype(categories=ti_centers, ordered=True)
-
-        df = (
-            df.assign(wd_bin=df["wd_bin"].astype(wd_cat))
-            .assign(ws_bin=df["ws_bin"].astype(ws_cat))
-            .assign(ti_bin=df["ti_bin"].astype(ti_cat))
-            .groupby(["wd_bin", "ws_bin", "ti_bin"], observed=False)
-            .agg(["sum", "mean"])
-        )
-        # Flatten and combine levels using an underscore
-        df.columns = ["_".join(col) for col in df.columns]
-
-        # Collect the frequency table and reshape
-        freq_table = df["freq_val_sum"].values.copy()
         freq_table = freq_table / freq_table.sum()
-        freq_table = freq_table.reshape((len(wd_centers), len(ws_centers), len(ti_centers)))
-
-        # If values is not none, compute the table
-        if self.values is not None:
-            value_table = df["values_mean"].values.copy()
-            value_table = value_table.reshape((len(wd_centers), len(ws_centers), len(ti_centers)))
-        else:
-            value_table = None
+        value_table = mean_tables[0] if self.values is not None else None
 
         # Return a WindTIRose
         return WindTIRose(
@@ -2363,3 +2499,174 @@ class TimeSeries(WindDataBase):
             value_table,
             self.heterogeneous_inflow_config_by_wd,
         )
+
+    @staticmethod
+    def read_chunks(
+        file_path: str | Path,
+        chunk_size: int = 100000,
+        ws_col: str = "wind_speeds",
+        wd_col: str = "wind_directions",
+        ti_col_or_value: str | float = "turbulence_intensities",
+        value_col: str | None = None,
+        sep: str = ",",
+        heterogeneous_inflow_config_by_wd: dict | None = None,
+    ):
+        """
+        Read a time series from a CSV, NPY or Parquet file in chunks so that time series
+        too long to hold in memory can be processed one piece at a time, for example by
+        FlorisModel.get_farm_AEP_streaming. The file format is determined by the file
+        extension.
+
+        CSV and Parquet files are read by column name. NPY files are opened as a memory
+        map and may contain either a structured array, read by field name, or a 2D array
+        whose columns are, in order, the wind directions, wind speeds, turbulence
+        intensities (if ti_col_or_value is a string) and values (if value_col is given).
+        Reading Parquet files requires pyarrow.
+
+        Args:
+            file_path (str | Path): Path to the time series file.
+            chunk_size (int): Maximum number of entries in each chunk. Defaults to 100000.
+            ws_col (str): Name of the column that contains the wind speed values.
+                Defaults to 'wind_speeds'.
+            wd_col (str): Name of the column that contains the wind direction values.
+                Defaults to 'wind_directions'.
+            ti_col_or_value (str or float): Name of the column that contains the
+                turbulence intensity values, or a constant turbulence intensity value of
+                any real number type. Defaults to 'turbulence_intensities'.
+            value_col (str, optional): Name of the column that contains the values of
+                power generated. Defaults to None, in which case no values are assigned.
+            sep (str): Delimiter to use for CSV files. Defaults to ','.
+            heterogeneous_inflow_config_by_wd (dict, optional): Heterogeneous inflow
+                configuration applied to every chunk. Defaults to None.
+
+        Yields:
+            TimeSeries: The next chunk of the time series.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        if not isinstance(ti_col_or_value, (str, Real)):
+            raise TypeError("ti_col_or_value must be a string or a real number")
+
+        columns = [wd_col, ws_col]
+        if isinstance(ti_col_or_value, str):
+            columns.append(ti_col_or_value)
+        if value_col is not None:
+            columns.append(value_col)
+
+        suffix = Path(file_path).suffix.lower()
+        if suffix == ".csv":
+            chunks = (
+                {col: chunk[col].to_numpy(dtype=float) for col in columns}
+                for chunk in pd.read_csv(
+                    file_path, sep=sep, usecols=columns, chunksize=chunk_size
+                )
+            )
+        elif suffix == ".npy":
+            data = np.load(file_path, mmap_mode="r")
+            if data.dtype.names is not None:
+                missing = [col for col in columns if col not in data.dtype.names]
+                if missing:
+                    raise ValueError(f"Column {missing[0]} not found in {file_path}")
+                chunks = (
+                    {
+                        col: np.array(data[col][start:start + chunk_size], dtype=float)
+                        for col in columns
+                    }
+                    for start in range(0, len(data), chunk_size)
+                )
+            else:
+                if data.ndim != 2 or data.shape[1] != len(columns):
+                    raise ValueError(
+                        f"{file_path} must contain a structured array or a 2D array with "
+                        f"{len(columns)} columns ({', '.join(columns)})"
+                    )
+                chunks = (
+                    dict(zip(columns, np.array(data[start:start + chunk_size], dtype=float).T))
+                    for start in range(0, len(data), chunk_size)
+                )
+        elif suffix in (".parquet", ".pq"):
+            _, pq = _import_pyarrow()
+            chunks = (
+                {col: batch.column(col).to_numpy().astype(float) for col in columns}
+                for batch in pq.ParquetFile(file_path).iter_batches(
+                    batch_size=chunk_size, columns=columns
+                )
+            )
+        else:
+            raise ValueError(
+                f"Unsupported time series file type '{suffix}'. "
+                "Supported types are .csv, .npy and .parquet."
+            )
+
+        for chunk in chunks:
+            if len(chunk[wd_col]) == 0:
+                continue
+            yield TimeSeries(
+                wind_directions=chunk[wd_col],
+                wind_speeds=chunk[ws_col],
+                turbulence_intensities=(
+                    chunk[ti_col_or_value]
+                    if isinstance(ti_col_or_value, str)
+                    else float(ti_col_or_value)
+                ),
+                values=None if value_col is None else chunk[value_col],
+                heterogeneous_inflow_config_by_wd=heterogeneous_inflow_config_by_wd,
+            )
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, which is only required for reading and writing Parquet files.
+
+    Returns:
+        tuple: The pyarrow and pyarrow.parquet modules.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Reading and writing Parquet files requires pyarrow. "
+            "Install it with `pip install pyarrow`."
+        ) from e
+    return pa, pq
+
+
+def _memmap_npz_member(file_path: str | Path, name: str):
+    """
+    Memory map an array stored uncompressed in a .npz file, as written by np.savez.
+
+    Args:
+        file_path (str | Path): Path of the .npz file.
+        name (str): Name of the array.
+
+    Returns:
+        np.memmap: A copy-on-write memory map of the array.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        info = archive.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} is compressed in {file_path} and cannot be memory mapped.")
+
+    with open(file_path, "rb") as f:
+        # The .npy data follows the 30 byte local file header, the file name and extra field
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2")
+        f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if len(shape) == 0 or np.prod(shape) == 0:
+        return np.load(file_path)[name]
+    return np.memmap(
+        file_path,
+        dtype=dtype,
+        mode="c",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
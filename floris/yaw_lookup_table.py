@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from time import perf_counter as timerpc
+
+import numpy as np
+
+from floris import __version__
+from floris.farm_power_table import FarmPowerTable
+from floris.floris_model import FlorisModel
+from floris.type_dec import NDArrayFloat
+from floris.wind_data import WindDataBase
+
+
+def _optimize_shard(shard):
+    """
+    Optimize the yaw angles of one shard of the lattice with the Serial Refine method and
+    compute the turbine powers at the optimal yaw angles. If the shard has a checkpoint file,
+    the results are written to it before they are returned.
+
+    Args:
+        shard (dict): The model as a dictionary, the indices and wind conditions of the
+            lattice points in the shard, the options of the optimizer and the checkpoint file.
+
+    Returns:
+        dict: The shard results, as stored in its checkpoint file.
+    """
+    from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
+
+    fmodel = FlorisModel(shard["fmodel"])
+    fmodel.set(
+        wind_directions=shard["wind_directions"],
+        wind_speeds=shard["wind_speeds"],
+        turbulence_intensities=shard["turbulence_intensities"],
+    )
+    yaw_opt = YawOptimizationSR(fmodel, **shard["optimizer_options"])
+    df_opt = yaw_opt.optimize(print_progress=False)
+
+    yaw_angles = np.vstack(df_opt["yaw_angles_opt"])
+    fmodel.set(yaw_angles=yaw_angles)
+    fmodel.run()
+
+    results = {
+        "indices": shard["indices"],
+        "wind_directions": shard["wind_directions"],
+        "wind_speeds": shard["wind_speeds"],
+        "turbulence_intensities": shard["turbulence_intensities"],
+        "layout_x": np.asarray(fmodel.layout_x),
+        "layout_y": np.asarray(fmodel.layout_y),
+        "yaw_angles": yaw_angles,
+        "turbine_powers": fmodel.get_turbine_powers(),
+    }
+
+    if shard["filename"] is not None:
+        # Write to a temporary file first, so that an interrupted write leaves no shard behind
+        filename = Path(shard["filename"])
+        tmp_filename = filename.with_name(filename.name + ".tmp.npz")
+        np.savez(tmp_filename, floris_version=__version__, **results)
+        os.replace(tmp_filename, filename)
+
+    return results
+
+
+class YawLookupTable(FarmPowerTable):
+    """
+    A lookup table of the optimal yaw angles of a wind farm on a lattice of wind directions,
+    wind speeds and turbulence intensities, together with the turbine powers at those yaw
+    angles. The yaw angles are interpolated to arbitrary conditions like the turbine powers
+    of a :py:class:`~.farm_power_table.FarmPowerTable`, and the power and AEP methods of the
+    latter give the wake steering power production.
+
+    Args:
+        wind_directions (NDArrayFloat): Increasing wind directions of the lattice, in degrees,
+            spanning less than 360 degrees.
+        wind_speeds (NDArrayFloat): Increasing wind speeds of the lattice, in m/s.
+        turbulence_intensities (NDArrayFloat): Increasing turbulence intensities of the
+            lattice.
+        yaw_angles (NDArrayFloat): Optimal yaw angles at each point of the lattice, in
+            degrees, of shape (n_wind_directions, n_wind_speeds, n_turbulence_intensities,
+            n_turbines).
+        turbine_powers (NDArrayFloat): Turbine powers at the optimal yaw angles at each point
+            of the lattice, in W, of the same shape as yaw_angles.
+    """
+
+    def __init__(
+        self,
+        wind_directions: NDArrayFloat,
+        wind_speeds: NDArrayFloat,
+        turbulence_intensities: NDArrayFloat,
+        yaw_angles: NDArrayFloat,
+        turbine_powers: NDArrayFloat,
+    ):
+        super().__init__(wind_directions, wind_speeds, turbulence_intensities, turbine_powers)
+
+        self.yaw_angles = np.asarray(yaw_angles, dtype=float)
+        if self.yaw_angles.shape != self.turbine_powers.shape:
+            raise ValueError(
+                f"yaw_angles must have shape {self.turbine_powers.shape}, "
+                f"not {self.yaw_angles.shape}."
+            )
+
+    @classmethod
+    def from_floris_model(
+        cls,
+        fmodel: FlorisModel,
+        wind_directions: NDArrayFloat,
+        wind_speeds: NDArrayFloat,
+        turbulence_intensities: NDArrayFloat,
+        checkpoint_dir: str | Path | None = None,
+        n_shards: int | None = None,
+        max_workers: int | None = None,
+        interface: str = "multiprocessing",
+        print_progress: bool = False,
+        **optimizer_options,
+    ):
+        """
+        Build the table by optimizing the yaw angles at every point of the lattice with
+        :py:class:`~.yaw_optimizer_sr.YawOptimizationSR`.
+
+        The lattice is split into shards that are optimized one at a time or by parallel
+        workers. With a checkpoint directory, the results of each shard are written to their
+        own .npz file as soon as the shard is done, and shards that already have a file are
+        loaded rather than optimized again, so an interrupted build resumes where it stopped.
+
+        Args:
+            fmodel (FlorisModel): The model to optimize. It is copied, so its layout, turbine,
+                wake and solver settings are used.
+            wind_directions (NDArrayFloat): Increasing wind directions of the lattice.
+            wind_speeds (NDArrayFloat): Increasing wind speeds of the lattice.
+            turbulence_intensities (NDArrayFloat): Increasing turbulence intensities of the
+                lattice.
+            checkpoint_dir (str | Path, optional): Directory of the shard files. It is created
+                if it does not exist. Defaults to None, which keeps all results in memory.
+            n_shards (int, optional): Number of shards. Every shard holds consecutive wind
+                directions of the lattice. Defaults to None, which makes one shard for each
+                combination of wind speed and turbulence intensity.
+            max_workers (int, optional): If provided, the shards are optimized by this many
+                parallel workers. Defaults to None, which optimizes them in the current
+                process.
+            interface (str, optional): Parallel computing interface, either
+                "multiprocessing", "concurrent" or "mpi4py". Defaults to "multiprocessing".
+            print_progress (bool, optional): If True, a line is printed for every finished
+                shard. Defaults to False.
+            **optimizer_options: Keyword arguments passed to YawOptimizationSR, such as
+                minimum_yaw_angle, maximum_yaw_angle, Ny_passes or warm_start.
+
+        Returns:
+            YawLookupTable: The table of the model.
+        """
+        wind_directions = np.asarray(wind_directions, dtype=float)
+        wind_speeds = np.asarray(wind_speeds, dtype=float)
+        turbulence_intensities = np.asarray(turbulence_intensities, dtype=float)
+        wd_grid, ws_grid, ti_grid = np.meshgrid(
+            wind_directions, wind_speeds, turbulence_intensities, indexing="ij"
+        )
+
+        # Order the lattice points with the wind direction varying fastest, so that each shard
+        # holds rows of neighboring wind directions
+        lattice_indices = np.arange(wd_grid.size).reshape(wd_grid.shape)
+        lattice_indices = lattice_indices.transpose(2, 1, 0).flatten()
+        if n_shards is None:
+            n_shards = len(wind_speeds) * len(turbulence_intensities)
+        shard_indices = np.array_split(lattice_indices, min(n_shards, len(lattice_indices)))
+
+        if checkpoint_dir is not None:
+            checkpoint_dir = Path(checkpoint_dir)
+            checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        fmodel_dict = fmodel.core.as_dict()
+        n_turbines = fmodel.core.farm.n_turbines
+        yaw_angles = np.zeros((wd_grid.size, n_turbines))
+        turbine_powers = np.zeros((wd_grid.size, n_turbines))
+
+        def store(results):
+            yaw_angles[results["indices"]] = results["yaw_angles"]
+            turbine_powers[results["indices"]] = results["turbine_powers"]
+
+        shards = []
+        n_loaded = 0
+        for k, indices in enumerate(shard_indices):
+            shard = {
+                "fmodel": fmodel_dict,
+                "indices": indices,
+                "wind_directions": wd_grid.flat[indices],
+                "wind_speeds": ws_grid.flat[indices],
+                "turbulence_intensities": ti_grid.flat[indices],
+                "optimizer_options": optimizer_options,
+                "filename": None,
+            }
+            if checkpoint_dir is not None:
+                shard["filename"] = checkpoint_dir / f"shard_{k:05d}.npz"
+                if shard["filename"].exists():
+                    store(cls._load_shard(shard, fmodel))
+                    n_loaded += 1
+                    continue
+            shards.append(shard)
+
+        if print_progress and n_loaded > 0:
+            print(f"Loaded {n_loaded}/{len(shard_indices)} shards from {checkpoint_dir}.")
+
+        t0 = timerpc()
+        for n_done, results in enumerate(
+            cls._optimize_shards(shards, max_workers, interface), start=n_loaded + 1
+        ):
+            store(results)
+            if print_progress:
+                print(
+                    f"Optimized shard {n_done}/{len(shard_indices)} "
+                    f"({timerpc() - t0:.1f} s elapsed)."
+                )
+
+        shape = wd_grid.shape + (n_turbines,)
+        return cls(
+            wind_directions,
+            wind_speeds,
+            turbulence_intensities,
+            yaw_angles.reshape(shape),
+            turbine_powers.reshape(shape),
+        )
+
+    @staticmethod
+    def _optimize_shards(shards, max_workers, interface):
+        """
+        Optimize shards in the current process or with a pool of parallel workers, and
+        yield the results of each shard as soon as it is done.
+
+        Args:
+            shards (list[dict]): The shards to optimize.
+            max_workers (int | None): Number of parallel workers, or None to optimize the
+                shards in the current process.
+            interface (str): Parallel computing interface.
+
+        Yields:
+            dict: The results of each shard, in the order in which they finish.
+        """
+        if max_workers is None or len(shards) == 0:
+            for shard in shards:
+                yield _optimize_shard(shard)
+            return
+
+        if interface == "multiprocessing":
+            import multiprocessing as mp
+
+            with mp.Pool(max_workers) as pool:
+                yield from pool.imap_unordered(_optimize_shard, shards)
+            return
+
+        if interface == "mpi4py":
+            import mpi4py.futures as mp
+            PoolExecutor = mp.MPIPoolExecutor
+        elif interface == "concurrent":
+            from concurrent.futures import ProcessPoolExecutor as PoolExecutor
+        else:
+            raise ValueError(
+                f"Interface '{interface}' not recognized. "
+                "Please use 'concurrent', 'multiprocessing' or 'mpi4py'."
+            )
+
+        from concurrent.futures import as_completed
+
+        with PoolExecutor(max_workers) as executor:
+            futures = [executor.submit(_optimize_shard, shard) for shard in shards]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def _load_shard(shard, fmodel):
+        """
+        Load the results of a shard from its checkpoint file, after verifying that the file
+        was written for the same lattice points and layout.
+
+        Args:
+            shard (dict): The shard, with its lattice indices, wind conditions and file.
+            fmodel (FlorisModel): The model that the table is built for.
+
+        Returns:
+            dict: The shard results.
+        """
+        with np.load(shard["filename"]) as data:
+            results = {key: data[key] for key in data.files}
+
+        matches = (
+            np.array_equal(results["indices"], shard["indices"])
+            and all(
+                np.allclose(results[key], shard[key])
+                for key in ["wind_directions", "wind_speeds", "turbulence_intensities"]
+            )
+            and np.allclose(results["layout_x"], fmodel.layout_x)
+            and np.allclose(results["layout_y"], fmodel.layout_y)
+        )
+        if not matches:
+            raise ValueError(
+                f"The checkpoint {shard['filename']} was written for different wind "
+                "conditions or a different layout. Use an empty checkpoint directory for a "
+                "new table."
+            )
+        return results
+
+    def to_file(self, filename: str | Path):
+        """
+        Write the table to a NumPy .npz file.
+
+        Args:
+            filename (str | Path): Path of the file to write.
+        """
+        np.savez(
+            filename,
+            wind_directions=self.wind_directions,
+            wind_speeds=self.wind_speeds,
+            turbulence_intensities=self.turbulence_intensities,
+            yaw_angles=self.yaw_angles,
+            turbine_powers=self.turbine_powers,
+            floris_version=__version__,
+        )
+
+    @classmethod
+    def from_file(cls, filename: str | Path):
+        """
+        Read a table written by to_file.
+
+        Args:
+            filename (str | Path): Path of the file to read.
+
+        Returns:
+            YawLookupTable: The table in the file.
+        """
+        with np.load(filename) as data:
+            return cls(
+                data["wind_directions"],
+                data["wind_speeds"],
+                data["turbulence_intensities"],
+                data["yaw_angles"],
+                data["turbine_powers"],
+            )
+
+    def get_yaw_angles(self, wind_data: WindDataBase):
+        """
+        Interpolate the optimal yaw angles to the conditions of a wind data object.
+
+        Args:
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+
+        Returns:
+            NDArrayFloat: The yaw angles of shape (n_conditions, n_turbines), where the
+                conditions are in the order of wind_data.unpack(). Conditions outside of the
+                lattice give NaN, including wind directions outside of a partial sector.
+        """
+        wind_directions, wind_speeds, turbulence_intensities, _ = self._unpack_wind_data(
+            wind_data
+        )
+        return self._interpolate(
+            self.yaw_angles, wind_directions, wind_speeds, turbulence_intensities
+        )
+
+    def _get_direct_turbine_powers(self, fmodel, wind_data: WindDataBase):
+        """
+        Solve a model directly for the conditions of a wind data object, with the yaw angles
+        interpolated from the table.
+
+        Args:
+            fmodel (FlorisModel): The model to solve. It is copied.
+            wind_data (TimeSeries | WindRose | WindTIRose): The wind data.
+
+        Returns:
+            NDArrayFloat: The turbine powers of shape (n_conditions, n_turbines).
+        """
+        wind_directions, wind_speeds, turbulence_intensities, _ = self._unpack_wind_data(
+            wind_data
+        )
+        fmodel = fmodel.copy()
+        fmodel.set(
+            wind_directions=wind_directions,
+            wind_speeds=wind_speeds,
+            turbulence_intensities=turbulence_intensities,
+            yaw_angles=self.get_yaw_angles(wind_data),
+        )
+        fmodel.run()
+        return fmodel.get_turbine_powers()
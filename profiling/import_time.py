@@ -0,0 +1,57 @@
+
+import statistics
+import subprocess
+import sys
+
+
+# Modules that should not be loaded by a bare `import floris`
+DEFERRED_MODULES = ["matplotlib", "shapely", "floris.flow_visualization"]
+
+
+def time_import(statement="import floris", n_repeats=10):
+    """
+    Time an import statement in a fresh interpreter so that module caching in the current
+    process does not affect the measurement.
+
+    Args:
+        statement (str): The import statement to time.
+        n_repeats (int): Number of fresh interpreters to launch.
+
+    Returns:
+        list: Wall clock times in seconds for each repeat.
+    """
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    times = []
+    for _ in range(n_repeats):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+        times.append(float(out.stdout.decode().strip()))
+    return times
+
+
+def loaded_deferred_modules(statement="import floris"):
+    """
+    Return the modules in DEFERRED_MODULES that are present in sys.modules after running
+    the given import statement in a fresh interpreter.
+    """
+    code = (
+        "import sys\n"
+        f"{statement}\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+    return [m for m in out.stdout.decode().strip().split(",") if m]
+
+
+if __name__ == "__main__":
+    for statement in ("import floris", "from floris import FlorisModel, WindRose"):
+        times = time_import(statement)
+        print(
+            f"{statement:45s} median {1000 * statistics.median(times):7.1f} ms, "
+            f"min {1000 * min(times):7.1f} ms"
+        )
+        print(f"    deferred modules loaded: {loaded_deferred_modules(statement)}")
@@ -0,0 +1,70 @@
+
+import time
+
+import numpy as np
+
+from floris import UncertainFlorisModel
+
+
+N_TURBINES = 100
+N_FINDEX = 100_000
+WD_SAMPLE_POINTS = [-6, -3, 0, 3, 6]
+
+
+def make_inputs(n_turbines=N_TURBINES, n_findex=N_FINDEX, seed=0):
+    """
+    Build an array of rounded inputs in the layout used by UncertainFlorisModel: wind
+    direction, wind speed, turbulence intensity, then yaw angles, power setpoints and AWC
+    amplitudes for each turbine.
+
+    Args:
+        n_turbines (int): Number of turbines.
+        n_findex (int): Number of findices.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        np.ndarray: Array of shape (n_findex, 3 + 3 * n_turbines).
+    """
+    rng = np.random.default_rng(seed)
+    inputs = np.zeros((n_findex, 3 + 3 * n_turbines))
+    inputs[:, 0] = rng.integers(0, 360, n_findex)
+    inputs[:, 1] = rng.integers(4, 26, n_findex)
+    inputs[:, 2] = 0.06
+    inputs[:, 3 + n_turbines:3 + 2 * n_turbines] = 1e12
+    return inputs
+
+
+def time_call(func, *args):
+    """
+    Return the wall clock time in seconds of a single call and the result of the call.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    ufmodel = UncertainFlorisModel(
+        "../examples/inputs/gch.yaml",
+        wd_sample_points=WD_SAMPLE_POINTS,
+    )
+    inputs = make_inputs()
+
+    t_expand, expanded_inputs = time_call(
+        ufmodel._expand_wind_directions, inputs, WD_SAMPLE_POINTS
+    )
+    del inputs
+    print(
+        f"expand {N_FINDEX} x {N_TURBINES} turbines to {expanded_inputs.shape}: "
+        f"{t_expand:.2f} s"
+    )
+
+    t_new, (unique_inputs, map_new) = time_call(ufmodel._get_unique_inputs, expanded_inputs)
+    print(f"hash-based unique inputs ({len(unique_inputs)} rows): {t_new:.2f} s")
+    del unique_inputs
+
+    t_old, (unique_old, map_old) = time_call(
+        lambda x: np.unique(x, axis=0, return_inverse=True), expanded_inputs
+    )
+    print(f"np.unique(axis=0) ({len(unique_old)} rows): {t_old:.2f} s")
+    print(f"speedup: {t_old / t_new:.1f}x")
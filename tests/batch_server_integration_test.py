@@ -0,0 +1,109 @@
+import asyncio
+import json
+from pathlib import Path
+
+import numpy as np
+
+from floris import FlorisModel
+from floris.batch_server import FlorisBatchServer, query_unix_socket
+
+
+TEST_DATA = Path(__file__).resolve().parent / "data"
+YAML_INPUT = TEST_DATA / "input_full.yaml"
+
+
+def _get_fmodel():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(layout_x=[0, 0, 600], layout_y=[0, 1000, 0])
+    return fmodel
+
+
+def _expected_powers(fmodel, wind_directions, wind_speeds, yaw_angles=None):
+    fmodel = fmodel.copy()
+    fmodel.set(
+        wind_directions=wind_directions,
+        wind_speeds=wind_speeds,
+        turbulence_intensities=0.06 * np.ones_like(wind_speeds),
+        yaw_angles=yaw_angles,
+    )
+    fmodel.run()
+    return fmodel.get_turbine_powers()
+
+
+def test_submit_coalesces_requests():
+    fmodel = _get_fmodel()
+    rng = np.random.default_rng(0)
+    wind_directions = rng.uniform(0.0, 360.0, size=(20, 2))
+    wind_speeds = rng.uniform(4.0, 12.0, size=(20, 2))
+    yaw_angles = np.zeros((20, 2, 3))
+    yaw_angles[::2, :, 0] = 20.0
+
+    async def run():
+        async with FlorisBatchServer(fmodel, batch_window=0.05) as server:
+            results = await asyncio.gather(
+                *[
+                    server.submit(
+                        wind_directions[i],
+                        wind_speeds[i],
+                        [0.06, 0.06],
+                        yaw_angles=yaw_angles[i] if i % 2 == 0 else None,
+                    )
+                    for i in range(20)
+                ]
+            )
+        return server, results
+
+    server, results = asyncio.run(run())
+    assert server.n_requests == 20
+    assert server.n_batches < 20
+
+    expected = _expected_powers(
+        fmodel,
+        wind_directions.flatten(),
+        wind_speeds.flatten(),
+        yaw_angles.reshape(40, 3),
+    )
+    np.testing.assert_allclose(np.concatenate(results), expected)
+
+
+def test_socket_and_http(tmp_path):
+    fmodel = _get_fmodel()
+    request = {
+        "wind_directions": [270.0, 280.0],
+        "wind_speeds": [8.0, 9.0],
+        "turbulence_intensities": [0.06, 0.06],
+    }
+    expected = _expected_powers(fmodel, [270.0, 280.0], [8.0, 9.0])
+
+    async def http_post(port, body):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"POST / HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def run():
+        async with FlorisBatchServer(fmodel) as server:
+            socket_path = tmp_path / "floris.sock"
+            await server.serve_unix(socket_path)
+            port = await server.serve_http()
+
+            socket_response = await asyncio.to_thread(query_unix_socket, socket_path, request)
+            bad_response = await asyncio.to_thread(
+                query_unix_socket, socket_path, {"wind_directions": [270.0]}
+            )
+            http_response = await http_post(port, json.dumps(request).encode())
+        return socket_response, bad_response, http_response
+
+    socket_response, bad_response, http_response = asyncio.run(run())
+
+    np.testing.assert_allclose(socket_response["turbine_powers"], expected)
+    np.testing.assert_allclose(socket_response["farm_power"], expected.sum(axis=1))
+    assert "error" in bad_response
+
+    assert http_response.startswith(b"HTTP/1.1 200 OK")
+    http_body = json.loads(http_response.split(b"\r\n\r\n", 1)[1])
+    np.testing.assert_allclose(http_body["turbine_powers"], expected)
@@ -0,0 +1,150 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from floris import (
+    FarmPowerTable,
+    FlorisModel,
+    TimeSeries,
+)
+
+
+TEST_DATA = Path(__file__).resolve().parent / "data"
+YAML_INPUT = TEST_DATA / "input_full.yaml"
+
+
+def _get_fmodel():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(layout_x=[0, 500, 0], layout_y=[0, 0, 600])
+    return fmodel
+
+
+def _get_table(fmodel):
+    return FarmPowerTable.from_floris_model(
+        fmodel,
+        wind_directions=np.arange(0.0, 360.0, 5.0),
+        wind_speeds=np.arange(4.0, 13.0, 1.0),
+        turbulence_intensities=[0.04, 0.08],
+    )
+
+
+def _direct_turbine_powers(fmodel, wind_directions, wind_speeds, turbulence_intensities):
+    fmodel = fmodel.copy()
+    fmodel.set(
+        wind_directions=wind_directions,
+        wind_speeds=wind_speeds,
+        turbulence_intensities=turbulence_intensities,
+    )
+    fmodel.run()
+    return fmodel.get_turbine_powers()
+
+
+def test_farm_power_table_lattice():
+    fmodel = _get_fmodel()
+    table = _get_table(fmodel)
+    assert table.turbine_powers.shape == (72, 9, 2, 3)
+    assert table.n_turbines == 3
+
+    # The lattice points are reproduced exactly, including the wrap through 0 degrees
+    wind_directions = np.array([0.0, 270.0, 355.0, 360.0])
+    wind_speeds = np.array([8.0, 4.0, 12.0, 9.0])
+    turbulence_intensities = np.array([0.04, 0.08, 0.04, 0.08])
+    time_series = TimeSeries(wind_directions, wind_speeds, turbulence_intensities)
+    np.testing.assert_allclose(
+        table.get_turbine_powers(time_series),
+        _direct_turbine_powers(fmodel, wind_directions, wind_speeds, turbulence_intensities),
+    )
+
+    # Between 355 and 360 degrees the powers blend the two neighboring lattice points
+    time_series = TimeSeries(np.array([357.0]), np.array([8.0]), np.array([0.04]))
+    np.testing.assert_allclose(
+        table.get_turbine_powers(time_series),
+        [0.6 * table.turbine_powers[71, 4, 0] + 0.4 * table.turbine_powers[0, 4, 0]],
+    )
+
+    # Wind speeds outside of the lattice give NaN
+    time_series = TimeSeries(np.array([270.0, 270.0]), np.array([8.0, 15.0]), 0.06)
+    farm_power = table.get_farm_power(time_series)
+    assert np.isfinite(farm_power[0])
+    assert np.isnan(farm_power[1])
+
+    # A partial sector of wind directions is not wrapped through 360 degrees
+    sector_table = FarmPowerTable(
+        table.wind_directions[50:59],
+        table.wind_speeds,
+        table.turbulence_intensities,
+        table.turbine_powers[50:59],
+    )
+    time_series = TimeSeries(np.array([252.0, 290.0, 330.0, 359.0, 245.0]), 8.0, 0.04)
+    farm_power = sector_table.get_farm_power(time_series)
+    np.testing.assert_allclose(farm_power[:2], table.get_farm_power(time_series)[:2])
+    assert np.all(np.isnan(farm_power[2:]))
+
+    # An axis with a single entry only covers that value
+    single_ti_table = FarmPowerTable(
+        table.wind_directions,
+        table.wind_speeds,
+        table.turbulence_intensities[:1],
+        table.turbine_powers[:, :, :1],
+    )
+    time_series = TimeSeries(np.array([270.0, 270.0]), 8.0, np.array([0.04, 0.08]))
+    farm_power = single_ti_table.get_farm_power(time_series)
+    np.testing.assert_allclose(farm_power[0], table.get_farm_power(time_series)[0])
+    assert np.isnan(farm_power[1])
+
+    with pytest.raises(ValueError):
+        FarmPowerTable([0.0, 360.0], [8.0], [0.06], np.zeros((2, 1, 1, 3)))
+    with pytest.raises(ValueError):
+        FarmPowerTable([0.0, 90.0], [8.0], [0.06], np.zeros((3, 1, 1, 3)))
+
+
+def test_farm_power_table_replay(tmp_path):
+    fmodel = _get_fmodel()
+    table = _get_table(fmodel)
+
+    # Tables survive a round trip through a file
+    table.to_file(tmp_path / "table.npz")
+    table = FarmPowerTable.from_file(tmp_path / "table.npz")
+
+    rng = np.random.default_rng(0)
+    time_series = TimeSeries(
+        wind_directions=rng.uniform(0.0, 360.0, 200),
+        wind_speeds=rng.uniform(4.0, 12.0, 200),
+        turbulence_intensities=rng.uniform(0.04, 0.08, 200),
+    )
+
+    turbine_weights = np.array([1.0, 0.5, 1.0])
+    np.testing.assert_allclose(
+        table.get_farm_power(time_series, turbine_weights),
+        table.get_turbine_powers(time_series) @ turbine_weights,
+    )
+
+    report = table.get_error_report(fmodel, time_series)
+    assert report["max_rel_error"] < 0.1
+    assert report["expected_farm_power_rel_error"] < 0.01
+
+    fmodel.set(wind_data=time_series)
+    fmodel.run()
+    np.testing.assert_allclose(
+        table.get_farm_AEP(time_series), fmodel.get_farm_AEP(), rtol=0.01
+    )
+
+
+def test_farm_power_table_missing_frequency(caplog):
+    table = _get_table(_get_fmodel())
+
+    # Conditions outside of the lattice are left out of the expected farm power with a warning
+    time_series = TimeSeries(np.array([270.0, 270.0]), np.array([8.0, 15.0]), 0.06)
+    with caplog.at_level(logging.WARNING):
+        expected_farm_power = table.get_expected_farm_power(time_series)
+    assert "0.5" in caplog.text
+    np.testing.assert_allclose(expected_farm_power, 0.5 * table.get_farm_power(time_series)[0])
+
+    # Conditions inside of the lattice give no warning
+    caplog.clear()
+    time_series = TimeSeries(np.array([270.0, 90.0]), 8.0, 0.06)
+    with caplog.at_level(logging.WARNING):
+        table.get_farm_AEP(time_series)
+    assert caplog.text == ""
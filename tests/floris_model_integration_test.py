@@ -5,7 +5,12 @@ import numpy as np
 import pytest
 import yaml
 
-from floris import FlorisModel, WindRose
+from floris import (
+    FlorisModel,
+    TimeSeries,
+    WindRose,
+    WindTIRose,
+)
 from floris.core.turbine.operation_models import POWER_SETPOINT_DEFAULT
 
 
@@ -446,6 +451,272 @@ def test_get_farm_avp(caplog):
     expected_farm_power = fmodel.get_expected_farm_value(freq=freq, values=values)
     np.testing.assert_allclose(expected_farm_power, avp / (365 * 24))
 
+
+def test_get_farm_aep_streaming(tmp_path):
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(layout_x=[0, 0, 600], layout_y=[0, 1000, 0])
+
+    rng = np.random.default_rng(0)
+    time_series = TimeSeries(
+        wind_directions=rng.uniform(0.0, 360.0, 47),
+        wind_speeds=rng.uniform(3.0, 15.0, 47),
+        turbulence_intensities=0.06,
+        values=rng.uniform(10.0, 50.0, 47),
+    )
+    turbine_weights = np.array([1.0, 0.5, 1.0])
+
+    # In-memory reference
+    fmodel_full = fmodel.copy()
+    fmodel_full.set(wind_data=time_series)
+    fmodel_full.run()
+
+    result = fmodel.get_farm_AEP_streaming(
+        time_series.iter_chunks(10), turbine_weights=turbine_weights
+    )
+    assert result["n_findex"] == 47
+    np.testing.assert_allclose(
+        result["expected_farm_power"],
+        fmodel_full.get_expected_farm_power(turbine_weights=turbine_weights),
+        rtol=1e-12,
+    )
+    np.testing.assert_allclose(
+        result["farm_AEP"], fmodel_full.get_farm_AEP(turbine_weights=turbine_weights), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        result["farm_AVP"], fmodel_full.get_farm_AVP(turbine_weights=turbine_weights), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        result["turbine_AEP"],
+        fmodel_full.get_turbine_powers().mean(axis=0) * 8760,
+        rtol=1e-12,
+    )
+
+    # The same result is obtained reading the time series from disk
+    np.save(
+        tmp_path / "ts.npy",
+        np.column_stack([time_series.wind_directions, time_series.wind_speeds]),
+    )
+    result_file = fmodel.get_farm_AEP_streaming(
+        TimeSeries.read_chunks(tmp_path / "ts.npy", chunk_size=20, ti_col_or_value=0.06),
+        turbine_weights=turbine_weights,
+    )
+    np.testing.assert_allclose(result_file["farm_AEP"], result["farm_AEP"], rtol=1e-12)
+    assert result_file["farm_AVP"] is None
+
+    # The yaw angles and power setpoints of the model are applied to every chunk
+    yaw_angles = np.array([[20.0, 0.0, -10.0]])
+    power_setpoints = np.array([[POWER_SETPOINT_DEFAULT, 2e6, POWER_SETPOINT_DEFAULT]])
+    fmodel_setpoints = fmodel.copy()
+    fmodel_setpoints.set(yaw_angles=yaw_angles, power_setpoints=power_setpoints)
+    fmodel_full.set(
+        yaw_angles=np.repeat(yaw_angles, 47, axis=0),
+        power_setpoints=np.repeat(power_setpoints, 47, axis=0),
+    )
+    fmodel_full.run()
+    result_setpoints = fmodel_setpoints.get_farm_AEP_streaming(time_series.iter_chunks(10))
+    np.testing.assert_allclose(
+        result_setpoints["farm_AEP"], fmodel_full.get_farm_AEP(), rtol=1e-12
+    )
+    result_default = fmodel.get_farm_AEP_streaming(time_series.iter_chunks(10))
+    assert result_setpoints["farm_AEP"] < result_default["farm_AEP"]
+
+    # Setpoints that differ between findex cannot be applied to the chunks
+    fmodel_setpoints.set(
+        wind_directions=[270.0, 280.0],
+        wind_speeds=[8.0, 8.0],
+        turbulence_intensities=[0.06, 0.06],
+        yaw_angles=[[20.0, 0.0, 0.0], [0.0, 0.0, 0.0]],
+    )
+    with pytest.raises(ValueError):
+        fmodel_setpoints.get_farm_AEP_streaming(time_series.iter_chunks(10))
+
+    # The original model is unchanged
+    assert fmodel.core.flow_field.n_findex == 1
+
+
+def test_get_farm_aep_sparse():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(layout_x=[0, 0, 600], layout_y=[0, 1000, 0])
+
+    rng = np.random.default_rng(0)
+    freq_table = rng.uniform(0.0, 1.0, (36, 6)) ** 4
+    freq_table[0, :] = 0.0
+    wind_rose = WindRose(
+        wind_directions=np.arange(0.0, 360.0, 10.0),
+        wind_speeds=np.arange(4.0, 16.0, 2.0),
+        ti_table=0.06,
+        freq_table=freq_table,
+    )
+    turbine_weights = np.array([1.0, 0.5, 1.0])
+    fmodel.set(wind_data=wind_rose)
+    fmodel.run()
+    aep = fmodel.get_farm_AEP(turbine_weights=turbine_weights)
+
+    # Without a tolerance every non-zero frequency bin is solved
+    result = fmodel.get_farm_AEP_sparse(turbine_weights=turbine_weights, gridded=True)
+    np.testing.assert_allclose(result["farm_AEP"], aep, rtol=1e-12)
+    assert result["error_bound"] == 0.0
+    np.testing.assert_array_equal(
+        result["indices"], np.flatnonzero(wind_rose.freq_table_flat > 0.0)
+    )
+    np.testing.assert_allclose(
+        result["farm_power_gridded"], fmodel.get_farm_power(turbine_weights=turbine_weights)
+    )
+
+    # Skipped and coarsened bins stay within the reported error bound
+    for coarsen in [False, True]:
+        result = fmodel.get_farm_AEP_sparse(
+            freq_tolerance=0.05, coarsen=coarsen, turbine_weights=turbine_weights
+        )
+        assert 0.0 < result["skipped_freq"] <= 0.05
+        assert len(result["indices"]) < wind_rose.n_findex
+        assert result["turbine_powers"].shape == (len(result["indices"]), 3)
+        assert result["error_bound"] > 0.0
+        assert np.abs(result["farm_AEP"] - aep) <= result["error_bound"]
+        np.testing.assert_allclose(
+            np.sum(result["freq"]), 1.0 - (0.0 if coarsen else result["skipped_freq"])
+        )
+
+    # The turbulence intensity of each bin of a WindTIRose is used
+    wind_ti_rose = WindTIRose(
+        wind_directions=np.arange(0.0, 360.0, 30.0),
+        wind_speeds=np.array([6.0, 9.0]),
+        turbulence_intensities=np.array([0.04, 0.08, 0.12]),
+        freq_table=rng.uniform(0.0, 1.0, (12, 2, 3)),
+    )
+    fmodel.set(wind_data=wind_ti_rose)
+    fmodel.run()
+    result = fmodel.get_farm_AEP_sparse(turbine_weights=turbine_weights, gridded=True)
+    np.testing.assert_allclose(
+        result["farm_AEP"], fmodel.get_farm_AEP(turbine_weights=turbine_weights), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        result["farm_power_gridded"], fmodel.get_farm_power(turbine_weights=turbine_weights)
+    )
+
+    # The yaw angles and power setpoints of each findex are applied to its bin
+    fmodel.set(wind_data=wind_rose)
+    yaw_angles = np.zeros((wind_rose.n_findex, 3))
+    yaw_angles[:, 0] = np.linspace(-25.0, 25.0, wind_rose.n_findex)
+    power_setpoints = np.full((wind_rose.n_findex, 3), None)
+    power_setpoints[:, 1] = 1.0e6
+    fmodel.set(yaw_angles=yaw_angles, power_setpoints=power_setpoints)
+    fmodel.run()
+    aep_operated = fmodel.get_farm_AEP(turbine_weights=turbine_weights)
+    assert aep_operated < aep
+    result = fmodel.get_farm_AEP_sparse(turbine_weights=turbine_weights, gridded=True)
+    np.testing.assert_allclose(result["farm_AEP"], aep_operated, rtol=1e-12)
+    np.testing.assert_allclose(
+        result["farm_power_gridded"], fmodel.get_farm_power(turbine_weights=turbine_weights)
+    )
+
+    fmodel.set(wind_data=TimeSeries(np.array([270.0]), np.array([8.0]), 0.06))
+    with pytest.raises(TypeError):
+        fmodel.get_farm_AEP_sparse()
+
+
+def test_get_farm_power_jacobian():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(
+        layout_x=[0, 500, 1000],
+        layout_y=[0, 30, 0],
+        wind_directions=[270.0, 275.0, 260.0],
+        wind_speeds=[8.0, 9.0, 10.0],
+        turbulence_intensities=[0.06, 0.06, 0.06],
+        yaw_angles=np.array([[10.0, 5.0, 0.0], [0.0, 0.0, 0.0], [20.0, 0.0, 0.0]]),
+    )
+    turbine_weights = np.array([1.0, 0.5, 1.0])
+    farm_power, jacobian = fmodel.get_farm_power_jacobian(
+        ["yaw_angles", "layout_y"], steps=[0.5, 2.0], turbine_weights=turbine_weights
+    )
+    assert jacobian.shape == (3, 6)
+
+    fmodel.run()
+    np.testing.assert_allclose(farm_power, fmodel.get_farm_power(turbine_weights))
+
+    # Each column equals a separately solved forward difference
+    yaw_angles = fmodel.core.farm.yaw_angles.copy()
+    yaw_angles[:, 0] += 0.5
+    fmodel_perturbed = fmodel.copy()
+    fmodel_perturbed.set(yaw_angles=yaw_angles)
+    fmodel_perturbed.run()
+    np.testing.assert_allclose(
+        jacobian[:, 0], (fmodel_perturbed.get_farm_power(turbine_weights) - farm_power) / 0.5
+    )
+
+    fmodel_perturbed = fmodel.copy()
+    fmodel_perturbed.set(layout_y=[0, 32, 0], yaw_angles=fmodel.core.farm.yaw_angles)
+    fmodel_perturbed.run()
+    np.testing.assert_allclose(
+        jacobian[:, 4], (fmodel_perturbed.get_farm_power(turbine_weights) - farm_power) / 2.0
+    )
+
+    # The AEP gradient weighs the Jacobian by the frequencies
+    freq = np.array([0.5, 0.3, 0.2])
+    farm_AEP, gradient = fmodel.get_farm_AEP_gradient(
+        ["yaw_angles", "layout_y"], steps=[0.5, 2.0], freq=freq, turbine_weights=turbine_weights
+    )
+    np.testing.assert_allclose(farm_AEP, fmodel.get_farm_AEP(freq, turbine_weights))
+    np.testing.assert_allclose(gradient, 8760 * freq @ jacobian)
+
+    # At the upper bound, the forward difference steps backward
+    _, jacobian_bounded = fmodel.get_farm_power_jacobian(
+        "yaw_angles", steps=0.5, turbine_weights=turbine_weights, bounds={"yaw_angles": (0, 20)}
+    )
+    np.testing.assert_allclose(jacobian_bounded[:2], jacobian[:2, :3])
+    yaw_angles = fmodel.core.farm.yaw_angles.copy()
+    yaw_angles[:, 0] -= 0.5
+    fmodel_perturbed = fmodel.copy()
+    fmodel_perturbed.set(yaw_angles=yaw_angles)
+    fmodel_perturbed.run()
+    np.testing.assert_allclose(
+        jacobian_bounded[2, 0],
+        (fmodel_perturbed.get_farm_power(turbine_weights)[2] - farm_power[2]) / -0.5,
+    )
+
+    with pytest.raises(ValueError):
+        fmodel.get_farm_power_jacobian("tilt_angles")
+
+
+def test_per_findex_layouts():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    layout_x = np.array([[0.0, 500.0, 1000.0], [0.0, 630.0, 1260.0], [100.0, 0.0, 800.0]])
+    layout_y = np.array([[0.0, 0.0, 0.0], [0.0, 40.0, -40.0], [300.0, 0.0, 120.0]])
+    wind_directions = np.array([270.0, 275.0, 300.0])
+    wind_speeds = np.array([8.0, 9.0, 10.0])
+    yaw_angles = np.array([[10.0, 5.0, 0.0], [0.0, 0.0, 0.0], [20.0, 0.0, 0.0]])
+
+    fmodel.set(
+        layout_x=layout_x,
+        layout_y=layout_y,
+        wind_directions=wind_directions,
+        wind_speeds=wind_speeds,
+        turbulence_intensities=[0.06, 0.06, 0.06],
+        yaw_angles=yaw_angles,
+    )
+    fmodel.run()
+    turbine_powers = fmodel.get_turbine_powers()
+    assert fmodel.core.farm.coordinates.shape == (3, 3, 3)
+
+    # Each findex matches a separate solve of its own layout
+    for i in range(3):
+        fmodel_single = FlorisModel(configuration=YAML_INPUT)
+        fmodel_single.set(
+            layout_x=layout_x[i],
+            layout_y=layout_y[i],
+            wind_directions=wind_directions[i:i+1],
+            wind_speeds=wind_speeds[i:i+1],
+            turbulence_intensities=[0.06],
+            yaw_angles=yaw_angles[i:i+1],
+        )
+        fmodel_single.run()
+        np.testing.assert_allclose(turbine_powers[i], fmodel_single.get_turbine_powers()[0])
+
+    # The number of layouts must match the number of findices
+    with pytest.raises(ValueError):
+        fmodel.set(layout_x=layout_x[:2], layout_y=layout_y[:2])
+
+
 def test_set_ti():
     fmodel = FlorisModel(configuration=YAML_INPUT)
 
@@ -700,3 +971,71 @@ def test_set_operation():
     with pytest.raises(ValueError):
         fmodel.set_operation(yaw_angles=np.array([[25.0, 0.0], [25.0, 0.0]]))
         fmodel.run()
+
+
+def test_snapshot(tmp_path):
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(
+        layout_x=[0, 0, 600],
+        layout_y=[0, 1000, 0],
+        wind_directions=[270.0, 280.0],
+        wind_speeds=[8.0, 9.0],
+        turbulence_intensities=[0.06, 0.06],
+        yaw_angles=np.array([[20.0, 0.0, 0.0], [10.0, 0.0, 0.0]]),
+    )
+    fmodel.run()
+    turbine_powers = fmodel.get_turbine_powers()
+
+    # With the flow field included, outputs are available without running again
+    fmodel.save_snapshot(tmp_path / "solved.snap", include_flow_field=True)
+    fmodel_loaded = FlorisModel.load_snapshot(tmp_path / "solved.snap")
+    np.testing.assert_allclose(fmodel_loaded.get_turbine_powers(), turbine_powers)
+
+    # Without the flow field, the model must be run and saving must not modify the original
+    fmodel.save_snapshot(tmp_path / "unsolved.snap")
+    np.testing.assert_allclose(fmodel.get_turbine_powers(), turbine_powers)
+    fmodel_loaded = FlorisModel.load_snapshot(tmp_path / "unsolved.snap", mmap=False)
+    with pytest.raises(RuntimeError):
+        fmodel_loaded.get_turbine_powers()
+    fmodel_loaded.run()
+    np.testing.assert_allclose(fmodel_loaded.get_turbine_powers(), turbine_powers)
+    np.testing.assert_allclose(fmodel_loaded.core.farm.yaw_angles, fmodel.core.farm.yaw_angles)
+
+    # The loaded model can be modified like any other
+    fmodel_loaded.set(wind_speeds=[10.0, 10.0])
+    fmodel_loaded.run()
+    assert not np.allclose(fmodel_loaded.get_turbine_powers(), turbine_powers)
+
+    with open(tmp_path / "bad.snap", "wb") as f:
+        f.write(b"not a snapshot")
+    with pytest.raises(ValueError):
+        FlorisModel.load_snapshot(tmp_path / "bad.snap")
+
+
+def test_copy():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(
+        layout_x=[0, 0, 600],
+        layout_y=[0, 1000, 0],
+        yaw_angles=np.array([[20.0, 0.0, 0.0]]),
+    )
+    fmodel.run()
+    turbine_powers = fmodel.get_turbine_powers()
+
+    # The copy matches a model rebuilt from the input dictionary
+    fmodel_copy = fmodel.copy()
+    fmodel_rebuilt = FlorisModel(fmodel.core.as_dict())
+    fmodel_copy.run()
+    fmodel_rebuilt.run()
+    np.testing.assert_allclose(
+        fmodel_copy.get_turbine_powers(),
+        fmodel_rebuilt.get_turbine_powers()
+    )
+
+    # Changes to the copy do not affect the original
+    fmodel_copy.set(disable_turbines=[[True, False, False]])
+    fmodel_copy.set_operation_model("simple-derating")
+    fmodel_copy.run()
+    np.testing.assert_allclose(fmodel.get_turbine_powers(), turbine_powers)
+    np.testing.assert_allclose(fmodel.core.farm.yaw_angles, [[20.0, 0.0, 0.0]])
+    assert fmodel.get_operation_model() == "cosine-loss"
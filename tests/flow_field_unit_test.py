@@ -118,3 +118,38 @@ def test_turbulence_intensities_to_n_findex(flow_field_fixture, turbine_grid_fix
                 flow_field_fixture.turbulence_intensities[findex]
                 == flow_field_fixture.turbulence_intensity_field[findex, t, 0, 0]
             )
+
+
+def test_heterogeneous_speed_multipliers_by_reference(sample_inputs_fixture, turbine_grid_fixture):
+    rows = np.array([[1.0, 1.2, 1.0, 1.2], [0.9, 0.9, 1.1, 1.1]])
+    indices = np.arange(N_FINDEX) % 2
+    points = {"x": [-1000.0, 3000.0, -1000.0, 3000.0], "y": [-1000.0, -1000.0, 1000.0, 1000.0]}
+
+    flow_field_dict = dict(sample_inputs_fixture.flow_field)
+    flow_field_dict["heterogeneous_inflow_config"] = {"speed_multipliers": rows[indices], **points}
+    dense = FlowField.from_dict(flow_field_dict)
+
+    flow_field_dict["heterogeneous_inflow_config"] = {
+        "speed_multipliers": rows,
+        "speed_multiplier_indices": indices,
+        **points,
+    }
+    by_reference = FlowField.from_dict(flow_field_dict)
+
+    # Both share one interpolant per distinct row
+    assert len(dense.het_map) == 2
+    assert len(by_reference.het_map) == 2
+    np.testing.assert_array_equal(by_reference.get_speed_multipliers(), rows[indices])
+
+    dense.initialize_velocity_field(turbine_grid_fixture)
+    by_reference.initialize_velocity_field(turbine_grid_fixture)
+    np.testing.assert_array_equal(dense.u_initial_sorted, by_reference.u_initial_sorted)
+    assert not np.allclose(dense.u_initial_sorted[0], dense.u_initial_sorted[1])
+
+    flow_field_dict["heterogeneous_inflow_config"] = {
+        "speed_multipliers": rows,
+        "speed_multiplier_indices": indices[:-1],
+        **points,
+    }
+    with pytest.raises(ValueError):
+        FlowField.from_dict(flow_field_dict)
@@ -3,15 +3,24 @@ from pathlib import Path
 
 import numpy as np
 import pytest
+from scipy.spatial.distance import cdist
+from shapely.geometry import Point, Polygon
 
 from floris import (
     FlorisModel,
     TimeSeries,
     WindRose,
 )
+from floris.optimization.layout_optimization.layout_constraints import (
+    distance_from_boundaries,
+    space_constraint,
+)
 from floris.optimization.layout_optimization.layout_optimization_base import (
     LayoutOptimization,
 )
+from floris.optimization.layout_optimization.layout_optimization_genetic import (
+    LayoutOptimizationGenetic,
+)
 from floris.optimization.layout_optimization.layout_optimization_scipy import (
     LayoutOptimizationScipy,
 )
@@ -70,3 +79,92 @@ def test_base_class(caplog):
 
     LayoutOptimization(fmodel, boundaries, 5)
     LayoutOptimization(fmodel=fmodel, boundaries=boundaries, min_dist=5)
+
+
+def test_genetic_optimizer(tmp_path):
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    wind_rose = WindRose(
+        wind_directions=np.arange(0.0, 360.0, 45.0),
+        wind_speeds=np.array([8.0, 10.0]),
+        ti_table=0.06,
+    )
+    fmodel.set(layout_x=[0.0, 630.0, 0.0], layout_y=[0.0, 0.0, 630.0], wind_data=wind_rose)
+    boundaries = [(0.0, 0.0), (0.0, 1000.0), (1000.0, 1000.0), (1000.0, 0.0)]
+
+    layout_opt = LayoutOptimizationGenetic(
+        fmodel, boundaries, min_dist=252.0, population_size=8, n_generations=4, random_seed=0
+    )
+
+    # Spacing and boundary violations are computed for all layouts at once
+    violations = layout_opt._get_constraint_violations(
+        np.array([[0.0, 630.0, 0.0], [0.0, 100.0, 1100.0]]),
+        np.array([[0.0, 0.0, 630.0], [0.0, 0.0, 500.0]]),
+    )
+    np.testing.assert_allclose(violations, [0.0, 152.0 + 100.0])
+
+    x_opt, y_opt = layout_opt.optimize()
+    assert layout_opt._get_constraint_violations(np.array([x_opt]), np.array([y_opt]))[0] == 0.0
+    assert layout_opt.history[-1] >= 1.0
+    assert np.all(np.diff(layout_opt.history) >= 0.0)
+
+    # The stacked evaluation of the population matches the AEP of the best layout
+    fmodel_opt = fmodel.copy()
+    fmodel_opt.set(layout_x=x_opt, layout_y=y_opt, wind_data=wind_rose)
+    fmodel_opt.run()
+    np.testing.assert_allclose(
+        layout_opt.history[-1], fmodel_opt.get_farm_AEP() / layout_opt.initial_AEP_or_AVP
+    )
+
+    # Resuming from a checkpoint continues the same evolution
+    checkpoint_file = tmp_path / "checkpoint.npz"
+    LayoutOptimizationGenetic(
+        fmodel, boundaries, min_dist=252.0, population_size=8, n_generations=2, random_seed=0,
+        checkpoint_file=checkpoint_file,
+    ).optimize()
+    layout_opt_resumed = LayoutOptimizationGenetic(
+        fmodel, boundaries, min_dist=252.0, population_size=8, n_generations=4, random_seed=1,
+        checkpoint_file=checkpoint_file,
+    )
+    layout_opt_resumed.optimize(resume=True)
+    np.testing.assert_allclose(layout_opt_resumed.history, layout_opt.history)
+    np.testing.assert_allclose(layout_opt_resumed.x_opt, x_opt)
+
+
+def test_layout_constraints():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-500.0, 4500.0, 200)
+    y = rng.uniform(-500.0, 4000.0, 200)
+    boundaries = [(0.0, 0.0), (3000.0, -200.0), (4000.0, 2500.0), (1500.0, 3500.0)]
+    min_dist = 250.0
+    step = 1e-4
+
+    # The KS aggregate of the nearest-neighbor distances matches the pairwise computation
+    distances = cdist(np.column_stack((x, y)), np.column_stack((x, y)))
+    np.fill_diagonal(distances, np.inf)
+    g = 1 - np.min(distances, axis=0) / min_dist
+    expected = np.max(g) + np.log(np.sum(np.exp(500 * (g - np.max(g))))) / 500
+    ks, grad_x, grad_y = space_constraint(x, y, min_dist, gradient=True)
+    np.testing.assert_allclose(ks, expected)
+
+    i = np.argmax(np.abs(grad_x))
+    x_step = x.copy()
+    x_step[i] += step
+    np.testing.assert_allclose(
+        (space_constraint(x_step, y, min_dist) - ks) / step, grad_x[i], rtol=1e-4
+    )
+
+    # The signed boundary distances match shapely, positive inside of the boundaries
+    polygon = Polygon(boundaries)
+    expected = [
+        (1.0 if polygon.contains(Point(xi, yi)) else -1.0) * polygon.exterior.distance(
+            Point(xi, yi)
+        )
+        for xi, yi in zip(x, y)
+    ]
+    boundary_con, grad_x, grad_y = distance_from_boundaries(x, y, boundaries, gradient=True)
+    np.testing.assert_allclose(boundary_con, expected)
+    np.testing.assert_allclose(
+        (distance_from_boundaries(x, y + step, boundaries) - boundary_con) / step,
+        grad_y,
+        atol=1e-5,
+    )
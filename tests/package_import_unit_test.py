@@ -0,0 +1,32 @@
+
+import subprocess
+import sys
+
+import pytest
+
+import floris
+
+
+def test_import_floris_defers_heavy_dependencies():
+    # Run in a fresh interpreter since other tests will already have imported these modules
+    code = (
+        "import sys\n"
+        "import floris\n"
+        "print(','.join(m for m in ['matplotlib', 'shapely', 'floris.flow_visualization',"
+        " 'floris.parallel_floris_model', 'floris.uncertain_floris_model']"
+        " if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+    assert out.stdout.decode().strip() == ""
+
+
+def test_lazy_attributes():
+    from floris.uncertain_floris_model import UncertainFlorisModel
+    from floris.wind_data import WindRose
+
+    assert floris.UncertainFlorisModel is UncertainFlorisModel
+    assert floris.WindRose is WindRose
+    assert "visualize_cut_plane" in dir(floris)
+
+    with pytest.raises(AttributeError):
+        floris.not_an_attribute
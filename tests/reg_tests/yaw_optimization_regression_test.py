@@ -3,9 +3,15 @@ import numpy as np
 import pandas as pd
 
 from floris import FlorisModel
+from floris.optimization.yaw_optimization.yaw_optimization_tools import (
+    derive_downstream_turbines,
+    get_wake_adjacency,
+)
 from floris.optimization.yaw_optimization.yaw_optimizer_geometric import (
+    geometric_yaw,
     YawOptimizationGeometric,
 )
+from floris.optimization.yaw_optimization import yaw_optimizer_scipy
 from floris.optimization.yaw_optimization.yaw_optimizer_scipy import YawOptimizationScipy
 from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
 
@@ -146,6 +152,33 @@ def test_geometric_yaw(sample_inputs_fixture):
     pd.testing.assert_frame_equal(df_opt, baseline_geometric_yaw)
 
 
+def test_geometric_yaw_arrays():
+    """
+    Geometric yaw processes all wind directions, and optionally a layout per wind direction,
+    at once and gives the same yaw angles as separate evaluations of each wind direction.
+    """
+    D = 126.0 # Rotor diameter for the NREL 5 MW
+    layout_x = np.array([0.0, 5 * D, 10 * D, 2 * D, 7 * D])
+    layout_y = np.array([0.0, 0.0, 0.3 * D, 4 * D, 3.5 * D])
+    wd_array = np.arange(0.0, 360.0, 3.0)
+
+    # Turbines 5 D upstream of the next turbine are yawed by 30 - 30 * 5 / 25 degrees
+    np.testing.assert_allclose(geometric_yaw(layout_x, layout_y, 270.0, D)[:2], [24.0, 24.0])
+
+    yaw_angles = geometric_yaw(layout_x, layout_y, wd_array, D)
+    assert yaw_angles.shape == (len(wd_array), len(layout_x))
+    assert np.any(yaw_angles > 0.0) and np.any(yaw_angles < 0.0)
+    np.testing.assert_array_equal(
+        yaw_angles, [geometric_yaw(layout_x, layout_y, wd, D) for wd in wd_array]
+    )
+
+    layouts_x = layout_x + np.linspace(0.0, 2 * D, len(wd_array))[:, None]
+    np.testing.assert_array_equal(
+        geometric_yaw(layouts_x, np.tile(layout_y, (len(wd_array), 1)), wd_array, D),
+        [geometric_yaw(x, layout_y, wd, D) for x, wd in zip(layouts_x, wd_array)],
+    )
+
+
 def test_scipy_yaw_opt(sample_inputs_fixture):
     """
     The SciPy optimization method optimizes yaw angles using SciPy's minimize method. This test
@@ -184,3 +217,243 @@ def test_scipy_yaw_opt(sample_inputs_fixture):
         print(df_opt.to_string())
 
     pd.testing.assert_frame_equal(df_opt, baseline_scipy)
+
+
+def test_scipy_yaw_opt_stacked_jacobian(sample_inputs_fixture, monkeypatch):
+    """
+    The gradient of the SciPy optimization is evaluated in stacked solves with the same steps as
+    SciPy's own finite differences, stepping backward at the upper yaw bound, so that the
+    results match those of SciPy's finite differences.
+    """
+    sample_inputs_fixture.core["wake"]["model_strings"]["velocity_model"] = VELOCITY_MODEL
+    sample_inputs_fixture.core["wake"]["model_strings"]["deflection_model"] = DEFLECTION_MODEL
+
+    fmodel = FlorisModel(sample_inputs_fixture.core)
+    D = 126.0 # Rotor diameter for the NREL 5 MW
+    fmodel.set(
+        layout_x=[0.0, 5 * D, 10 * D],
+        layout_y=[0.0, 0.0, 0.0],
+        wind_directions=[262.0, 266.0, 274.0, 278.0],
+        wind_speeds=[8.0] * 4,
+        turbulence_intensities=[0.06] * 4,
+    )
+
+    for opt_options in [{"maxiter": 100, "disp": False, "eps": 0.5}, {"disp": False}]:
+        df_opt = YawOptimizationScipy(fmodel, opt_options=dict(opt_options)).optimize()
+        monkeypatch.setattr(yaw_optimizer_scipy, "GRADIENT_METHODS", ())
+        df_opt_scipy = YawOptimizationScipy(fmodel, opt_options=dict(opt_options)).optimize()
+        monkeypatch.undo()
+
+        np.testing.assert_allclose(
+            np.vstack(df_opt["yaw_angles_opt"]),
+            np.vstack(df_opt_scipy["yaw_angles_opt"]),
+            atol=1e-6,
+        )
+        np.testing.assert_allclose(df_opt["farm_power_opt"], df_opt_scipy["farm_power_opt"])
+
+
+def test_scipy_yaw_opt_batched(sample_inputs_fixture):
+    """
+    The batched SciPy optimization method optimizes all wind conditions together with one
+    FLORIS solve per iteration. This test checks that it finds the same farm power uplift
+    as the stored SciPy baseline results for a simple farm with a simple wind rose.
+    """
+    sample_inputs_fixture.core["wake"]["model_strings"]["velocity_model"] = VELOCITY_MODEL
+    sample_inputs_fixture.core["wake"]["model_strings"]["deflection_model"] = DEFLECTION_MODEL
+
+    fmodel = FlorisModel(sample_inputs_fixture.core)
+    wd_array = np.arange(0.0, 360.0, 90.0)
+    ws_array = 8.0 * np.ones_like(wd_array)
+    ti_array = 0.1 * np.ones_like(wd_array)
+    D = 126.0 # Rotor diameter for the NREL 5 MW
+    fmodel.set(
+        layout_x=[0.0, 5 * D, 10 * D],
+        layout_y=[0.0, 0.0, 0.0],
+        wind_directions=wd_array,
+        wind_speeds=ws_array,
+        turbulence_intensities=ti_array,
+    )
+
+    yaw_opt = YawOptimizationScipy(fmodel, batched=True)
+    df_opt = yaw_opt.optimize()
+
+    if DEBUG:
+        print(baseline_scipy.to_string())
+        print(df_opt.to_string())
+
+    np.testing.assert_allclose(
+        df_opt["farm_power_opt"], baseline_scipy["farm_power_opt"], rtol=1e-4
+    )
+    np.testing.assert_allclose(
+        np.vstack(df_opt["yaw_angles_opt"]), np.vstack(baseline_scipy["yaw_angles_opt"]), atol=1.5
+    )
+
+    # The reported powers match a direct evaluation of the optimal yaw angles
+    fmodel.set(yaw_angles=np.vstack(df_opt["yaw_angles_opt"]))
+    fmodel.run()
+    np.testing.assert_allclose(df_opt["farm_power_opt"], fmodel.get_farm_power())
+
+
+def test_wake_adjacency(sample_inputs_fixture):
+    """
+    The wake adjacency of all wind directions at once matches the downstream turbines that
+    derive_downstream_turbines finds for each wind direction separately.
+    """
+    fmodel = FlorisModel(sample_inputs_fixture.core)
+    D = 126.0
+    fmodel.set(layout_x=[0.0, 5 * D, 10 * D, 0.0, 5 * D], layout_y=[0.0, 0.0, 0.0, 4 * D, 4 * D])
+
+    wind_directions = np.tile(np.arange(0.0, 360.0, 5.0), 2)
+    wake_adjacency = get_wake_adjacency(fmodel)
+    adjacency = wake_adjacency.get_adjacency(wind_directions)
+    downstream_turbines = wake_adjacency.get_downstream_turbines(wind_directions)
+    assert adjacency.shape == (144, 5, 5)
+    np.testing.assert_array_equal(downstream_turbines, ~adjacency.any(axis=2))
+    for wd, downstream in zip(wind_directions, downstream_turbines):
+        np.testing.assert_array_equal(
+            np.flatnonzero(downstream), derive_downstream_turbines(fmodel, wd)
+        )
+
+    # At 270 degrees, the first row of turbines wakes the turbines directly downstream
+    np.testing.assert_array_equal(adjacency[54, 0], [False, True, True, False, False])
+    np.testing.assert_array_equal(wake_adjacency.get_turbine_orders([270.0])[0, :2], [0, 3])
+
+    # The adjacency is cached per layout
+    assert get_wake_adjacency(fmodel) is wake_adjacency
+
+
+def test_warm_started_yaw_opt(sample_inputs_fixture):
+    """
+    The warm-started Serial Refine and SciPy optimizations seed each wind condition with the
+    solution of a neighboring condition. They find nearly the same farm powers as the full
+    searches, and Serial Refine needs fewer FLORIS evaluations to do so.
+    """
+    sample_inputs_fixture.core["wake"]["model_strings"]["velocity_model"] = VELOCITY_MODEL
+    sample_inputs_fixture.core["wake"]["model_strings"]["deflection_model"] = DEFLECTION_MODEL
+
+    fmodel = FlorisModel(sample_inputs_fixture.core)
+    wd_array, ws_array = [
+        a.ravel() for a in np.meshgrid(np.arange(250.0, 292.0, 2.0), [7.0, 9.0])
+    ]
+    D = 126.0 # Rotor diameter for the NREL 5 MW
+    fmodel.set(
+        layout_x=[0.0, 5 * D, 10 * D],
+        layout_y=[0.0, 0.0, 0.0],
+        wind_directions=wd_array,
+        wind_speeds=ws_array,
+        turbulence_intensities=0.06 * np.ones_like(wd_array),
+    )
+
+    yaw_opt = YawOptimizationSR(fmodel, minimum_yaw_angle=-25.0)
+    df_opt = yaw_opt.optimize(print_progress=False)
+    yaw_opt_warm = YawOptimizationSR(fmodel, minimum_yaw_angle=-25.0, warm_start=True)
+    df_opt_warm = yaw_opt_warm.optimize(print_progress=False)
+
+    assert yaw_opt_warm.n_floris_evaluations < 0.8 * yaw_opt.n_floris_evaluations
+    assert np.all(df_opt_warm["farm_power_opt"] >= 0.998 * df_opt["farm_power_opt"])
+    assert np.all(df_opt_warm["farm_power_opt"] >= df_opt_warm["farm_power_baseline"])
+
+    # The reported powers match a direct evaluation of the optimal yaw angles
+    fmodel.set(yaw_angles=np.vstack(df_opt_warm["yaw_angles_opt"]))
+    fmodel.run()
+    np.testing.assert_allclose(df_opt_warm["farm_power_opt"], fmodel.get_farm_power())
+
+    # Each SciPy optimization is seeded from its predecessors in wind direction and speed
+    fmodel.set(
+        wind_directions=[266.0, 270.0, 274.0, 266.0],
+        wind_speeds=[8.0, 8.0, 8.0, 9.0],
+        turbulence_intensities=[0.06] * 4,
+        yaw_angles=np.zeros((4, 3)),
+    )
+    opt_options = {"maxiter": 20, "disp": False, "ftol": 1e-7, "eps": 0.01}
+    yaw_opt = YawOptimizationScipy(
+        fmodel, minimum_yaw_angle=-25.0, opt_options=opt_options, warm_start=True
+    )
+    order, parents = yaw_opt._get_warm_start_parents()
+    np.testing.assert_array_equal(order, [0, 1, 2, 3])
+    np.testing.assert_array_equal(parents, [[-1, -1], [0, -1], [1, -1], [-1, 0]])
+
+    df_opt_warm = yaw_opt.optimize()
+    df_opt = YawOptimizationScipy(
+        fmodel, minimum_yaw_angle=-25.0, opt_options=opt_options
+    ).optimize()
+    assert np.all(df_opt_warm["farm_power_opt"] >= 0.998 * df_opt["farm_power_opt"])
+
+
+def test_warm_started_yaw_opt_jensen(sample_inputs_fixture):
+    """
+    The farm power of the jensen model is not smooth in the yaw angles, so that warm-started
+    Serial Refine solutions can end at the baseline farm power although the full search
+    finds a gain. Those conditions, and conditions whose anchors gain nothing, are optimized
+    again over the full range.
+    """
+    sample_inputs_fixture.core["wake"]["model_strings"]["velocity_model"] = "jensen"
+    sample_inputs_fixture.core["wake"]["model_strings"]["deflection_model"] = DEFLECTION_MODEL
+
+    fmodel = FlorisModel(sample_inputs_fixture.core)
+    wd_array, ws_array = [
+        a.ravel() for a in np.meshgrid(np.arange(36.0, 57.0, 3.0), [7.0, 10.0])
+    ]
+    D = 126.0 # Rotor diameter for the NREL 5 MW
+    fmodel.set(
+        layout_x=[0.0, 5 * D, 10 * D, 0.0, 5 * D, 10 * D],
+        layout_y=[0.0, 0.0, 0.0, 5 * D, 5 * D, 5 * D],
+        wind_directions=wd_array,
+        wind_speeds=ws_array,
+        turbulence_intensities=0.06 * np.ones_like(wd_array),
+    )
+
+    df_opt = YawOptimizationSR(fmodel, minimum_yaw_angle=-25.0).optimize(print_progress=False)
+    df_opt_warm = YawOptimizationSR(
+        fmodel, minimum_yaw_angle=-25.0, warm_start=True
+    ).optimize(print_progress=False)
+
+    gain = df_opt["farm_power_opt"] > df_opt["farm_power_baseline"]
+    assert np.any(gain)
+    assert np.all(df_opt_warm["farm_power_opt"][gain] > df_opt_warm["farm_power_baseline"][gain])
+    assert np.all(df_opt_warm["farm_power_opt"] >= 0.998 * df_opt["farm_power_opt"])
+
+
+def test_serial_refine_stacked_evaluation(sample_inputs_fixture):
+    """
+    The Serial Refine candidates are evaluated in a single solve of a persistent model that
+    reuses the wakes of the turbines upstream of the turbine depth. The farm powers match
+    separate evaluations of the candidates.
+    """
+    sample_inputs_fixture.core["wake"]["model_strings"]["velocity_model"] = VELOCITY_MODEL
+    sample_inputs_fixture.core["wake"]["model_strings"]["deflection_model"] = DEFLECTION_MODEL
+
+    fmodel = FlorisModel(sample_inputs_fixture.core)
+    D = 126.0 # Rotor diameter for the NREL 5 MW
+    fmodel.set(
+        layout_x=[0.0, 5 * D, 10 * D, 0.0],
+        layout_y=[0.0, 0.0, 0.0, 5 * D],
+        wind_directions=[255.0, 270.0, 285.0],
+        wind_speeds=[8.0] * 3,
+        turbulence_intensities=[0.06] * 3,
+    )
+    yaw_opt = YawOptimizationSR(fmodel, minimum_yaw_angle=-25.0)
+    yaw_opt.print_progress = False
+
+    def assert_stacked_powers(yaw_angles_opt, pass_depth, turbine_depth):
+        yaw_opt._yaw_angles_opt_subset = np.array(yaw_angles_opt, dtype=float)
+        evaluation_grid = yaw_opt._generate_evaluation_grid(pass_depth, turbine_depth)
+        farm_powers = yaw_opt._calc_stacked_farm_powers(evaluation_grid)
+        for yaw_angles, farm_power in zip(evaluation_grid, farm_powers):
+            np.testing.assert_allclose(
+                farm_power, yaw_opt._calculate_farm_power(yaw_angles), rtol=1e-12
+            )
+
+    # The upstream wakes are advanced with the turbine depth, solved again when the optimal
+    # yaw angles of the upstream turbines change and reset when the depth moves upstream
+    yaw_angles_opt = np.zeros((3, 4))
+    assert_stacked_powers(yaw_angles_opt, 0, 0)
+    assert_stacked_powers(yaw_angles_opt, 0, 1)
+    assert yaw_opt._n_upstream_solved == 1
+    yaw_angles_opt[:, yaw_opt.turbines_ordered_array_subset[0, 0]] = 10.0
+    assert_stacked_powers(yaw_angles_opt, 0, 2)
+    assert_stacked_powers(yaw_angles_opt, 1, 1)
+
+    # The persistent models are kept between solves
+    assert set(yaw_opt._stacked_models) == {4, 5}
+    assert yaw_opt._get_stacked_model(5) is yaw_opt._stacked_models[5]
@@ -38,6 +38,32 @@ def test_rounded_inputs():
     np.testing.assert_almost_equal(rounded_inputs, expected_output)
 
 
+def test_lattice_inputs():
+    ufmodel = UncertainFlorisModel(configuration=YAML_INPUT)
+
+    # Rows with wd, ws, ti, and one yaw column that is carried along unchanged
+    input_array = np.array([[359.5, 8.0, 0.06, 5.0], [45.25, 7.5, 0.065, 0.0]])
+
+    lattice_inputs, weights = ufmodel._get_lattice_inputs(
+        input_array, wd_resolution=1.0, ws_resolution=1.0, ti_resolution=0.01
+    )
+
+    assert lattice_inputs.shape == (16, 4)
+    np.testing.assert_allclose(weights.sum(axis=0), 1.0)
+    np.testing.assert_allclose(lattice_inputs[:, 3], np.tile(input_array[:, 3], 8))
+
+    # The interpolation weights reproduce the inputs from the corners, except that the wind
+    # direction cell above 359 wraps to 0
+    corners = lattice_inputs.reshape(8, 2, 4)
+    np.testing.assert_allclose(np.unique(corners[:, 0, 0]), [0.0, 359.0])
+    np.testing.assert_allclose(np.sum(weights * corners[:, :, 1], axis=0), input_array[:, 1])
+    np.testing.assert_allclose(np.sum(weights * corners[:, :, 2], axis=0), input_array[:, 2])
+    np.testing.assert_allclose(np.sum(weights[:, 1] * corners[:, 1, 0]), 45.25)
+
+    # Along dimensions where the row is on the lattice, all corners are the row itself
+    np.testing.assert_allclose(corners[:, 0, 1:3], np.tile([8.0, 0.06], (8, 1)))
+
+
 def test_expand_wind_directions():
     ufmodel = UncertainFlorisModel(configuration=YAML_INPUT)
 
@@ -128,6 +154,23 @@ def test_get_unique_inputs():
     assert np.array_equal(unique_inputs[map_to_expanded_inputs], input_array)
 
 
+def test_get_unique_inputs_random_rows():
+    ufmodel = UncertainFlorisModel(configuration=YAML_INPUT)
+
+    # Repeated rows drawn from a small pool, including -0.0 which should match 0.0
+    rng = np.random.default_rng(0)
+    pool = rng.integers(-2, 3, size=(50, 8)).astype(float)
+    pool[0, :] = -0.0
+    pool[1, :] = 0.0
+    input_array = pool[rng.integers(0, 50, size=2000)]
+
+    unique_inputs, map_to_expanded_inputs = ufmodel._get_unique_inputs(input_array)
+
+    assert np.array_equal(unique_inputs[map_to_expanded_inputs], input_array)
+    assert len(unique_inputs) == len(np.unique(input_array, axis=0))
+    assert map_to_expanded_inputs.shape == (2000,)
+
+
 def test_get_weights():
     ufmodel = UncertainFlorisModel(configuration=YAML_INPUT)
     weights = ufmodel._get_weights(3.0, [-6, -3, 0, 3, 6])
@@ -298,3 +341,174 @@ def test_approx_floris_model():
     power = afmodel.get_farm_power()
     np.testing.assert_almost_equal(power[0], power[1])
     assert not np.allclose(power[2], power[3])
+
+
+def test_approx_floris_model_interpolation():
+    layout_x = np.array([0, 500])
+    layout_y = np.array([0, 0])
+
+    afmodel = ApproxFlorisModel(
+        configuration=YAML_INPUT, wd_resolution=2.0, ws_resolution=1.0, interpolation="linear"
+    )
+    time_series = TimeSeries(
+        wind_directions=np.array([270.0, 272.0, 271.0, 359.0]),
+        wind_speeds=np.array([8.0, 8.0, 8.5, 8.0]),
+        turbulence_intensities=0.06,
+    )
+    afmodel.set(layout_x=layout_x, layout_y=layout_y, wind_data=time_series)
+    afmodel.run()
+    powers = afmodel.get_turbine_powers()
+
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(
+        layout_x=layout_x,
+        layout_y=layout_y,
+        wind_directions=[270.0, 272.0, 270.0, 272.0, 358.0, 0.0],
+        wind_speeds=[8.0, 8.0, 9.0, 9.0, 8.0, 8.0],
+        turbulence_intensities=0.06 * np.ones(6),
+    )
+    fmodel.run()
+    lattice_powers = fmodel.get_turbine_powers()
+
+    # Conditions on the lattice are solved exactly
+    np.testing.assert_allclose(powers[:2], lattice_powers[:2])
+
+    # Conditions between lattice points are bilinearly interpolated, with periodic wrapping
+    np.testing.assert_allclose(powers[2], lattice_powers[:4].mean(axis=0))
+    np.testing.assert_allclose(powers[3], lattice_powers[4:].mean(axis=0))
+
+    # Only the 6 lattice points are solved
+    assert afmodel.n_unique == 6
+
+    with pytest.raises(ValueError):
+        ApproxFlorisModel(configuration=YAML_INPUT, interpolation="cubic")
+
+
+def test_approx_floris_model_interpolation_low_wind_speed():
+    layout_x = np.array([0, 500, 1000])
+    layout_y = np.array([0, 0, 0])
+    wind_speeds = np.array([0.5, 0.5, 3.5])
+    turbulence_intensities = np.array([0.06, 0.005, 0.06])
+
+    # Wind speeds and turbulence intensities below the first positive lattice point are solved
+    # exactly rather than interpolated from zero, where FLORIS gives NaN
+    afmodel = ApproxFlorisModel(
+        configuration=YAML_INPUT, ws_resolution=1.0, ti_resolution=0.01, interpolation="linear"
+    )
+    time_series = TimeSeries(
+        wind_directions=np.array([270.0, 270.0, 270.0]),
+        wind_speeds=wind_speeds,
+        turbulence_intensities=turbulence_intensities,
+    )
+    afmodel.set(layout_x=layout_x, layout_y=layout_y, wind_data=time_series)
+    afmodel.run()
+    powers = afmodel.get_turbine_powers()
+
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(
+        layout_x=layout_x,
+        layout_y=layout_y,
+        wind_directions=[270.0] * 3,
+        wind_speeds=wind_speeds,
+        turbulence_intensities=turbulence_intensities,
+    )
+    fmodel.run()
+
+    assert not np.any(np.isnan(powers))
+    np.testing.assert_allclose(powers[:2], fmodel.get_turbine_powers()[:2])
+
+
+def test_condition_cache():
+    ufmodel = UncertainFlorisModel(
+        configuration=YAML_INPUT, wd_std=1.0, wd_sample_points=[-1, 0, 1], condition_cache_size=10
+    )
+    ufmodel_ref = UncertainFlorisModel(
+        configuration=YAML_INPUT, wd_std=1.0, wd_sample_points=[-1, 0, 1]
+    )
+
+    def set_and_run(wind_directions, yaw=0.0, **kwargs):
+        powers = []
+        for model in [ufmodel, ufmodel_ref]:
+            model.set(
+                wind_directions=wind_directions,
+                wind_speeds=8.0 * np.ones_like(wind_directions),
+                turbulence_intensities=0.06 * np.ones_like(wind_directions),
+                yaw_angles=yaw * np.ones((len(wind_directions), 2)),
+                **kwargs,
+            )
+            model.run()
+            powers.append(model.get_turbine_powers())
+        np.testing.assert_allclose(powers[0], powers[1])
+
+    set_and_run(np.array([270.0, 271.0]), layout_x=[0, 500], layout_y=[0, 0])
+    assert len(ufmodel._condition_cache) == 4
+
+    # The neighbouring wind direction only adds the one new perturbed condition
+    set_and_run(np.array([272.0]))
+    assert len(ufmodel._condition_cache) == 5
+
+    # New setpoints are new conditions, and the cache is bounded
+    set_and_run(np.array([270.0, 280.0, 290.0]), yaw=10.0)
+    assert len(ufmodel._condition_cache) == 10
+
+    # Copies share the cache
+    assert ufmodel.copy()._condition_cache is ufmodel._condition_cache
+
+    # Changing the layout starts a new cache
+    set_and_run(np.array([270.0]), layout_x=[0, 300], layout_y=[0, 0])
+    assert len(ufmodel._condition_cache) == 3
+
+
+def test_wd_quadrature():
+    ufmodel = UncertainFlorisModel(configuration=YAML_INPUT, wd_std=2.0, wd_quadrature_order=3)
+
+    # The 3 point rule has nodes at 0 and +/- sqrt(3) standard deviations
+    np.testing.assert_allclose(
+        ufmodel.wd_sample_points, [-2.0 * np.sqrt(3), 0.0, 2.0 * np.sqrt(3)]
+    )
+    np.testing.assert_allclose(ufmodel.weights, [1 / 6, 2 / 3, 1 / 6])
+    assert ufmodel.n_sample_points == 3
+
+    # The rules integrate polynomials exactly, so the 5 point rule recovers the fourth moment
+    sample_points, weights = ufmodel._get_gauss_hermite_points(2.0, 5)
+    assert sample_points[2] == 0.0
+    np.testing.assert_allclose(np.sum(weights * sample_points**4), 3 * 2.0**4)
+
+    with pytest.raises(ValueError):
+        UncertainFlorisModel(configuration=YAML_INPUT, wd_quadrature_order=4)
+    with pytest.raises(ValueError):
+        UncertainFlorisModel(
+            configuration=YAML_INPUT, wd_sample_points=[-1, 0, 1], wd_quadrature_order=3
+        )
+
+
+def test_wd_quadrature_adaptive():
+    kwargs = {"wd_std": 3.0, "interpolation": "linear"}
+    ufmodel = UncertainFlorisModel(
+        configuration=YAML_INPUT, wd_quadrature_tolerance=0.01, **kwargs
+    )
+    ufmodel.set(
+        layout_x=[0, 500],
+        layout_y=[0, 0],
+        wind_directions=[260.0, 270.0],
+        wind_speeds=[8.0, 8.0],
+        turbulence_intensities=[0.06, 0.06],
+    )
+    ufmodel.run()
+
+    # Refinement stops at an order above the starting order, keeping its sample points
+    order = ufmodel.n_sample_points
+    assert 5 <= order <= 15
+
+    ufmodel_fixed = UncertainFlorisModel(
+        configuration=YAML_INPUT, wd_quadrature_order=order, **kwargs
+    )
+    ufmodel_fixed.set(
+        layout_x=[0, 500],
+        layout_y=[0, 0],
+        wind_directions=[260.0, 270.0],
+        wind_speeds=[8.0, 8.0],
+        turbulence_intensities=[0.06, 0.06],
+    )
+    ufmodel_fixed.run()
+    np.testing.assert_allclose(ufmodel.get_farm_power(), ufmodel_fixed.get_farm_power())
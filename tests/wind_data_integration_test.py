@@ -306,6 +306,44 @@ def test_resample_by_interpolation():
     np.testing.assert_allclose(wind_rose_resample.ti_table, np.array([[0.06, 0.065, 0.07]]))
 
 
+def test_resample_by_interpolation_regular_grid():
+    # Multilinear interpolation reproduces a bilinear function inside the grid cells
+    wind_directions = np.arange(0.0, 360.0, 10.0)
+    wind_speeds = np.array([4.0, 6.0, 8.0])
+    wd_grid, ws_grid = np.meshgrid(wind_directions, wind_speeds, indexing="ij")
+    value_table = 1.0 + wd_grid * ws_grid
+    wind_rose = WindRose(wind_directions, wind_speeds, ti_table=0.06, value_table=value_table)
+
+    wind_rose_resample = wind_rose.resample_by_interpolation(wd_step=3.0, ws_step=1.0)
+    new_wd_grid, new_ws_grid = np.meshgrid(
+        wind_rose_resample.wind_directions, wind_rose_resample.wind_speeds, indexing="ij"
+    )
+    interior = new_wd_grid <= 350.0
+    np.testing.assert_allclose(
+        wind_rose_resample.value_table[interior],
+        (1.0 + new_wd_grid * new_ws_grid)[interior],
+    )
+
+    # Wind directions past the last bin wrap around to the first bin
+    np.testing.assert_allclose(wind_rose_resample.wind_directions[-1], 351.0)
+    np.testing.assert_allclose(
+        wind_rose_resample.value_table[-1, 0], 0.9 * value_table[-1, 0] + 0.1 * value_table[0, 0]
+    )
+
+    # Nearest interpolation picks the closest grid point along each axis
+    wind_rose_resample = wind_rose.resample_by_interpolation(
+        wd_step=3.0, ws_step=0.5, method="nearest"
+    )
+    np.testing.assert_allclose(wind_rose_resample.wind_directions[:4], [0.0, 3.0, 6.0, 9.0])
+    np.testing.assert_allclose(
+        wind_rose_resample.value_table[:4, :3],
+        value_table[[0, 0, 1, 1]][:, [0, 0, 0]],
+    )
+
+    with pytest.raises(ValueError):
+        wind_rose.resample_by_interpolation(method="cubic")
+
+
 def test_resample_by_interpolation_ti_rose():
     wind_directions = np.array([0, 2, 4, 6, 8, 10])
     wind_speeds = np.array([8, 10])
@@ -728,8 +766,22 @@ def test_gen_heterogeneous_inflow_config():
 
     (_, _, _, _, _, heterogeneous_inflow_config) = time_series.unpack()
 
+    # The speed multipliers are given by reference to the rows of the configuration by wind
+    # direction
     expected_result = np.array([[1.0, 1.0], [1.0, 1.0], [1.0, 1.0], [1.0, 1.0], [1.1, 1.2]])
-    np.testing.assert_allclose(heterogeneous_inflow_config["speed_multipliers"], expected_result)
+    np.testing.assert_array_equal(
+        heterogeneous_inflow_config["speed_multiplier_indices"], [1, 1, 1, 1, 2]
+    )
+    np.testing.assert_allclose(
+        heterogeneous_inflow_config["speed_multipliers"][
+            heterogeneous_inflow_config["speed_multiplier_indices"]
+        ],
+        expected_result,
+    )
+    np.testing.assert_allclose(
+        time_series.get_speed_multipliers_by_wd(heterogeneous_inflow_config_by_wd, wind_directions),
+        expected_result,
+    )
     np.testing.assert_allclose(
         heterogeneous_inflow_config["x"], heterogeneous_inflow_config_by_wd["x"]
     )
@@ -802,3 +854,163 @@ def test_read_csv_long_ti():
 
     expected_result = np.array([0.06, 0.07])
     np.testing.assert_allclose(wind_ti_rose.turbulence_intensities, expected_result)
+
+
+def test_time_series_chunks(tmp_path):
+    rng = np.random.default_rng(0)
+    wind_directions = rng.uniform(0.0, 360.0, 25)
+    wind_speeds = rng.uniform(3.0, 15.0, 25)
+    turbulence_intensities = rng.uniform(0.04, 0.1, 25)
+    values = rng.uniform(10.0, 50.0, 25)
+    time_series = TimeSeries(wind_directions, wind_speeds, turbulence_intensities, values)
+
+    chunks = list(time_series.iter_chunks(10))
+    assert [chunk.n_findex for chunk in chunks] == [10, 10, 5]
+    np.testing.assert_allclose(
+        np.concatenate([chunk.wind_speeds for chunk in chunks]), wind_speeds
+    )
+
+    # Write the same time series as CSV, a structured NPY and a 2D NPY
+    columns = ["wd", "ws", "ti", "value"]
+    data = np.column_stack([wind_directions, wind_speeds, turbulence_intensities, values])
+    np.savetxt(tmp_path / "ts.csv", data, delimiter=",", header=",".join(columns), comments="")
+    np.save(tmp_path / "ts.npy", data)
+    structured = np.empty(25, dtype=[(col, float) for col in columns])
+    for col, column_data in zip(columns, data.T):
+        structured[col] = column_data
+    np.save(tmp_path / "ts_structured.npy", structured)
+
+    for file_name in ["ts.csv", "ts.npy", "ts_structured.npy"]:
+        chunks = list(
+            TimeSeries.read_chunks(
+                tmp_path / file_name,
+                chunk_size=10,
+                wd_col="wd",
+                ws_col="ws",
+                ti_col_or_value="ti",
+                value_col="value",
+            )
+        )
+        assert [chunk.n_findex for chunk in chunks] == [10, 10, 5]
+        for attribute, expected in [
+            ("wind_directions", wind_directions),
+            ("wind_speeds", wind_speeds),
+            ("turbulence_intensities", turbulence_intensities),
+            ("values", values),
+        ]:
+            np.testing.assert_allclose(
+                np.concatenate([getattr(chunk, attribute) for chunk in chunks]), expected
+            )
+
+    # A constant TI is broadcast to each chunk
+    chunk = next(
+        TimeSeries.read_chunks(
+            tmp_path / "ts.csv", wd_col="wd", ws_col="ws", ti_col_or_value=0.06
+        )
+    )
+    np.testing.assert_allclose(chunk.turbulence_intensities, 0.06)
+
+    # Any real number is accepted as a constant TI
+    chunk = next(
+        TimeSeries.read_chunks(tmp_path / "ts.csv", wd_col="wd", ws_col="ws", ti_col_or_value=1)
+    )
+    np.testing.assert_array_equal(chunk.turbulence_intensities, np.ones(25))
+    with pytest.raises(TypeError):
+        next(TimeSeries.read_chunks(tmp_path / "ts.csv", ti_col_or_value=[0.06]))
+
+    with pytest.raises(ValueError):
+        next(TimeSeries.read_chunks(tmp_path / "ts.txt"))
+
+
+def test_time_series_bin_indices():
+    # Values on, between and outside regular and irregular edges, including values on edges
+    # produced by np.arange which are not exact multiples of the step
+    regular_edges = np.arange(-1.0, 360.0, 2.0)
+    irregular_edges = np.array([0.0, 3.0, 7.0, 12.0, 25.0])
+    for edges in [regular_edges, irregular_edges, np.arange(0.0 - 0.1 / 2.0, 1.0, 0.1)]:
+        x = np.concatenate([edges, edges[:-1] + 1e-9, [edges[0] - 1.0, edges[-1] + 1.0, np.nan]])
+        expected = np.searchsorted(edges, x, side="right") - 1
+        expected[(expected >= len(edges) - 1) | np.isnan(x)] = -1
+        np.testing.assert_array_equal(TimeSeries._bin_indices(x, edges), expected)
+
+
+def _assert_same_attributes(wind_data, loaded):
+    assert type(loaded) is type(wind_data)
+    assert set(vars(loaded)) == set(vars(wind_data))
+    for name, value in vars(wind_data).items():
+        if isinstance(value, dict):
+            assert value.keys() == vars(loaded)[name].keys()
+            for key in value:
+                np.testing.assert_array_equal(vars(loaded)[name][key], value[key])
+        elif value is None:
+            assert vars(loaded)[name] is None
+        else:
+            np.testing.assert_array_equal(vars(loaded)[name], value)
+
+
+def test_wind_data_files(tmp_path):
+    heterogeneous_inflow_config_by_wd = {
+        "speed_multipliers": np.array([[1.0, 1.1], [1.0, 0.9]]),
+        "wind_directions": np.array([90.0, 270.0]),
+        "x": np.array([0.0, 1000.0]),
+        "y": np.array([0.0, 0.0]),
+    }
+    wind_rose = WindRose(
+        np.array([0.0, 90.0, 180.0, 270.0]),
+        np.array([5.0, 10.0]),
+        0.06,
+        freq_table=np.array([[1.0, 0.0], [1.0, 2.0], [0.0, 0.0], [3.0, 1.0]]),
+        value_table=np.ones((4, 2)),
+        heterogeneous_inflow_config_by_wd=heterogeneous_inflow_config_by_wd,
+    )
+    wind_rose.to_file(tmp_path / "wind_rose.npz")
+    loaded = WindRose.from_file(tmp_path / "wind_rose.npz")
+    _assert_same_attributes(wind_rose, loaded)
+    for unpacked, unpacked_loaded in zip(wind_rose.unpack()[:5], loaded.unpack()[:5]):
+        np.testing.assert_array_equal(unpacked, unpacked_loaded)
+
+    wind_ti_rose = WindTIRose(
+        np.array([0.0, 180.0]), np.array([5.0, 10.0]), np.array([0.06, 0.08]),
+        compute_zero_freq_occurrence=True,
+    )
+    wind_ti_rose.to_file(tmp_path / "wind_ti_rose.npz")
+    _assert_same_attributes(
+        wind_ti_rose, WindDataBase.from_file(tmp_path / "wind_ti_rose.npz")
+    )
+
+    # The stored class must match the class reading it
+    with pytest.raises(ValueError):
+        WindRose.from_file(tmp_path / "wind_ti_rose.npz")
+    with pytest.raises(ValueError):
+        wind_rose.to_file(tmp_path / "wind_rose.csv")
+
+    # Time series can be memory mapped
+    time_series = TimeSeries(
+        np.linspace(0.0, 350.0, 36),
+        8.0,
+        0.06,
+        values=np.arange(36.0),
+        heterogeneous_inflow_config={
+            "speed_multipliers": np.ones((36, 2)),
+            "x": np.array([0.0, 1000.0]),
+            "y": np.array([0.0, 0.0]),
+        },
+    )
+    time_series.to_file(tmp_path / "time_series.npz")
+    loaded = TimeSeries.from_file(tmp_path / "time_series.npz", mmap=True)
+    assert isinstance(loaded.wind_directions, np.memmap)
+    _assert_same_attributes(time_series, loaded)
+
+
+def test_wind_data_files_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    wind_rose = WindRose(np.array([0.0, 90.0]), np.array([5.0, 10.0]), 0.06)
+    wind_rose.to_file(tmp_path / "wind_rose.parquet")
+    _assert_same_attributes(wind_rose, WindRose.from_file(tmp_path / "wind_rose.parquet"))
+
+    time_series = TimeSeries(np.linspace(0.0, 350.0, 36), 8.0, 0.06)
+    time_series.to_file(tmp_path / "time_series.parquet")
+    _assert_same_attributes(
+        time_series, TimeSeries.from_file(tmp_path / "time_series.parquet", mmap=True)
+    )
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from floris import (
+    FlorisModel,
+    TimeSeries,
+    YawLookupTable,
+)
+from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
+
+
+TEST_DATA = Path(__file__).resolve().parent / "data"
+YAML_INPUT = TEST_DATA / "input_full.yaml"
+
+WIND_DIRECTIONS = np.arange(260.0, 284.0, 4.0)
+WIND_SPEEDS = np.array([7.0, 9.0])
+TURBULENCE_INTENSITIES = np.array([0.06])
+
+
+def _get_fmodel():
+    fmodel = FlorisModel(configuration=YAML_INPUT)
+    fmodel.set(layout_x=[0.0, 630.0, 1260.0], layout_y=[0.0, 0.0, 0.0])
+    return fmodel
+
+
+def _get_table(fmodel, **kwargs):
+    return YawLookupTable.from_floris_model(
+        fmodel,
+        wind_directions=WIND_DIRECTIONS,
+        wind_speeds=WIND_SPEEDS,
+        turbulence_intensities=TURBULENCE_INTENSITIES,
+        minimum_yaw_angle=-25.0,
+        maximum_yaw_angle=25.0,
+        **kwargs,
+    )
+
+
+def test_yaw_lookup_table(tmp_path):
+    fmodel = _get_fmodel()
+    table = _get_table(fmodel, checkpoint_dir=tmp_path / "shards")
+    assert table.yaw_angles.shape == (6, 2, 1, 3)
+    assert len(list((tmp_path / "shards").glob("shard_*.npz"))) == 2
+
+    # The lattice holds the optimal yaw angles and the turbine powers at those yaw angles
+    wd_grid, ws_grid, ti_grid = np.meshgrid(
+        WIND_DIRECTIONS, WIND_SPEEDS, TURBULENCE_INTENSITIES, indexing="ij"
+    )
+    fmodel_direct = fmodel.copy()
+    fmodel_direct.set(
+        wind_directions=wd_grid.flatten(),
+        wind_speeds=ws_grid.flatten(),
+        turbulence_intensities=ti_grid.flatten(),
+    )
+    df_opt = YawOptimizationSR(
+        fmodel_direct, minimum_yaw_angle=-25.0, maximum_yaw_angle=25.0
+    ).optimize(print_progress=False)
+    yaw_angles = np.vstack(df_opt["yaw_angles_opt"])
+    np.testing.assert_allclose(table.yaw_angles.reshape(-1, 3), yaw_angles)
+    np.testing.assert_allclose(
+        table.turbine_powers.sum(axis=-1).flatten(), df_opt["farm_power_opt"]
+    )
+
+    # Yaw angles are interpolated between the lattice points
+    time_series = TimeSeries(np.array([262.0, 268.0]), np.array([8.0, 7.0]), 0.06)
+    np.testing.assert_allclose(
+        table.get_yaw_angles(time_series),
+        [
+            0.25 * (yaw_angles[0] + yaw_angles[1] + yaw_angles[2] + yaw_angles[3]),
+            yaw_angles[4],
+        ],
+    )
+    report = table.get_error_report(fmodel, time_series)
+    assert report["max_rel_error"] < 0.1
+
+    # Tables survive a round trip through a file
+    table.to_file(tmp_path / "table.npz")
+    table_from_file = YawLookupTable.from_file(tmp_path / "table.npz")
+    np.testing.assert_array_equal(table_from_file.yaw_angles, table.yaw_angles)
+    np.testing.assert_array_equal(table_from_file.turbine_powers, table.turbine_powers)
+
+
+def test_yaw_lookup_table_resume(tmp_path):
+    fmodel = _get_fmodel()
+    checkpoint_dir = tmp_path / "shards"
+    table = _get_table(fmodel, checkpoint_dir=checkpoint_dir, n_shards=3)
+
+    # Mark one shard file and remove another: on restart, the marked shard is loaded rather
+    # than optimized again and only the removed shard is optimized
+    with np.load(checkpoint_dir / "shard_00000.npz") as data:
+        shard = {key: data[key] for key in data.files}
+    shard["yaw_angles"] = np.full_like(shard["yaw_angles"], 3.0)
+    np.savez(checkpoint_dir / "shard_00000.npz", **shard)
+    (checkpoint_dir / "shard_00002.npz").unlink()
+
+    table_resumed = _get_table(fmodel, checkpoint_dir=checkpoint_dir, n_shards=3)
+    assert np.all(table_resumed.yaw_angles.reshape(-1, 3)[shard["indices"]] == 3.0)
+    np.testing.assert_allclose(table_resumed.yaw_angles[:, 1], table.yaw_angles[:, 1])
+    assert (checkpoint_dir / "shard_00002.npz").exists()
+
+    # A checkpoint directory of a different lattice is rejected
+    with pytest.raises(ValueError):
+        _get_table(fmodel, checkpoint_dir=checkpoint_dir, n_shards=2)
+
+    # Parallel workers give the same table
+    table_parallel = _get_table(fmodel, max_workers=2)
+    np.testing.assert_allclose(table_parallel.yaw_angles, table.yaw_angles)
+    np.testing.assert_allclose(table_parallel.turbine_powers, table.turbine_powers)